@@ -1,13 +1,15 @@
 import enum
+import hashlib
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import jwt
-from jose.exceptions import ExpiredSignatureError, JWTError
 from pydantic import BaseModel, ValidationError
 
+from api.jwt_backends import build_jwt_backend
 from core.config import settings
+from services.exceptions import InvalidTokenError, TokenExpiredError
+from utils.lru_cache import ExpiringLRUCache
 
 
 class UserRole(enum.Enum):
@@ -27,6 +29,12 @@ class AccessTokenPayload(BaseModel):
     exp: int
 
 
+jwt_backend = build_jwt_backend(settings.jwt_backend, settings.jwt_secret_key, settings.jwt_algorithm)
+
+# Проверенные токены по sha256 от токена, запись живёт до exp токена
+access_token_cache: ExpiringLRUCache[bytes, AccessTokenPayload] = ExpiringLRUCache(maxsize=settings.jwt_cache_size)
+
+
 class JWTBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
         super().__init__(auto_error=auto_error)
@@ -48,14 +56,19 @@ class JWTBearer(HTTPBearer):
 
     @staticmethod
     async def decode_and_parse_token(jwt_token: str) -> AccessTokenPayload:
+        cache_key = hashlib.sha256(jwt_token.encode()).digest()
+        access_token = access_token_cache.get(cache_key)
+        if access_token is not None:
+            return access_token
+
         try:
-            decoded_token = jwt.decode(jwt_token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        except ExpiredSignatureError:
+            decoded_token = jwt_backend.decode(jwt_token)
+        except TokenExpiredError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Access token is expired",
             ) from None
-        except JWTError:
+        except InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid format for JWT token",
@@ -67,6 +80,8 @@ class JWTBearer(HTTPBearer):
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"Access token is invalid: {exc}",
             ) from None
+
+        access_token_cache.set(cache_key, access_token, expires_at=access_token.exp)
         return access_token
 
 
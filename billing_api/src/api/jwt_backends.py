@@ -0,0 +1,117 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import time
+from typing import Any, Literal, Protocol
+
+import orjson
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
+
+from services.exceptions import InvalidTokenError, TokenExpiredError
+
+JWTBackendName = Literal["jose", "hs256"]
+
+
+class JWTBackend(Protocol):
+    def decode(self, token: str) -> dict[str, Any]:
+        """Проверяет подпись и время жизни токена и возвращает его claims.
+
+        Raises:
+            TokenExpiredError: истёк срок действия токена (exp).
+            InvalidTokenError: неверная подпись, формат или claims токена.
+        """
+        ...
+
+
+class JoseJWTBackend:
+    """Проверка токенов через python-jose, поддерживает все алгоритмы jose."""
+
+    def __init__(self, secret_key: str, algorithm: str):
+        self._secret_key = secret_key
+        self._algorithm = algorithm
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            return jwt.decode(token, self._secret_key, algorithms=[self._algorithm])
+        except ExpiredSignatureError:
+            raise TokenExpiredError from None
+        except JWTError:
+            raise InvalidTokenError from None
+
+
+class HS256JWTBackend:
+    """Минимальная проверка токенов HS256 на hmac и orjson.
+
+    Проверяет то же, что и python-jose: алгоритм в заголовке, подпись, числовые iat/nbf/exp,
+    строковые sub/jti и отсутствие aud/at_hash (аудитория и access_token в decode не передаются).
+    """
+
+    def __init__(self, secret_key: str):
+        self._secret_key = secret_key.encode()
+
+    def decode(self, token: str) -> dict[str, Any]:
+        if token.count(".") != 2:
+            raise InvalidTokenError
+
+        try:
+            signing_input, _, signature_segment = token.encode("ascii").rpartition(b".")
+            header_segment, _, payload_segment = signing_input.partition(b".")
+            header = orjson.loads(_base64url_decode(header_segment))
+            signature = _base64url_decode(signature_segment)
+        except (UnicodeEncodeError, binascii.Error, orjson.JSONDecodeError):
+            raise InvalidTokenError from None
+
+        if not isinstance(header, dict) or header.get("alg") != "HS256":
+            raise InvalidTokenError
+
+        expected_signature = hmac.new(self._secret_key, signing_input, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected_signature, signature):
+            raise InvalidTokenError
+
+        try:
+            claims = orjson.loads(_base64url_decode(payload_segment))
+        except (binascii.Error, orjson.JSONDecodeError):
+            raise InvalidTokenError from None
+        if not isinstance(claims, dict):
+            raise InvalidTokenError
+
+        self._validate_claims(claims)
+        return claims
+
+    @staticmethod
+    def _validate_claims(claims: dict[str, Any]) -> None:
+        """Проверяет claims в том же порядке и с тем же результатом, что и jose.jwt.decode без audience и issuer."""
+        try:
+            if "iat" in claims:
+                int(claims["iat"])
+            nbf = int(claims["nbf"]) if "nbf" in claims else None
+            exp = int(claims["exp"]) if "exp" in claims else None
+        except (TypeError, ValueError):
+            raise InvalidTokenError from None
+
+        now = int(time.time())
+        if nbf is not None and nbf > now:
+            raise InvalidTokenError
+        if exp is not None and exp < now:
+            raise TokenExpiredError
+
+        # jose отклоняет aud и at_hash, если audience и access_token не переданы в decode
+        if "aud" in claims or "at_hash" in claims:
+            raise InvalidTokenError
+        for name in ("sub", "jti"):
+            if name in claims and not isinstance(claims[name], str):
+                raise InvalidTokenError
+
+
+def _base64url_decode(segment: bytes) -> bytes:
+    return base64.b64decode(segment + b"=" * (-len(segment) % 4), altchars=b"-_", validate=True)
+
+
+def build_jwt_backend(name: JWTBackendName, secret_key: str, algorithm: str) -> JWTBackend:
+    if name == "hs256":
+        if algorithm != "HS256":
+            raise ValueError(f"Бэкенд JWT hs256 не поддерживает алгоритм {algorithm}")
+        return HS256JWTBackend(secret_key)
+    return JoseJWTBackend(secret_key, algorithm)
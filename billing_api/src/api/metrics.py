@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from api.jwt_access_token import access_token_cache
+from core.metrics import registry, update_pool_metrics, update_token_cache_metrics
+from db import postgres
+
+router = APIRouter()
+
+
+class PrometheusResponse(PlainTextResponse):
+    media_type = "text/plain; version=0.0.4"
+
+
+@router.get("/metrics", response_class=PrometheusResponse, include_in_schema=False)
+async def get_metrics() -> str:
+    """Метрики процесса в текстовом формате Prometheus, каждый воркер uvicorn отдаёт свои."""
+    if postgres.engine is not None:
+        update_pool_metrics(postgres.engine.sync_engine)
+    update_token_cache_metrics(access_token_cache)
+    return registry.render()
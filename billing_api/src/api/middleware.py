@@ -0,0 +1,84 @@
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+from core.metrics import (
+    RequestDBStats,
+    http_request_db_duration,
+    http_request_db_queries,
+    http_request_duration,
+    http_requests_in_progress,
+    request_db_stats,
+)
+from db.sql_profiler import profile_sql
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """Собирает метрики HTTP-запросов: длительность по маршрутам, запросы в обработке и SQL-запросы.
+
+    Маршрут берётся из шаблона пути FastAPI (/api/v1/subscriptions/{subscription_id}),
+    запросы, не попавшие ни в один маршрут, учитываются под меткой unmatched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        db_stats = RequestDBStats()
+        token = request_db_stats.set(db_stats)
+        http_requests_in_progress.inc(method)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started_at
+            http_requests_in_progress.dec(method)
+            request_db_stats.reset(token)
+
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_request_duration.observe(method, route, str(status_code), value=duration)
+            http_request_db_queries.observe(route, value=db_stats.queries)
+            http_request_db_duration.observe(route, value=db_stats.duration)
+
+
+class SQLProfilerMiddleware:
+    """Режим отладки: считает SQL-запросы и сессии каждого HTTP-запроса.
+
+    В лог попадают запросы, превысившие SQL_PROFILING_MAX_STATEMENTS, и запросы, в которых один
+    и тот же SQL выполнен больше SQL_PROFILING_MAX_REPEATS раз (признак N+1).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile_sql() as profile:
+            await self.app(scope, receive, send)
+
+        request = f"{scope['method']} {scope['path']}"
+        if profile.statements_count > settings.sql_profiling_max_statements:
+            logger.warning(f"{request}: превышен порог SQL-запросов\n{profile.summary()}")
+            return
+        for statement, count in profile.repeated_statements(settings.sql_profiling_max_repeats):
+            logger.warning(f"{request}: возможный N+1, запрос выполнен {count} раз: {' '.join(statement.split())}")
@@ -6,6 +6,7 @@ from fastapi import Query
 from pydantic import BaseModel
 
 from models.enums import PaymentType, StatusCardsEnum, SubscriptionStatus, TransactionStatus
+from schemas.pagination import CursorParams
 
 
 class ErrorResponse(BaseModel):
@@ -23,6 +24,16 @@ def generate_error_responses(*error_statuses: HTTPStatus) -> dict[int, dict[str,
     }
 
 
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверяет заголовок If-None-Match на совпадение с ETag (слабое сравнение, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
 def transaction_query_params(
     subscription_id: UUID | None = None,
     status: Annotated[TransactionStatus | None, Query()] = None,
@@ -58,3 +69,11 @@ def user_card_query_params(
 ) -> dict[str, StatusCardsEnum | PaymentType]:
     query_params = {"status": status, "user_id": user_id, "is_default": is_default}
     return {k: v for k, v in query_params.items() if v is not None}
+
+
+def cursor_pagination_params(
+    cursor: Annotated[str | None, Query(description="Курсор следующей страницы из ответа next_cursor")] = None,
+    size: Annotated[int, Query(ge=1, le=100, description="Размер страницы")] = 50,
+    include_total: Annotated[bool, Query(description="Подсчитать общее количество записей")] = False,
+) -> CursorParams:
+    return CursorParams(cursor=cursor, size=size, include_total=include_total)
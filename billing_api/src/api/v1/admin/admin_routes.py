@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 
 from api.jwt_access_token import require_admin
+from api.v1.admin.db_pool import router as db_pool_router
 from api.v1.admin.subscription import router as subscription_router
 from api.v1.admin.subscription_plan import router as subscription_plan_router
 from api.v1.admin.transaction import router as transaction_router
@@ -11,3 +12,4 @@ router.include_router(subscription_router, prefix="/subscriptions")
 router.include_router(subscription_plan_router, prefix="/subscription_plans")
 router.include_router(transaction_router, prefix="/transactions")
 router.include_router(user_cards_router, prefix="/user_cards")
+router.include_router(db_pool_router, prefix="/db_pool")
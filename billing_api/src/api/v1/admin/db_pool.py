@@ -0,0 +1,29 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, HTTPException
+
+from api.utils import generate_error_responses
+from db import postgres
+from db.pool_stats import get_pool_stats
+from schemas.db_pool import PoolStatsResponse
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=PoolStatsResponse,
+    summary="Статистика пула соединений с PostgreSQL",
+    description=(
+        "Состояние пула соединений текущего процесса: выданные и свободные соединения, overflow, "
+        "гистограммы времени ожидания соединения и количества выданных соединений. "
+        "Каждый воркер uvicorn держит собственный пул"
+    ),
+    responses=generate_error_responses(  # type: ignore[reportArgumentType]
+        HTTPStatus.FORBIDDEN, HTTPStatus.UNAUTHORIZED, HTTPStatus.SERVICE_UNAVAILABLE
+    ),
+)
+async def get_db_pool_stats() -> PoolStatsResponse:
+    if postgres.engine is None:
+        raise HTTPException(status_code=HTTPStatus.SERVICE_UNAVAILABLE, detail="Database engine is not initialized")
+    return PoolStatsResponse(**get_pool_stats(postgres.engine))
@@ -2,9 +2,9 @@ from http import HTTPStatus
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Path
-from fastapi_pagination import Page, paginate
 
-from api.utils import generate_error_responses, subscription_query_params
+from api.utils import cursor_pagination_params, generate_error_responses, subscription_query_params
+from schemas.pagination import CursorPage, CursorParams
 from schemas.subscription import SubscriptionCreateAdmin, SubscriptionResponse
 from services.subscription_manager import SubscriptionManager, get_subscription_manager
 
@@ -30,7 +30,7 @@ async def get_subscription_by_id(
 
 @router.get(
     "/",
-    response_model=Page[SubscriptionResponse],
+    response_model=CursorPage[SubscriptionResponse],
     summary="Вывести все подписки",
     description="Вывести все подписки с пагинацией и фильтрацией по полям",
     status_code=HTTPStatus.OK,
@@ -39,8 +39,9 @@ async def get_subscription_by_id(
 async def get_subscriptions(
     subscription_manager: SubscriptionManager = Depends(get_subscription_manager),
     query_params: dict[str, str] = Depends(subscription_query_params),
+    pagination_params: CursorParams = Depends(cursor_pagination_params),
 ):
-    return paginate(await subscription_manager.get_subscriptions(query_params))
+    return await subscription_manager.get_subscriptions_page(pagination_params, query_params)
 
 
 @router.post(
@@ -2,9 +2,9 @@ from http import HTTPStatus
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Path
-from fastapi_pagination import Page, paginate
 
-from api.utils import generate_error_responses
+from api.utils import cursor_pagination_params, generate_error_responses
+from schemas.pagination import CursorPage, CursorParams
 from schemas.subscription_plan import SubscriptionPlanCreate, SubscriptionPlanResponse, SubscriptionPlanUpdate
 from services.subscription_plan import SubscriptionPlanService, get_subscription_plan_service
 
@@ -13,7 +13,7 @@ router = APIRouter()
 
 @router.get(
     "/",
-    response_model=Page[SubscriptionPlanResponse],
+    response_model=CursorPage[SubscriptionPlanResponse],
     summary="Вывести планы подписок",
     description="Вывести все существующие планы подписок с пагинацией",
     status_code=HTTPStatus.OK,
@@ -21,8 +21,9 @@ router = APIRouter()
 )
 async def get_subscription_plans(
     subscription_plan_service: SubscriptionPlanService = Depends(get_subscription_plan_service),
+    pagination_params: CursorParams = Depends(cursor_pagination_params),
 ):
-    return paginate(await subscription_plan_service.get_many())
+    return await subscription_plan_service.get_page(pagination_params)
 
 
 @router.post(
@@ -40,6 +41,26 @@ async def create_subscription_plan(
     return await subscription_plan_service.create_new_subscription_plan(subscription_plan_data)
 
 
+@router.post(
+    "/import",
+    response_model=list[SubscriptionPlanResponse],
+    summary="Импортировать планы подписок",
+    description=(
+        "Создание или обновление (по заголовку) списка планов подписок. "
+        "Пачка с повторяющимися заголовками отклоняется целиком"
+    ),
+    status_code=HTTPStatus.OK,
+    responses=generate_error_responses(  # type: ignore[reportArgumentType]
+        HTTPStatus.BAD_REQUEST, HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.FORBIDDEN, HTTPStatus.UNAUTHORIZED
+    ),
+)
+async def import_subscription_plans(
+    subscription_plans_data: list[SubscriptionPlanCreate],
+    subscription_plan_service: SubscriptionPlanService = Depends(get_subscription_plan_service),
+):
+    return await subscription_plan_service.import_subscription_plans(subscription_plans_data)
+
+
 @router.get(
     "/{subscription_plan_id}",
     response_model=SubscriptionPlanResponse,
@@ -2,9 +2,9 @@ from http import HTTPStatus
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Path
-from fastapi_pagination import Page, paginate
 
-from api.utils import generate_error_responses, user_card_query_params
+from api.utils import cursor_pagination_params, generate_error_responses, user_card_query_params
+from schemas.pagination import CursorPage, CursorParams
 from schemas.user_card import UserCardBase, UserCardResponse
 from services.cards_manager import CardsManager, get_cards_manager_service
 
@@ -13,7 +13,7 @@ router = APIRouter()
 
 @router.get(
     "/",
-    response_model=Page[UserCardBase],
+    response_model=CursorPage[UserCardBase],
     summary="Вывести карты",
     description="Вывести все карты с пагинацией и фильтрацией по полям",
     status_code=HTTPStatus.OK,
@@ -24,13 +24,14 @@ router = APIRouter()
 async def get_user_cards(
     query_params: dict[str, str] = Depends(user_card_query_params),
     user_card_service: CardsManager = Depends(get_cards_manager_service),
+    pagination_params: CursorParams = Depends(cursor_pagination_params),
 ):
-    cards = await user_card_service.get_all_cards(query_params)
+    cards_page = await user_card_service.get_cards_page(query_params, pagination_params)
 
-    if not cards:
+    if not cards_page.items:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="User Cards with such params not found") from None
 
-    return paginate(cards)
+    return cards_page
 
 
 @router.get(
@@ -10,7 +10,8 @@ from core.config import settings
 from core.templates import templates
 from services.cards_manager import CardsManager, get_cards_manager_service
 from services.exceptions import CardNotFoundException, UserNotOwnerOfCardException
-from services.subscription_manager import SubscriptionManager, get_subscription_manager
+from services.stripe_event_ledger import StripeEventLedger, get_stripe_event_ledger
+from services.stripe_webhook import SUPPORTED_EVENT_TYPES, read_stripe_event
 
 logger = logging.getLogger(__name__)
 
@@ -53,32 +54,22 @@ async def initialize_payment_method(
 @router.post(
     "/payment/webhook/",
     summary="Обработка Stripe Webhook",
-    description="Обрабатывает события Stripe Webhook, такие как привязка карты или ошибки.",
+    description="Принимает события Stripe Webhook, такие как привязка карты или ошибки, и ставит их в очередь "
+    "на обработку.",
 )
 async def stripe_webhook(
     request: Request,
-    cards_manager_service: CardsManager = Depends(get_cards_manager_service),
-    subscription_manager: SubscriptionManager = Depends(get_subscription_manager),
+    stripe_event_ledger: StripeEventLedger = Depends(get_stripe_event_ledger),
 ) -> JSONResponse:
-    payload = await request.json()
-    event_type = payload.get("type")
-    data = payload.get("data")
-
-    webhook_handlers = {
-        # обработка в CardsManager
-        "payment_method.attached": cards_manager_service.handle_webhook,
-        "setup_intent.succeeded": cards_manager_service.handle_webhook,
-        "setup_intent.setup_failed": cards_manager_service.handle_webhook,
-        # обработка в SubscriptionManager
-        "payment_intent.succeeded": subscription_manager.handle_payment_webhook,
-        "payment_intent.payment_failed": subscription_manager.handle_payment_webhook,
-        "charge.refunded": subscription_manager.handle_payment_webhook,
-    }
-    handler = webhook_handlers.get(event_type)
-    if handler:
-        await handler(event_type, data)
-    else:
-        logger.warning(f"Не найден обработчик для вебхуа типа {event_type}")
+    event = read_stripe_event(await request.body(), request.headers.get("Stripe-Signature"))
+
+    if event.type not in SUPPORTED_EVENT_TYPES:
+        logger.warning(f"Не найден обработчик для вебхуа типа {event.type}")
+        return JSONResponse(content={"detail": "success"})
+
+    # событие обрабатывается WebhookWorker, повторная доставка отсекается журналом событий
+    if not await stripe_event_ledger.accept(event.id, event.type, event.to_message()):
+        logger.info(f"Событие {event.id} типа {event.type} уже принято в обработку, повторная доставка пропущена")
 
     return JSONResponse(content={"detail": "success"})
 
@@ -2,10 +2,10 @@ from http import HTTPStatus
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Path
-from fastapi_pagination import Page, paginate
 
 from api.jwt_access_token import AccessTokenPayload, security_jwt
-from api.utils import generate_error_responses, subscription_query_params
+from api.utils import cursor_pagination_params, generate_error_responses, subscription_query_params
+from schemas.pagination import CursorPage, CursorParams
 from schemas.subscription import SubscriptionCreate, SubscriptionRenew, SubscriptionResponse
 from schemas.transaction import TransactionSchemaBaseResponse
 from services.subscription_manager import SubscriptionManager, get_subscription_manager
@@ -33,7 +33,7 @@ async def get_subscription_by_id(
 
 @router.get(
     "/",
-    response_model=Page[SubscriptionResponse],
+    response_model=CursorPage[SubscriptionResponse],
     summary="Вывести все подписки",
     description="Вывести все подписки пользователя с пагинацией и фильтрацией по полям",
     status_code=HTTPStatus.OK,
@@ -43,9 +43,10 @@ async def get_subscriptions(
     subscription_manager: SubscriptionManager = Depends(get_subscription_manager),
     query_params: dict[str, str | UUID] = Depends(subscription_query_params),
     token: AccessTokenPayload = Depends(security_jwt),
+    pagination_params: CursorParams = Depends(cursor_pagination_params),
 ):
     query_params.update({"user_id": token.user_id})
-    return paginate(await subscription_manager.get_subscriptions(query_params))
+    return await subscription_manager.get_subscriptions_page(pagination_params, query_params)
 
 
 @router.post(
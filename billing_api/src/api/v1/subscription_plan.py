@@ -1,10 +1,11 @@
 from http import HTTPStatus
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Header, Path, Response
 from fastapi_pagination import Page, paginate
 
-from api.utils import generate_error_responses
+from api.utils import etag_matches, generate_error_responses
+from core.config import settings
 from schemas.subscription_plan import SubscriptionPlanResponse
 from services.subscription_plan import SubscriptionPlanService, get_subscription_plan_service
 
@@ -17,12 +18,23 @@ router = APIRouter()
     summary="Вывести планы подписок",
     description="Вывести все существующие планы подписок с пагинацией",
     status_code=HTTPStatus.OK,
-    responses=generate_error_responses(HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.FORBIDDEN, HTTPStatus.UNAUTHORIZED),  # type: ignore[reportArgumentType]
+    responses={
+        HTTPStatus.NOT_MODIFIED.value: {"description": "Каталог не изменился с версии из If-None-Match"},
+        **generate_error_responses(HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.FORBIDDEN, HTTPStatus.UNAUTHORIZED),
+    },
 )
 async def get_subscription_plans(
+    response: Response,
+    if_none_match: str | None = Header(None, include_in_schema=False),
     subscription_plan_service: SubscriptionPlanService = Depends(get_subscription_plan_service),
 ):
-    return paginate(await subscription_plan_service.get_many({"is_archive": False}))
+    etag = f'W/"{await subscription_plan_service.get_catalogue_version()}"'
+    cache_headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.plan_catalogue_max_age_sec}"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=cache_headers)
+
+    response.headers.update(cache_headers)
+    return paginate(await subscription_plan_service.get_catalogue())
 
 
 @router.get(
@@ -37,4 +49,4 @@ async def get_subscription_plan_by_id(
     subscription_plan_id: UUID = Path(..., description="ID плана подписки"),
     subscription_plan_service: SubscriptionPlanService = Depends(get_subscription_plan_service),
 ):
-    return await subscription_plan_service.get(subscription_plan_id)
+    return await subscription_plan_service.get_cached(subscription_plan_id)
@@ -2,10 +2,10 @@ from http import HTTPStatus
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi_pagination import Page, paginate
 
 from api.jwt_access_token import AccessTokenPayload, security_jwt
-from api.utils import generate_error_responses, transaction_query_params
+from api.utils import cursor_pagination_params, generate_error_responses, transaction_query_params
+from schemas.pagination import CursorPage, CursorParams
 from schemas.transaction import TransactionSchemaBaseResponse, TransactionSchemaResponse
 from services.exceptions import TransactionNotFoundError
 from services.transaction import TransactionService, get_admin_transaction_service
@@ -24,7 +24,7 @@ async def get_transaction_by_id(
     transaction_id: UUID,
     token: AccessTokenPayload = Depends(security_jwt),
     transaction_service: TransactionService = Depends(get_admin_transaction_service),
-) -> Page[TransactionSchemaResponse]:
+) -> TransactionSchemaResponse:
     try:
         return await transaction_service.get_user_transaction_by_id(transaction_id, token.user_id)
     except TransactionNotFoundError as e:
@@ -33,7 +33,7 @@ async def get_transaction_by_id(
 
 @router.get(
     "/",
-    response_model=Page[TransactionSchemaBaseResponse],
+    response_model=CursorPage[TransactionSchemaBaseResponse],
     summary="Вывести транзакции",
     description="Вывести транзакции пользователя с пагинацией и фильтрацией по полям",
     responses=generate_error_responses(HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.UNAUTHORIZED),  # type: ignore[reportArgumentType]
@@ -42,14 +42,15 @@ async def get_transactions(
     query_params: dict = Depends(transaction_query_params),
     token: AccessTokenPayload = Depends(security_jwt),
     transaction_service: TransactionService = Depends(get_admin_transaction_service),
-) -> Page[TransactionSchemaBaseResponse]:
+    pagination_params: CursorParams = Depends(cursor_pagination_params),
+) -> CursorPage[TransactionSchemaBaseResponse]:
     query_params.update({"user_id": token.user_id})
 
-    transactions_list = await transaction_service.get_transactions(query_params)
+    transactions_page = await transaction_service.get_transactions_page(query_params, pagination_params)
 
-    if not transactions_list:
+    if not transactions_page.items:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="Transactions with such params not found"
         ) from None
 
-    return paginate(transactions_list)
+    return transactions_page
@@ -0,0 +1,144 @@
+"""Сравнение планов горячих запросов до и после создания индексов.
+
+Скрипт пересоздаёт схему в указанной БД (по умолчанию тестовой), наполняет её синтетическими
+данными, снимает EXPLAIN ANALYZE без индексов из models.models, затем создаёт индексы и
+снимает планы повторно.
+
+Запуск из директории src:
+    python -m benchmarks.explain_indexes --rows 200000
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+from core.config import settings
+from models.models import Base
+
+logger = logging.getLogger(__name__)
+
+SEED_STATEMENTS = (
+    """
+    INSERT INTO subscriptionplans (id, title, description, price, duration_days, is_archive)
+    SELECT gen_random_uuid(), 'Plan ' || g, 'Benchmark plan', 100 * g, 30, false
+    FROM generate_series(1, 10) g
+    """,
+    """
+    INSERT INTO usercardsstripes (id, user_id, stripe_user_id, token_card, status, last_numbers_card, is_default)
+    SELECT gen_random_uuid(), md5(g::text)::uuid, 'cus_' || g, 'pm_' || g,
+           (ARRAY['INIT', 'SUCCESS', 'FAIL'])[1 + g % 3]::status_cards_enum,
+           lpad((g % 10000)::text, 4, '0'), g % 3 = 1
+    FROM generate_series(0, :users - 1) g
+    """,
+    """
+    INSERT INTO subscriptions (id, user_id, plan_id, status, start_date, end_date, auto_renewal, created_at)
+    SELECT gen_random_uuid(), md5((g % :users)::text)::uuid,
+           (SELECT id FROM subscriptionplans LIMIT 1),
+           (ARRAY['active', 'expired', 'cancelled', 'pending'])[1 + g % 4]::subscription_status,
+           LOCALTIMESTAMP - (g % 60) * interval '1 day',
+           LOCALTIMESTAMP - (g % 60) * interval '1 day' + interval '30 days',
+           g % 2 = 0,
+           now() - random() * interval '365 days'
+    FROM generate_series(1, :rows) g
+    """,
+    """
+    INSERT INTO transactions (
+        id, subscription_id, user_id, amount, payment_type, status, user_card_id, stripe_payment_intent_id, created_at
+    )
+    SELECT gen_random_uuid(), s.id, s.user_id, 1000 + g, 'stripe'::payment_type, 'success'::transaction_status, c.id,
+           'pi_' || replace(gen_random_uuid()::text, '-', ''), now() - random() * interval '365 days'
+    FROM subscriptions s
+    JOIN usercardsstripes c ON c.user_id = s.user_id
+    CROSS JOIN generate_series(1, 2) g
+    """,
+)
+
+SAMPLE_PARAMS_QUERY = """
+    SELECT t.user_id, t.stripe_payment_intent_id, c.stripe_user_id
+    FROM transactions t
+    JOIN usercardsstripes c ON c.id = t.user_card_id
+    ORDER BY t.created_at
+    LIMIT 1
+"""
+
+# Запросы повторяют форму запросов из кода сервиса
+HOT_QUERIES = {
+    "SubscriptionService._user_has_active_subscription": (
+        "SELECT * FROM subscriptions WHERE user_id = :user_id AND status IN ('active', 'pending')"
+    ),
+    "check_subscriptions.get_expired_subscriptions": (
+        "SELECT * FROM subscriptions WHERE status = 'active' AND end_date <= LOCALTIMESTAMP"
+    ),
+    "PaymentManager._update_transaction_status": (
+        "SELECT * FROM transactions WHERE stripe_payment_intent_id = :stripe_payment_intent_id"
+    ),
+    "CardsManager._get_card_user": (
+        "SELECT * FROM usercardsstripes WHERE stripe_user_id = :stripe_user_id AND status = 'INIT' "
+        "ORDER BY created_at DESC LIMIT 1"
+    ),
+    "TransactionService.get_transactions_page": (
+        "SELECT * FROM transactions WHERE user_id = :user_id ORDER BY created_at DESC, id DESC LIMIT 51"
+    ),
+}
+
+
+def get_model_indexes() -> list:
+    return [index for table in Base.metadata.sorted_tables for index in table.indexes]
+
+
+async def seed(connection: AsyncConnection, rows: int) -> None:
+    params = {"rows": rows, "users": max(rows // 2, 1)}
+    for statement in SEED_STATEMENTS:
+        await connection.execute(text(statement), params)
+    await connection.execute(text("ANALYZE"))
+
+
+async def explain_hot_queries(connection: AsyncConnection, title: str) -> None:
+    sample = (await connection.execute(text(SAMPLE_PARAMS_QUERY))).mappings().one()
+
+    for query_name, query in HOT_QUERIES.items():
+        result = await connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"), dict(sample))
+        plan = "\n".join(row[0] for row in result)
+        logger.info(f"[{title}] {query_name}\n{plan}\n")
+
+
+async def main(dsn: str, rows: int, keep_data: bool) -> None:
+    engine = create_async_engine(dsn)
+    indexes = get_model_indexes()
+
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+            for index in indexes:
+                await connection.execute(DropIndex(index))
+
+            logger.info(f"Наполнение БД: {rows} подписок")
+            await seed(connection, rows)
+            await explain_hot_queries(connection, "без индексов")
+
+            for index in indexes:
+                await connection.execute(CreateIndex(index))
+            await connection.execute(text("ANALYZE"))
+            await explain_hot_queries(connection, "с индексами")
+
+            if not keep_data:
+                await connection.run_sync(Base.metadata.drop_all)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--dsn", default=settings.tests.test_postgres_url, help="БД для замера, схема будет пересоздана"
+    )
+    parser.add_argument("--rows", type=int, default=100_000, help="Количество подписок")
+    parser.add_argument("--keep-data", action="store_true", help="Не удалять таблицы после замера")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.dsn, args.rows, args.keep_data))
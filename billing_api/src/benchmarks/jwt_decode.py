@@ -0,0 +1,117 @@
+"""Пропускная способность проверки access-токенов бэкендами JWT.
+
+Токены с полезной нагрузкой AccessTokenPayload подписываются так же, как в сервисе авторизации
+(python-jose, HS256), и проверяются бэкендами jose и hs256 из api.jwt_backends вместе
+с валидацией AccessTokenPayload. Кэш проверенных токенов JWTBearer в замер не входит:
+каждый токен проверяется один раз за проход.
+
+Перед замером скрипт проверяет, что оба бэкенда одинаково принимают и отклоняют
+истёкшие, поддельные и повреждённые токены.
+
+Запуск из директории src:
+    python -m benchmarks.jwt_decode --tokens 20000
+"""
+
+import argparse
+import logging
+import time
+import uuid
+
+from jose import jwt
+
+from api.jwt_access_token import AccessTokenPayload, UserRole
+from api.jwt_backends import HS256JWTBackend, JoseJWTBackend, JWTBackend
+from services.exceptions import InvalidTokenError, TokenExpiredError
+
+logger = logging.getLogger(__name__)
+
+SECRET_KEY = "benchmark_secret_key"  # noqa: S105
+ANOTHER_SECRET_KEY = "another_secret_key"  # noqa: S105
+
+
+def make_token(exp_delta: int = 3600, secret_key: str = SECRET_KEY, **extra) -> str:
+    now = int(time.time())
+    payload = {
+        "user_id": str(uuid.uuid4()),
+        "role": UserRole.BASIC_USER.value,
+        "iat": now,
+        "exp": now + exp_delta,
+        **extra,
+    }
+    return jwt.encode(payload, secret_key, algorithm="HS256")
+
+
+def outcome(backend: JWTBackend, token: str) -> str:
+    try:
+        backend.decode(token)
+    except TokenExpiredError:
+        return "expired"
+    except InvalidTokenError:
+        return "invalid"
+    return "ok"
+
+
+def check_error_semantics(backends: dict[str, JWTBackend]) -> bool:
+    valid = make_token()
+    header, payload, signature = valid.split(".")
+    cases = {
+        "валидный": valid,
+        "истёкший": make_token(exp_delta=-10),
+        "чужой ключ": make_token(secret_key=ANOTHER_SECRET_KEY),
+        "изменённая нагрузка": f"{header}.{make_token().split('.')[1]}.{signature}",
+        "изменённая подпись": f"{header}.{payload}.{signature[:-2]}AA",
+        "два сегмента": f"{header}.{payload}",
+        "не base64": f"{header}.{payload}.!!!",
+        "nbf в будущем": make_token(nbf=int(time.time()) + 3600),
+        "с aud": make_token(aud="billing"),
+        "истёкший с aud": make_token(exp_delta=-10, aud="billing"),
+        "с at_hash": make_token(at_hash="hash"),
+        "строковый sub": make_token(sub="user"),
+        "числовой sub": make_token(sub=123),
+        "строковый jti": make_token(jti="token-id"),
+        "числовой jti": make_token(jti=123),
+        "нечисловой exp": make_token(exp="soon"),
+        "без подписи": f"{header}.{payload}.",
+    }
+
+    consistent = True
+    for case, token in cases.items():
+        results = {name: outcome(backend, token) for name, backend in backends.items()}
+        if len(set(results.values())) != 1:
+            consistent = False
+            logger.error(f"Разные результаты для случая '{case}': {results}")
+        else:
+            logger.info(f"{case}: {next(iter(results.values()))}")
+    return consistent
+
+
+def measure(name: str, backend: JWTBackend, tokens: list[str]) -> float:
+    started_at = time.perf_counter()
+    for token in tokens:
+        AccessTokenPayload(**backend.decode(token))
+    elapsed = time.perf_counter() - started_at
+    per_token_us = elapsed / len(tokens) * 1_000_000
+    logger.info(f"{name}: {per_token_us:.1f} мкс на токен, {len(tokens) / elapsed:.0f} токенов/с на ядро")
+    return per_token_us
+
+
+def main(tokens_count: int) -> None:
+    backends: dict[str, JWTBackend] = {
+        "jose": JoseJWTBackend(SECRET_KEY, "HS256"),
+        "hs256": HS256JWTBackend(SECRET_KEY),
+    }
+    if not check_error_semantics(backends):
+        return
+
+    tokens = [make_token() for _ in range(tokens_count)]
+    results = {name: measure(name, backend, tokens) for name, backend in backends.items()}
+    logger.info(f"Ускорение hs256 относительно jose: x{results['jose'] / results['hs256']:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=20000, help="Количество токенов в каждом прогоне")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main(args.tokens)
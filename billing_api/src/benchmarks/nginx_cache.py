@@ -0,0 +1,100 @@
+"""Нагрузочный тест микрокэша nginx для анонимных GET-запросов billing_api.
+
+Скрипт в течение заданного времени отправляет конкурентные GET-запросы через nginx
+на каталог планов подписок и шаблоны формы привязки карты и по заголовку X-Cache-Status
+считает долю ответов из кэша. Все остальные ответы (MISS, EXPIRED, REVALIDATED, BYPASS, ошибки)
+получены от billing_api, по ним оценивается RPS, который доходит до billing_api.
+
+Для сравнения можно указать --base-url http://billing_api:8000, тогда запросы идут
+в billing_api напрямую и каждый ответ считается промахом.
+
+Запуск из директории src при поднятом docker compose:
+    python -m benchmarks.nginx_cache --base-url http://localhost --duration 30 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PATHS = [
+    "/api/v1/subscription_plans/",
+    "/api/v1/subscription_plans/?page=1&size=10",
+    "/api/v1/billing/get-card-form/",
+    "/api/v1/billing/success-card/",
+]
+
+CACHED_STATUSES = ("HIT", "STALE", "UPDATING")
+
+
+def percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def run_client(
+    client: httpx.AsyncClient, deadline: float, offset: int, statuses: Counter, latencies: list[float]
+) -> None:
+    index = offset
+    while time.perf_counter() < deadline:
+        path = PATHS[index % len(PATHS)]
+        index += 1
+
+        started_at = time.perf_counter()
+        try:
+            response = await client.get(path)
+        except httpx.RequestError:
+            statuses["ERROR"] += 1
+            continue
+        latencies.append((time.perf_counter() - started_at) * 1000)
+
+        if response.is_error:
+            statuses[f"HTTP_{response.status_code}"] += 1
+        else:
+            statuses[response.headers.get("X-Cache-Status", "UNCACHED")] += 1
+
+
+async def main(base_url: str, duration: float, concurrency: int) -> None:
+    statuses: Counter = Counter()
+    latencies: list[float] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        started_at = time.perf_counter()
+        deadline = started_at + duration
+        await asyncio.gather(
+            *(run_client(client, deadline, offset, statuses, latencies) for offset in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started_at
+
+    total = len(latencies)
+    if not total:
+        logger.error(f"Нет успешных запросов к {base_url}: {dict(statuses)}")
+        return
+
+    served_from_cache = sum(statuses[status] for status in CACHED_STATUSES)
+    upstream = total - served_from_cache
+    logger.info(
+        f"{total} запросов за {elapsed:.1f} с, {concurrency} конкурентных клиентов, {base_url}\n"
+        f"Статусы кэша: {dict(statuses)}\n"
+        f"Доля ответов из кэша: {served_from_cache / total:.1%}\n"
+        f"RPS клиентов: {total / elapsed:.1f}, RPS до billing_api: {upstream / elapsed:.1f}\n"
+        f"Латентность p50: {percentile(latencies, 50):.1f} мс, p99: {percentile(latencies, 99):.1f} мс"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost", help="Адрес nginx или billing_api")
+    parser.add_argument("--duration", type=float, default=30, help="Длительность теста в секундах")
+    parser.add_argument("--concurrency", type=int, default=50, help="Количество конкурентных клиентов")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(main(args.base_url, args.duration, args.concurrency))
@@ -0,0 +1,172 @@
+"""Количество обращений к БД и латентность вызова POST /api/v1/subscriptions/{id}/pay.
+
+Скрипт пересоздаёт схему в указанной БД (по умолчанию тестовой), создаёт пользователя с картой
+и подпиской и вызывает эндпоинт оплаты через ASGI-транспорт. Stripe заменён заглушкой с
+фиксированной задержкой, RabbitMQ на этом пути не используется.
+
+Для каждого вызова считаются SQL-запросы, выдачи соединений из пула и коммиты.
+Для сравнения скрипт можно запустить на коммите до перехода на UnitOfWork.
+
+Запуск из директории src:
+    python -m benchmarks.payment_round_trips --calls 500 --stripe-latency-ms 50
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from httpx import ASGITransport, AsyncClient
+from jose import jwt
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api.jwt_access_token import UserRole
+from core.config import settings
+from db.postgres import get_postgres_session, get_session
+from main import app
+from models.enums import StatusCardsEnum, SubscriptionStatus
+from models.models import Base, Subscription, SubscriptionPlan, UserCardsStripe
+from services.payment_process import PaymentProcessorStripe
+
+logger = logging.getLogger(__name__)
+
+
+class StubPaymentProcessor(PaymentProcessorStripe):
+    def __init__(self, latency: float):
+        self._latency = latency
+
+    async def process_payment(self, *args, **kwargs) -> dict:  # type: ignore[override]
+        await asyncio.sleep(self._latency)
+        return {"id": f"pi_{uuid.uuid4().hex}"}
+
+
+class DBCounters:
+    """Счётчики обращений к БД через события SQLAlchemy."""
+
+    def __init__(self, engine):
+        self.statements = 0
+        self.checkouts = 0
+        self.commits = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine.sync_engine, "commit", self._on_commit)
+        event.listen(engine.sync_engine.pool, "checkout", self._on_checkout)
+
+    def snapshot(self) -> tuple[int, int, int]:
+        return self.statements, self.checkouts, self.commits
+
+    def _on_statement(self, *args) -> None:
+        self.statements += 1
+
+    def _on_commit(self, *args) -> None:
+        self.commits += 1
+
+    def _on_checkout(self, *args) -> None:
+        self.checkouts += 1
+
+
+async def seed(session_maker: async_sessionmaker[AsyncSession], user_id: uuid.UUID) -> tuple[uuid.UUID, uuid.UUID]:
+    async with session_maker() as session:
+        plan = SubscriptionPlan(title="Bench", description="Benchmark plan", price=1000, duration_days=30)
+        card = UserCardsStripe(
+            user_id=user_id,
+            stripe_user_id="cus_bench",
+            token_card="pm_bench",  # noqa: S106
+            status=StatusCardsEnum.SUCCESS,
+            last_numbers_card="4242",
+            is_default=True,
+        )
+        session.add_all([plan, card])
+        await session.flush()
+        subscription = Subscription(
+            user_id=user_id,
+            plan_id=plan.id,
+            status=SubscriptionStatus.PENDING,
+            start_date=datetime.now(),
+            end_date=datetime.now() + timedelta(days=30),
+        )
+        session.add(subscription)
+        await session.commit()
+        return subscription.id, card.id
+
+
+def percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def main(dsn: str, calls: int, stripe_latency_ms: int) -> None:
+    engine = create_async_engine(dsn)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def override_get_session():
+        async with session_maker() as session:
+            yield session
+
+    async def override_get_postgres_session():
+        return session_maker
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_postgres_session] = override_get_postgres_session
+    app.dependency_overrides[PaymentProcessorStripe] = lambda: StubPaymentProcessor(stripe_latency_ms / 1000)
+
+    user_id = uuid.uuid4()
+    now = int(time.time())
+    token = jwt.encode(
+        {"user_id": str(user_id), "role": UserRole.BASIC_USER.value, "iat": now, "exp": now + 3600},
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm,
+    )
+
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+        subscription_id, card_id = await seed(session_maker, user_id)
+
+        counters = DBCounters(engine)
+        latencies, statements, checkouts, commits = [], [], [], []
+        async with AsyncClient(transport=ASGITransport(app), base_url="http://bench") as client:
+            for _ in range(calls):
+                before = counters.snapshot()
+                started_at = time.perf_counter()
+                response = await client.post(
+                    f"/api/v1/subscriptions/{subscription_id}/pay",
+                    params={"card_id": str(card_id)},
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+                latencies.append((time.perf_counter() - started_at) * 1000)
+                response.raise_for_status()
+
+                after = counters.snapshot()
+                statements.append(after[0] - before[0])
+                checkouts.append(after[1] - before[1])
+                commits.append(after[2] - before[2])
+
+        logger.info(
+            f"{calls} вызовов, задержка Stripe {stripe_latency_ms} мс\n"
+            f"SQL-запросов на вызов: {statistics.mean(statements):.1f}\n"
+            f"Соединений из пула на вызов: {statistics.mean(checkouts):.1f}\n"
+            f"Коммитов на вызов: {statistics.mean(commits):.1f}\n"
+            f"Латентность p50: {percentile(latencies, 50):.1f} мс, p99: {percentile(latencies, 99):.1f} мс"
+        )
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--dsn", default=settings.tests.test_postgres_url, help="БД для замера, схема будет пересоздана"
+    )
+    parser.add_argument("--calls", type=int, default=500, help="Количество вызовов эндпоинта")
+    parser.add_argument("--stripe-latency-ms", type=int, default=50, help="Задержка заглушки Stripe")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.dsn, args.calls, args.stripe_latency_ms))
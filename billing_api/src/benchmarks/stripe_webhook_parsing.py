@@ -0,0 +1,114 @@
+"""Стоимость проверки подписи и разбора одного вебхука Stripe.
+
+Сравниваются два варианта на одинаковом подписанном событии payment_intent.succeeded:
+    - stripe.Webhook.construct_event из SDK Stripe (декодирование тела в str, проверка подписи,
+      json.loads и построение объекта StripeObject);
+    - read_stripe_event (проверка подписи по исходным байтам и orjson с извлечением id, type и data.object).
+
+Запуск из директории src:
+    python -m benchmarks.stripe_webhook_parsing --events 20000
+"""
+
+import argparse
+import hashlib
+import hmac
+import logging
+import time
+import uuid
+
+import orjson
+import stripe
+
+from core.config import settings
+from services.stripe_webhook import read_stripe_event
+
+logger = logging.getLogger(__name__)
+
+SECRET = "whsec_benchmark"  # noqa: S105
+
+
+def build_event() -> bytes:
+    """Событие, близкое по размеру и вложенности к реальному payment_intent.succeeded."""
+    payment_intent_id = f"pi_{uuid.uuid4().hex}"
+    return orjson.dumps(
+        {
+            "id": f"evt_{uuid.uuid4().hex}",
+            "object": "event",
+            "api_version": "2024-06-20",
+            "created": int(time.time()),
+            "type": "payment_intent.succeeded",
+            "livemode": False,
+            "pending_webhooks": 1,
+            "request": {"id": f"req_{uuid.uuid4().hex}", "idempotency_key": str(uuid.uuid4())},
+            "data": {
+                "object": {
+                    "id": payment_intent_id,
+                    "object": "payment_intent",
+                    "amount": 99900,
+                    "amount_received": 99900,
+                    "currency": "rub",
+                    "customer": f"cus_{uuid.uuid4().hex[:14]}",
+                    "status": "succeeded",
+                    "payment_method": f"pm_{uuid.uuid4().hex}",
+                    "payment_method_types": ["card"],
+                    "metadata": {"subscription_id": str(uuid.uuid4()), "user_id": str(uuid.uuid4())},
+                    "charges": {
+                        "object": "list",
+                        "data": [
+                            {
+                                "id": f"ch_{uuid.uuid4().hex}",
+                                "object": "charge",
+                                "amount": 99900,
+                                "payment_intent": payment_intent_id,
+                                "billing_details": {"address": {"country": "RU"}, "email": None, "name": None},
+                                "outcome": {"network_status": "approved_by_network", "risk_level": "normal"},
+                                "payment_method_details": {
+                                    "card": {"brand": "visa", "last4": "4242", "exp_month": 12, "exp_year": 2030},
+                                    "type": "card",
+                                },
+                            }
+                        ],
+                        "has_more": False,
+                    },
+                }
+            },
+        }
+    )
+
+
+def sign(raw_body: bytes, timestamp: int) -> str:
+    signature = hmac.new(SECRET.encode(), f"{timestamp}.".encode() + raw_body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def measure(name: str, events: int, func) -> float:
+    started_at = time.perf_counter()
+    for _ in range(events):
+        func()
+    per_event_us = (time.perf_counter() - started_at) / events * 1_000_000
+    logger.info(f"{name}: {per_event_us:.1f} мкс на событие, {1_000_000 / per_event_us:.0f} событий/с на ядро")
+    return per_event_us
+
+
+def main(events: int) -> None:
+    raw_body = build_event()
+    signature_header = sign(raw_body, int(time.time()))
+    settings.stripe_webhook_secret = SECRET
+
+    logger.info(f"Размер события: {len(raw_body)} байт, {events} событий")
+    sdk = measure(
+        "stripe.Webhook.construct_event",
+        events,
+        lambda: stripe.Webhook.construct_event(raw_body.decode(), signature_header, SECRET),
+    )
+    fast = measure("read_stripe_event", events, lambda: read_stripe_event(raw_body, signature_header))
+    logger.info(f"Ускорение: x{sdk / fast:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000, help="Количество событий в каждом прогоне")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main(args.events)
@@ -0,0 +1,92 @@
+"""Пропускная способность BaseQueueWorker.make_post_request с новым HTTP-клиентом на каждое сообщение
+и с общим клиентом воркера.
+
+Запросы отправляются на локальный HTTP-сервер заглушку, который отвечает 200 на любой POST
+и держит keep-alive соединения, поэтому в замер попадает только стоимость клиентской стороны.
+
+Запуск из директории src:
+    python -m benchmarks.worker_http_client --messages 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+
+from workers.base import BaseQueueWorker, create_http_client
+
+logger = logging.getLogger(__name__)
+
+STUB_RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}"
+
+
+class StubWorker(BaseQueueWorker):
+    def __init__(self, queue_name: str, http_client: httpx.AsyncClient, url: str):
+        super().__init__(queue_name, http_client)
+        self._url = url
+
+    async def handle_event(self, message_body: dict) -> None:
+        await self.make_post_request(self._url, payload=message_body)
+
+
+async def handle_stub_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while headers := await reader.readuntil(b"\r\n\r\n"):
+            content_length = 0
+            for line in headers.split(b"\r\n"):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    content_length = int(value)
+            await reader.readexactly(content_length)
+            writer.write(STUB_RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def bench_client_per_message(url: str, messages: int) -> float:
+    """Поведение до изменений: новый httpx.AsyncClient на каждое сообщение."""
+    started_at = time.perf_counter()
+    for number in range(messages):
+        async with httpx.AsyncClient() as http_client:
+            await StubWorker("bench", http_client, url).handle_event({"number": number})
+    return messages / (time.perf_counter() - started_at)
+
+
+async def bench_shared_client(url: str, messages: int) -> float:
+    """Общий клиент воркера, созданный как в run_worker."""
+    started_at = time.perf_counter()
+    async with create_http_client() as http_client:
+        worker = StubWorker("bench", http_client, url)
+        for number in range(messages):
+            await worker.handle_event({"number": number})
+    return messages / (time.perf_counter() - started_at)
+
+
+async def main(messages: int) -> None:
+    server = await asyncio.start_server(handle_stub_connection, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    url = f"http://{host}:{port}/notify/"
+
+    # логирование каждого запроса заметно искажает замер
+    logging.getLogger("workers.base").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    async with server:
+        per_message = await bench_client_per_message(url, messages)
+        shared = await bench_shared_client(url, messages)
+
+    logger.info(f"Клиент на каждое сообщение: {per_message:.0f} сообщений/с")
+    logger.info(f"Общий клиент воркера: {shared:.0f} сообщений/с (x{shared / per_message:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000, help="Количество сообщений в каждом прогоне")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.messages))
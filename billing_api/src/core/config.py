@@ -1,4 +1,5 @@
 from logging import config as logging_config
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -15,12 +16,38 @@ class RabbitMQSettings(BaseSettings):
     user: str = Field("user", alias="RABBITMQ_USER")
     password: str = Field("password", alias="RABBITMQ_PASSWORD")
     exchange_name: str = Field("billing_events", alias="RABBITMQ_EXCHANGE_NAME")
+    publish_timeout: float = Field(5.0, alias="RABBITMQ_PUBLISH_TIMEOUT")
+    plan_cache_exchange_name: str = Field("subscription_plan_cache", alias="RABBITMQ_PLAN_CACHE_EXCHANGE_NAME")
 
     @property
     def url(self):
         return f"amqp://{self.user}:{self.password}@{self.host}:{self.port}"
 
 
+class WorkerHttpSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore", env_prefix="WORKER_HTTP_"
+    )
+    max_connections: int = Field(100, alias="WORKER_HTTP_MAX_CONNECTIONS")
+    max_keepalive_connections: int = Field(20, alias="WORKER_HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    keepalive_expiry: float = Field(30.0, alias="WORKER_HTTP_KEEPALIVE_EXPIRY")
+    timeout: float = Field(10.0, alias="WORKER_HTTP_TIMEOUT")
+    connect_timeout: float = Field(5.0, alias="WORKER_HTTP_CONNECT_TIMEOUT")
+
+
+class PostgresPoolSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore", env_prefix="POSTGRES_POOL_"
+    )
+    size: int = Field(5, alias="POSTGRES_POOL_SIZE")
+    max_overflow: int = Field(10, alias="POSTGRES_POOL_MAX_OVERFLOW")
+    timeout: float = Field(30.0, alias="POSTGRES_POOL_TIMEOUT")
+    recycle: int = Field(1800, alias="POSTGRES_POOL_RECYCLE")  # -1 отключает пересоздание соединений
+    pre_ping: bool = Field(True, alias="POSTGRES_POOL_PRE_PING")
+    # кэш подготовленных выражений asyncpg на соединение, 0 отключает кэш (нужно для pgbouncer)
+    statement_cache_size: int = Field(100, alias="POSTGRES_POOL_STATEMENT_CACHE_SIZE")
+
+
 class TestSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore", env_prefix="TEST_")
     postgres_db: str
@@ -46,19 +73,58 @@ class Settings(BaseSettings):
     project_name: str = Field("billing_api", alias="PROJECT_NAME")
     postgres_url: str = Field("postgresql+asyncpg://postgres:postgres@db:5432/foo", alias="POSTGRES_URL")
     engine_echo: bool = Field(default=False, alias="ENGINE_ECHO")
+    postgres_pool: PostgresPoolSettings = PostgresPoolSettings()
     jwt_secret_key: str = Field("my_secret_key", alias="JWT_SECRET_KEY")
     jwt_algorithm: str = Field("HS256", alias="JWT_ALGORITHM")
+    # jose - python-jose для любого алгоритма, hs256 - быстрая проверка только для HS256
+    jwt_backend: Literal["jose", "hs256"] = Field("jose", alias="JWT_BACKEND")
+    # количество проверенных токенов в кэше процесса, 0 отключает кэш
+    jwt_cache_size: int = Field(10000, alias="JWT_CACHE_SIZE")
     stripe_publishable_key: str = Field("stripe_publishable_key", alias="STRIPE_PUBLISHABLE_KEY")
     stripe_api_key: str = Field("stripe_secret_key", alias="STRIPE_API_KEY")
+    # без секрета приложение не запускается, если проверка подписи вебхуков не отключена явно
+    stripe_webhook_secret: str | None = Field(None, alias="STRIPE_WEBHOOK_SECRET")
+    # только для локальной разработки: вебхуки принимаются без проверки подписи
+    stripe_webhook_verification_disabled: bool = Field(False, alias="STRIPE_WEBHOOK_VERIFICATION_DISABLED")
+    stripe_webhook_tolerance_sec: int = Field(300, alias="STRIPE_WEBHOOK_TOLERANCE_SEC")
 
     secret_token: str = Field("super_secret_token", alias="SECRET_TOKEN")
     auth_service_url: str = Field("http://localhost/api/v1/auth", alias="AUTH_SERVICE_URL")
     notification_service_url: str = Field("http://localhost/api/v1/notitications", alias="NOTIFICATION_SERVICE_URL")
+    notification_bulk_url: str | None = Field(None, alias="NOTIFICATION_BULK_URL")
+    notification_batch_size: int = Field(50, alias="NOTIFICATION_BATCH_SIZE")
+    notification_batch_max_delay_ms: int = Field(50, alias="NOTIFICATION_BATCH_MAX_DELAY_MS")
 
     rabbitmq: RabbitMQSettings = RabbitMQSettings()  # type:ignore[call-arg]
+    worker_http: WorkerHttpSettings = WorkerHttpSettings()
+    worker_prefetch_count: int = Field(200, alias="WORKER_PREFETCH_COUNT")
+    worker_concurrency: int = Field(100, alias="WORKER_CONCURRENCY")
+    worker_shutdown_timeout_sec: float = Field(30.0, alias="WORKER_SHUTDOWN_TIMEOUT_SEC")
+    # пауза перед возвратом сообщения в очередь, пока Circuit Breaker открыт
+    worker_circuit_open_retry_delay_sec: float = Field(1.0, alias="WORKER_CIRCUIT_OPEN_RETRY_DELAY_SEC")
+    webhook_worker_concurrency: int = Field(10, alias="WEBHOOK_WORKER_CONCURRENCY")
+    # повторы события вебхука, для оплаты которого ещё нет транзакции, задержка удваивается с каждой попыткой
+    webhook_worker_retry_attempts: int = Field(6, alias="WEBHOOK_WORKER_RETRY_ATTEMPTS")
+    webhook_worker_retry_backoff_sec: float = Field(0.5, alias="WEBHOOK_WORKER_RETRY_BACKOFF_SEC")
+    # при недоступности БД, RabbitMQ или Stripe событие повторяется без ограничения числа попыток
+    webhook_worker_retry_max_backoff_sec: float = Field(30.0, alias="WEBHOOK_WORKER_RETRY_MAX_BACKOFF_SEC")
     tests: TestSettings = TestSettings()
 
+    metrics_enabled: bool = Field(True, alias="METRICS_ENABLED")
+    # режим отладки: подсчёт SQL-запросов и сессий на каждый HTTP-запрос и поиск N+1
+    sql_profiling_enabled: bool = Field(False, alias="SQL_PROFILING_ENABLED")
+    sql_profiling_max_statements: int = Field(20, alias="SQL_PROFILING_MAX_STATEMENTS")
+    sql_profiling_max_repeats: int = Field(5, alias="SQL_PROFILING_MAX_REPEATS")
+
+    plan_cache_ttl_sec: float = Field(300.0, alias="PLAN_CACHE_TTL_SEC")
+    plan_catalogue_max_age_sec: int = Field(60, alias="PLAN_CATALOGUE_MAX_AGE_SEC")
+
+    outbox_relay_batch_size: int = Field(500, alias="OUTBOX_RELAY_BATCH_SIZE")
+    outbox_relay_interval_sec: float = Field(0.5, alias="OUTBOX_RELAY_INTERVAL_SEC")
+
     celery_scheduler_interval_sec: int = Field(60, alias="CELERY_SСHEDULER_INTERVAL_SEC")
+    expiry_sweep_chunk_size: int = Field(500, alias="EXPIRY_SWEEP_CHUNK_SIZE")
+    expiry_sweep_concurrency: int = Field(10, alias="EXPIRY_SWEEP_CONCURRENCY")
 
 
 logging_config.dictConfig(LOGGING)
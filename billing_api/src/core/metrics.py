@@ -0,0 +1,101 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from db.pool_stats import InstrumentedQueuePool
+from utils.lru_cache import ExpiringLRUCache
+from utils.metrics import MetricsRegistry
+
+# Количество SQL-запросов за один HTTP-запрос
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "billing_http_request_duration_seconds", "Длительность обработки HTTP-запроса", ("method", "route", "status")
+)
+http_requests_in_progress = registry.gauge(
+    "billing_http_requests_in_progress", "Количество HTTP-запросов в обработке", ("method",)
+)
+http_request_db_queries = registry.histogram(
+    "billing_http_request_db_queries", "Количество SQL-запросов за HTTP-запрос", ("route",), QUERY_COUNT_BUCKETS
+)
+http_request_db_duration = registry.histogram(
+    "billing_http_request_db_duration_seconds", "Суммарное время SQL-запросов за HTTP-запрос", ("route",)
+)
+db_query_duration = registry.histogram("billing_db_query_duration_seconds", "Длительность SQL-запроса")
+rabbitmq_publish_duration = registry.histogram(
+    "billing_rabbitmq_publish_duration_seconds",
+    "Время публикации пачки сообщений в RabbitMQ до подтверждения брокером",
+    ("queue",),
+)
+stripe_request_duration = registry.histogram(
+    "billing_stripe_request_duration_seconds", "Длительность запроса к API Stripe", ("operation",)
+)
+
+db_pool_size = registry.gauge("billing_db_pool_size", "Размер пула соединений с PostgreSQL")
+db_pool_checked_out = registry.gauge("billing_db_pool_checked_out", "Выданные из пула соединения")
+db_pool_overflow = registry.gauge("billing_db_pool_overflow", "Соединения сверх размера пула")
+db_pool_timeouts = registry.counter(
+    "billing_db_pool_timeouts_total", "Количество таймаутов ожидания соединения из пула"
+)
+db_pool_wait_duration = registry.histogram(
+    "billing_db_pool_wait_duration_seconds", "Время получения соединения из пула"
+)
+
+jwt_cache_hits = registry.counter("billing_jwt_cache_hits_total", "Попадания в кэш проверенных access-токенов")
+jwt_cache_misses = registry.counter("billing_jwt_cache_misses_total", "Промахи кэша проверенных access-токенов")
+jwt_cache_size = registry.gauge("billing_jwt_cache_size", "Количество access-токенов в кэше")
+
+
+@dataclass(slots=True)
+class RequestDBStats:
+    queries: int = 0
+    duration: float = 0.0
+
+
+# Статистика SQL-запросов текущего HTTP-запроса, заполняется в MetricsMiddleware
+request_db_stats: ContextVar[RequestDBStats | None] = ContextVar("request_db_stats", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Подключает к движку подсчёт количества и длительности SQL-запросов."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def update_pool_metrics(engine: Engine) -> None:
+    """Обновляет метрики пула соединений перед выдачей /metrics."""
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return
+    db_pool_size.set(value=pool.size())
+    db_pool_checked_out.set(value=pool.checkedout())
+    db_pool_overflow.set(value=max(pool.overflow(), 0))
+    db_pool_timeouts.set_total(value=pool.timeouts)
+    # пул пересоздаётся при dispose, поэтому гистограмма берётся у текущего пула
+    db_pool_wait_duration.attach(histogram=pool.wait_time)
+
+
+def update_token_cache_metrics(cache: ExpiringLRUCache) -> None:
+    """Обновляет метрики кэша access-токенов перед выдачей /metrics."""
+    jwt_cache_hits.set_total(value=cache.hits)
+    jwt_cache_misses.set_total(value=cache.misses)
+    jwt_cache_size.set(value=len(cache))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context.metrics_query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    duration = time.perf_counter() - context.metrics_query_started_at
+    db_query_duration.observe(value=duration)
+
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.duration += duration
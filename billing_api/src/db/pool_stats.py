@@ -0,0 +1,65 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from utils.histogram import Histogram
+
+# Количество одновременно выданных соединений, по которому подбирается pool_size
+CHECKED_OUT_BUCKETS = (1, 2, 3, 5, 8, 10, 15, 20, 30, 50, 75, 100)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений SQLAlchemy, который собирает статистику выдачи соединений.
+
+    Время ожидания включает ожидание свободного соединения и открытие нового,
+    если пул ещё не заполнен.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram()
+        self.checked_out_on_checkout = Histogram(CHECKED_OUT_BUCKETS)
+        self.timeouts = 0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - started_at)
+
+        self.checked_out_on_checkout.observe(self.checkedout())
+        return connection
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict:
+    """Текущее состояние пула соединений движка и гистограммы, собранные InstrumentedQueuePool."""
+    pool = engine.pool
+    stats = {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),  # type: ignore[attr-defined]
+        "checked_in": pool.checkedin(),  # type: ignore[attr-defined]
+        "checked_out": pool.checkedout(),  # type: ignore[attr-defined]
+        "overflow": pool.overflow(),  # type: ignore[attr-defined]
+        "max_overflow": pool._max_overflow,  # type: ignore[attr-defined]
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            timeouts=pool.timeouts,
+            wait_time_seconds=_histogram_stats(pool.wait_time),
+            checked_out_on_checkout=_histogram_stats(pool.checked_out_on_checkout),
+        )
+    return stats
+
+
+def _histogram_stats(histogram: Histogram) -> dict:
+    return {
+        "count": histogram.count,
+        "sum": histogram.sum,
+        "buckets": {str(bound): count for bound, count in histogram.cumulative_counts()},
+    }
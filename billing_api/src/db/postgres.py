@@ -1,8 +1,9 @@
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from core.config import settings
+from db.pool_stats import InstrumentedQueuePool
 
 engine: AsyncEngine | None = None
 async_session: async_sessionmaker[AsyncSession] | None = None
@@ -10,6 +11,23 @@ async_session: async_sessionmaker[AsyncSession] | None = None
 dsn = settings.postgres_url
 
 
+def create_postgres_engine() -> AsyncEngine:
+    """Создаёт движок с пулом соединений по настройкам POSTGRES_POOL_*."""
+    pool = settings.postgres_pool
+    return create_async_engine(
+        dsn,
+        echo=settings.engine_echo,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool.size,
+        max_overflow=pool.max_overflow,
+        pool_timeout=pool.timeout,
+        pool_recycle=pool.recycle,
+        pool_pre_ping=pool.pre_ping,
+        connect_args={"prepared_statement_cache_size": pool.statement_cache_size},
+    )
+
+
 async def get_postgres_session() -> async_sessionmaker[AsyncSession]:
     return async_session
 
@@ -12,6 +12,12 @@ exchange: AbstractExchange | None = None
 class QueueName(str, enum.Enum):
     AUTH = "auth_events"
     NOTIFICATION = "notification_events"
+    STRIPE_WEBHOOK = "stripe_webhook_events"
+
+
+def dead_letter_queue_name(queue_name: str) -> str:
+    """Имя очереди, в которую попадают отклонённые сообщения очереди queue_name (DLQ)."""
+    return f"{queue_name}_dlq"
 
 
 async def create_rabbitmq_connection(rabbitmq_url: str) -> AbstractRobustConnection:
@@ -19,7 +25,8 @@ async def create_rabbitmq_connection(rabbitmq_url: str) -> AbstractRobustConnect
 
 
 async def init_rabbitmq(connection: AbstractRobustConnection) -> AbstractExchange:
-    channel = await connection.channel()
+    # публикация в обменник ждёт подтверждения брокера (publisher confirms)
+    channel = await connection.channel(publisher_confirms=True)
     exchange = await channel.declare_exchange(
         settings.rabbitmq.exchange_name,
         aio_pika.ExchangeType.DIRECT,
@@ -35,7 +42,7 @@ async def init_rabbitmq(connection: AbstractRobustConnection) -> AbstractExchang
     )
 
     for queue_name in QueueName:
-        dlq_queue_name = f"{queue_name.value}_dlq"
+        dlq_queue_name = dead_letter_queue_name(queue_name.value)
 
         # main queue
         queue = await channel.declare_queue(
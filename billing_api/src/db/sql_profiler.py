@@ -0,0 +1,95 @@
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Блок query_budget выполнил больше SQL-запросов или сессий, чем допустимо."""
+
+
+# eq=False: профиль сравнивается и хэшируется по identity, поэтому сессия хранит в info сами профили
+@dataclass(slots=True, eq=False)
+class SQLProfile:
+    """SQL-запросы и сессии, выполненные внутри profile_sql."""
+
+    statements: Counter[str] = field(default_factory=Counter)
+    sessions_count: int = 0
+
+    @property
+    def statements_count(self) -> int:
+        return self.statements.total()
+
+    def repeated_statements(self, max_repeats: int) -> list[tuple[str, int]]:
+        """Запросы, выполненные больше max_repeats раз: обычно это N+1 в цикле по объектам."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count > max_repeats]
+
+    def summary(self) -> str:
+        lines = [f"{self.statements_count} SQL-запросов в {self.sessions_count} сессиях"]
+        lines.extend(f"{count} x {' '.join(statement.split())}" for statement, count in self.statements.most_common())
+        return "\n".join(lines)
+
+
+# Вложенные profile_sql: каждый запрос учитывается во всех активных профилях
+_active_profiles: ContextVar[tuple[SQLProfile, ...]] = ContextVar("active_sql_profiles", default=())
+
+
+def install_sql_profiler() -> None:
+    """Подключает подсчёт SQL-запросов и сессий ко всем движкам и сессиям SQLAlchemy процесса."""
+    if not event.contains(Engine, "before_cursor_execute", _count_statement):
+        event.listen(Engine, "before_cursor_execute", _count_statement)
+        event.listen(Session, "after_begin", _count_session)
+
+
+@contextmanager
+def profile_sql() -> Iterator[SQLProfile]:
+    """Считает SQL-запросы и сессии, выполненные в текущем контексте (задаче asyncio) внутри блока."""
+    profile = SQLProfile()
+    token = _active_profiles.set((*_active_profiles.get(), profile))
+    try:
+        yield profile
+    finally:
+        _active_profiles.reset(token)
+
+
+@contextmanager
+def query_budget(
+    max_statements: int, max_sessions: int | None = None, max_repeats: int | None = None
+) -> Iterator[SQLProfile]:
+    """Проверяет, что блок укладывается в бюджет SQL-запросов, например в тестах маршрутов.
+
+    Raises:
+        QueryBudgetExceededError: превышено количество запросов, сессий или повторов одного запроса.
+    """
+    install_sql_profiler()
+    with profile_sql() as profile:
+        yield profile
+
+    errors = []
+    if profile.statements_count > max_statements:
+        errors.append(f"SQL-запросов {profile.statements_count}, допустимо {max_statements}")
+    if max_sessions is not None and profile.sessions_count > max_sessions:
+        errors.append(f"сессий {profile.sessions_count}, допустимо {max_sessions}")
+    if max_repeats is not None and profile.repeated_statements(max_repeats):
+        errors.append(f"запросы повторяются больше {max_repeats} раз")
+    if errors:
+        raise QueryBudgetExceededError(f"Превышен бюджет запросов: {', '.join(errors)}\n{profile.summary()}")
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    for profile in _active_profiles.get():
+        profile.statements[statement] += 1
+
+
+def _count_session(session, transaction, connection) -> None:
+    # сессия может открыть несколько транзакций, учитываем её в каждом профиле один раз
+    counted_in: set[SQLProfile] = session.info.setdefault("sql_profiles", set())
+    for profile in _active_profiles.get():
+        if profile not in counted_in:
+            counted_in.add(profile)
+            profile.sessions_count += 1
@@ -1,17 +1,25 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
 from fastapi_pagination import add_pagination
 from fastapi_pagination.utils import disable_installed_extensions_check
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from starlette.staticfiles import StaticFiles
 
+from api import metrics
+from api.middleware import MetricsMiddleware, SQLProfilerMiddleware
 from api.v1 import billing, subscription, subscription_plan, transaction
 from api.v1.admin.admin_routes import router as admin_router
 from core.config import settings
+from core.metrics import instrument_engine
 from db import postgres, rabbitmq
+from db.sql_profiler import install_sql_profiler
+from services.outbox import OutboxRelay
+from services.stripe_webhook import check_stripe_webhook_settings
+from services.subscription_plan_cache import subscription_plan_cache
 
 # Для избежания варнингов для paginator в консоли
 disable_installed_extensions_check()
@@ -19,13 +27,29 @@ disable_installed_extensions_check()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    postgres.engine = create_async_engine(postgres.dsn, echo=settings.engine_echo, future=True)
+    check_stripe_webhook_settings()
+    postgres.engine = postgres.create_postgres_engine()
     postgres.async_session = async_sessionmaker(bind=postgres.engine, expire_on_commit=False, class_=AsyncSession)  # type: ignore[assignment]
+    if settings.metrics_enabled:
+        instrument_engine(postgres.engine.sync_engine)
 
     rabbitmq.connection = await rabbitmq.create_rabbitmq_connection(settings.rabbitmq.url)
     rabbitmq.exchange = await rabbitmq.init_rabbitmq(rabbitmq.connection)
+    await subscription_plan_cache.bind(rabbitmq.connection)
+
+    outbox_relay = OutboxRelay(
+        postgres.async_session,
+        rabbitmq.exchange,
+        batch_size=settings.outbox_relay_batch_size,
+        poll_interval=settings.outbox_relay_interval_sec,
+    )
+    outbox_relay_task = asyncio.create_task(outbox_relay.run())
 
     yield
+    outbox_relay_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await outbox_relay_task
+    await subscription_plan_cache.close()
     await rabbitmq.close_rabbitmq_connection(rabbitmq.connection)
 
 
@@ -43,6 +67,14 @@ app.include_router(subscription_plan.router, prefix="/api/v1/subscription_plans"
 app.include_router(subscription.router, prefix="/api/v1/subscriptions", tags=["Subscriptions"])
 app.include_router(admin_router, prefix="/api/v1", tags=["Admin"])
 
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
+if settings.sql_profiling_enabled:
+    install_sql_profiler()
+    app.add_middleware(SQLProfilerMiddleware)
+
 add_pagination(app)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -0,0 +1,70 @@
+"""add_hot_path_indexes
+
+Revision ID: b3f1c9a2d4e7
+Revises: 8859ae0f173e
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c9a2d4e7'
+down_revision: Union[str, None] = '8859ae0f173e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Оставляем у каждого пользователя только самую свежую активную дефолтную карту,
+    # иначе частичный уникальный индекс не создастся на существующих данных.
+    # Флаг на картах в статусах INIT и FAIL индексом не ограничивается и не трогается.
+    op.execute(
+        """
+        UPDATE usercardsstripes SET is_default = false
+        WHERE is_default AND status = 'SUCCESS' AND id NOT IN (
+            SELECT DISTINCT ON (user_id) id FROM usercardsstripes
+            WHERE is_default AND status = 'SUCCESS'
+            ORDER BY user_id, created_at DESC, id DESC
+        )
+        """
+    )
+    # Один PaymentIntent должен соответствовать одной транзакции: у дублей, кроме самой ранней
+    # транзакции, ссылка на PaymentIntent обнуляется, иначе уникальный индекс не создастся.
+    op.execute(
+        """
+        UPDATE transactions SET stripe_payment_intent_id = NULL
+        WHERE stripe_payment_intent_id IS NOT NULL AND id NOT IN (
+            SELECT DISTINCT ON (stripe_payment_intent_id) id FROM transactions
+            WHERE stripe_payment_intent_id IS NOT NULL
+            ORDER BY stripe_payment_intent_id, created_at, id
+        )
+        """
+    )
+
+    # Индексы создаются CONCURRENTLY, чтобы не блокировать запись в большие таблицы,
+    # а это возможно только вне транзакции.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_subscriptions_user_id_status', 'subscriptions', ['user_id', 'status'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_subscriptions_status_end_date', 'subscriptions', ['status', 'end_date'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_subscriptions_created_at_id', 'subscriptions', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_transactions_stripe_payment_intent_id', 'transactions', ['stripe_payment_intent_id'], unique=True, postgresql_concurrently=True)
+        op.create_index('ix_transactions_user_id_created_at_id', 'transactions', ['user_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_transactions_created_at_id', 'transactions', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_usercardsstripes_stripe_user_id_status_created_at', 'usercardsstripes', ['stripe_user_id', 'status', 'created_at'], unique=False, postgresql_concurrently=True)
+        op.create_index('uq_usercardsstripes_user_id_default', 'usercardsstripes', ['user_id'], unique=True, postgresql_where=sa.text("is_default AND status = 'SUCCESS'"), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_usercardsstripes_user_id_default', table_name='usercardsstripes', postgresql_where=sa.text("is_default AND status = 'SUCCESS'"), postgresql_concurrently=True)
+        op.drop_index('ix_usercardsstripes_stripe_user_id_status_created_at', table_name='usercardsstripes', postgresql_concurrently=True)
+        op.drop_index('ix_transactions_created_at_id', table_name='transactions', postgresql_concurrently=True)
+        op.drop_index('ix_transactions_user_id_created_at_id', table_name='transactions', postgresql_concurrently=True)
+        op.drop_index('ix_transactions_stripe_payment_intent_id', table_name='transactions', postgresql_concurrently=True)
+        op.drop_index('ix_subscriptions_created_at_id', table_name='subscriptions', postgresql_concurrently=True)
+        op.drop_index('ix_subscriptions_status_end_date', table_name='subscriptions', postgresql_concurrently=True)
+        op.drop_index('ix_subscriptions_user_id_status', table_name='subscriptions', postgresql_concurrently=True)
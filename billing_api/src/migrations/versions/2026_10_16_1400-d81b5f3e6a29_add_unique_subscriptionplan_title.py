@@ -0,0 +1,41 @@
+"""add_unique_subscriptionplan_title
+
+Revision ID: d81b5f3e6a29
+Revises: c4a7e2d91f03
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81b5f3e6a29'
+down_revision: Union[str, None] = 'c4a7e2d91f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Проверка заголовка в приложении не защищает от гонки, поэтому дубли могут существовать.
+    # На планы ссылаются подписки (ON DELETE RESTRICT), так что дубли не удаляются, а переименовываются:
+    # самый ранний план сохраняет заголовок, к остальным добавляется их id (с обрезкой до String(255)).
+    op.execute(
+        """
+        UPDATE subscriptionplans SET title = left(title, 216) || ' (' || id || ')'
+        WHERE id NOT IN (
+            SELECT DISTINCT ON (title) id FROM subscriptionplans
+            ORDER BY title, created_at, id
+        )
+        """
+    )
+
+    # Уникальность заголовка нужна для ON CONFLICT при импорте планов подписок.
+    with op.get_context().autocommit_block():
+        op.create_index('uq_subscriptionplans_title', 'subscriptionplans', ['title'], unique=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_subscriptionplans_title', table_name='subscriptionplans', postgresql_concurrently=True)
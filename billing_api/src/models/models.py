@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime
+from typing import Any, ClassVar
 
-from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, String, Text, func
-from sqlalchemy.dialects.postgresql import ENUM, TIMESTAMP
+from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, Index, String, Text, func, text
+from sqlalchemy.dialects.postgresql import ENUM, JSONB, TIMESTAMP
 from sqlalchemy.dialects.postgresql import UUID as PgUUID
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -11,6 +12,11 @@ from models.enums import PaymentType, StatusCardsEnum, SubscriptionStatus, Trans
 
 
 class Base(DeclarativeBase):
+    # updated_at вычисляется в БД при каждом UPDATE, новое значение забирается тем же запросом через RETURNING.
+    # Без eager_defaults серверные значения истекают после flush, и их чтение в async-коде
+    # (например, при сериализации ответа) приводит к ленивой загрузке вне greenlet.
+    __mapper_args__: ClassVar[dict[str, Any]] = {"eager_defaults": True}
+
     @declared_attr.directive
     def __tablename__(cls):
         return f"{cls.__name__.lower()}s"
@@ -23,11 +29,13 @@ class Base(DeclarativeBase):
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
         server_default=func.current_timestamp(),
-        server_onupdate=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
     )
 
 
 class SubscriptionPlan(Base):
+    __table_args__ = (Index("uq_subscriptionplans_title", "title", unique=True),)
+
     title: Mapped[str] = mapped_column(String(255))
     description: Mapped[str] = mapped_column(Text)
     price: Mapped[int]
@@ -38,6 +46,12 @@ class SubscriptionPlan(Base):
 
 
 class Subscription(Base):
+    __table_args__ = (
+        Index("ix_subscriptions_user_id_status", "user_id", "status"),
+        Index("ix_subscriptions_status_end_date", "status", "end_date"),
+        Index("ix_subscriptions_created_at_id", "created_at", "id"),
+    )
+
     user_id: Mapped[uuid.UUID] = mapped_column(PgUUID)
     plan_id: Mapped[uuid.UUID] = mapped_column(
         PgUUID,
@@ -60,6 +74,17 @@ class Subscription(Base):
 
 
 class UserCardsStripe(Base):
+    __table_args__ = (
+        Index("ix_usercardsstripes_stripe_user_id_status_created_at", "stripe_user_id", "status", "created_at"),
+        # у пользователя может быть только одна активная карта по умолчанию
+        Index(
+            "uq_usercardsstripes_user_id_default",
+            "user_id",
+            unique=True,
+            postgresql_where=text("is_default AND status = 'SUCCESS'"),
+        ),
+    )
+
     user_id = Column(PgUUID(as_uuid=True), nullable=False)
     stripe_user_id = Column(String, nullable=False)
     token_card = Column(String, nullable=True)
@@ -74,6 +99,12 @@ class UserCardsStripe(Base):
 
 
 class Transaction(Base):
+    __table_args__ = (
+        Index("ix_transactions_stripe_payment_intent_id", "stripe_payment_intent_id", unique=True),
+        Index("ix_transactions_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_transactions_created_at_id", "created_at", "id"),
+    )
+
     subscription_id: Mapped[uuid.UUID] = mapped_column(
         PgUUID,
         ForeignKey("subscriptions.id", ondelete="RESTRICT"),
@@ -106,3 +137,21 @@ class Transaction(Base):
 
     subscription: Mapped["Subscription"] = relationship(back_populates="transactions")
     user_card: Mapped["UserCardsStripe"] = relationship(back_populates="transactions")
+
+
+class OutboxEvent(Base):
+    """Сообщение для RabbitMQ, записанное в одной транзакции с изменением данных (transactional outbox)."""
+
+    __table_args__ = (Index("ix_outboxevents_created_at", "created_at"),)
+
+    queue_name: Mapped[str] = mapped_column(String(255))
+    payload: Mapped[dict] = mapped_column(JSONB)
+
+
+class StripeEvent(Base):
+    """Журнал принятых событий Stripe для отсечения повторных доставок вебхуков."""
+
+    __table_args__ = (Index("uq_stripeevents_event_id", "event_id", unique=True),)
+
+    event_id: Mapped[str] = mapped_column(String(255))
+    event_type: Mapped[str] = mapped_column(String(255))
@@ -0,0 +1,32 @@
+"""Возвращает сообщения из DLQ в основную очередь для повторной обработки.
+
+Запуск из директории src, например для событий Stripe, не обработанных WebhookWorker:
+    python redrive_dead_letters.py stripe_webhook_events --limit 100
+"""
+
+import argparse
+import asyncio
+
+from core.config import settings
+from db import rabbitmq
+from db.rabbitmq import QueueName, dead_letter_queue_name
+from workers.dead_letters import redrive_dead_letters
+
+
+async def main(queue_name: QueueName, limit: int | None) -> None:
+    connection = await rabbitmq.create_rabbitmq_connection(settings.rabbitmq.url)
+    try:
+        exchange = await rabbitmq.init_rabbitmq(connection)
+        channel = await connection.channel()
+        dlq = await channel.get_queue(dead_letter_queue_name(queue_name.value))
+        await redrive_dead_letters(dlq, exchange, queue_name.value, limit)
+    finally:
+        await rabbitmq.close_rabbitmq_connection(connection)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queue", choices=[queue_name.value for queue_name in QueueName], help="основная очередь")
+    parser.add_argument("--limit", type=int, default=None, help="сколько сообщений вернуть, по умолчанию все")
+    args = parser.parse_args()
+    asyncio.run(main(QueueName(args.queue), args.limit))
@@ -0,0 +1,21 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db import postgres
+from db.rabbitmq import QueueName
+from workers.base import run_worker
+from workers.webhook import WebhookWorker
+
+
+async def main() -> None:
+    postgres.engine = postgres.create_postgres_engine()
+    postgres.async_session = async_sessionmaker(bind=postgres.engine, expire_on_commit=False, class_=AsyncSession)  # type: ignore[assignment]
+    try:
+        await run_worker(WebhookWorker, QueueName.STRIPE_WEBHOOK.value)
+    finally:
+        await postgres.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
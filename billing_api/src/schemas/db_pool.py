@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class HistogramResponse(BaseModel):
+    count: int
+    sum: float
+    # накопленное количество наблюдений по верхним границам корзин
+    buckets: dict[str, int]
+
+
+class PoolStatsResponse(BaseModel):
+    pool_class: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeouts: int | None = None
+    wait_time_seconds: HistogramResponse | None = None
+    checked_out_on_checkout: HistogramResponse | None = None
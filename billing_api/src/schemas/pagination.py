@@ -0,0 +1,31 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, ConfigDict, Field
+
+ItemType = TypeVar("ItemType")
+
+
+class CursorParams(BaseModel):
+    """Параметры keyset-пагинации.
+
+    Используется при получении данных (request) в эндпойнтах.
+    """
+
+    cursor: str | None = None
+    size: int = Field(50, ge=1, le=100)
+    include_total: bool = False
+
+
+class CursorPage(BaseModel, Generic[ItemType]):
+    """Страница выдачи с непрозрачным курсором на следующую страницу.
+
+    Поле total заполняется только по явному запросу (include_total=true), так как
+    подсчёт количества строк на больших таблицах требует отдельного полного прохода.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    items: list[ItemType]
+    size: int
+    next_cursor: str | None = None
+    total: int | None = None
@@ -1,14 +1,17 @@
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
-from typing import Generic, TypeVar
+from collections.abc import Iterable, Sequence
+from typing import Any, Generic, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Select, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.models import Base
-from services.exceptions import ObjectNotFoundError
+from schemas.pagination import CursorPage, CursorParams
+from services.exceptions import BadRequestError, ObjectNotFoundError
+from services.pagination import keyset_paginate
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -50,6 +53,88 @@ class SQLAlchemyRepository(AbstractRepository, Generic[ModelType, CreateSchemaTy
         await self._session.refresh(entity)
         return entity
 
+    @staticmethod
+    def _to_rows(objs_in: Iterable[CreateSchemaType | dict[str, Any]]) -> list[dict[str, Any]]:
+        return [
+            obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_none=True, exclude_unset=True)
+            for obj_in in objs_in
+        ]
+
+    async def create_many(self, objs_in: Iterable[CreateSchemaType | dict[str, Any]]) -> list[ModelType]:
+        """Создаёт записи пачкой и фиксирует их одним коммитом.
+
+        Строки отправляются многострочными INSERT ... VALUES (...), (...) RETURNING * (insertmanyvalues),
+        то есть за несколько запросов на тысячи записей. Записи возвращаются в порядке objs_in.
+        """
+        rows = self._to_rows(objs_in)
+        if not rows:
+            return []
+        stmt = insert(self._model).returning(self._model, sort_by_parameter_order=True)
+        result = await self._session.scalars(stmt, rows)
+        entities = list(result.all())
+        await self._session.commit()
+        return entities
+
+    async def upsert_many(
+        self,
+        objs_in: Iterable[CreateSchemaType | dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Sequence[str] | None = None,
+    ) -> list[ModelType]:
+        """Создаёт или обновляет записи пачкой через INSERT ... ON CONFLICT (index_elements) DO UPDATE.
+
+        index_elements должны соответствовать уникальному индексу. При конфликте у записи обновляются только
+        переданные в ней колонки (из update_columns, если они заданы), кроме index_elements и id: колонки,
+        которых нет в строке, сохраняют текущее значение. Строки с разным набором колонок отправляются
+        отдельными запросами по группам. Записи возвращаются в порядке objs_in, всё фиксируется одним коммитом.
+
+        Raises:
+            BadRequestError: у нескольких строк совпадают значения index_elements.
+        """
+        rows = self._to_rows(objs_in)
+        if not rows:
+            return []
+
+        # одна запись не может обновиться дважды за запрос (CardinalityViolation), а между группами
+        # молча победила бы последняя строка, поэтому дубли ключа конфликта отклоняются целиком
+        keys: set[tuple[Any, ...]] = set()
+        for row in rows:
+            key = tuple(row.get(column) for column in index_elements)
+            if key in keys:
+                raise BadRequestError(
+                    f"Повторяющееся значение {', '.join(index_elements)} в пачке {self._model.__name__}: {key}"
+                )
+            keys.add(key)
+
+        groups: dict[tuple[str, ...], list[int]] = {}
+        for position, row in enumerate(rows):
+            groups.setdefault(tuple(sorted(row)), []).append(position)
+
+        entities: list[ModelType | None] = [None] * len(rows)
+        for columns, positions in groups.items():
+            set_columns = [
+                column
+                for column in (columns if update_columns is None else update_columns)
+                if column in columns and column not in {*index_elements, "id"}
+            ]
+            stmt = pg_insert(self._model)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={
+                    **{column: stmt.excluded[column] for column in set_columns},
+                    "updated_at": func.current_timestamp(),
+                },
+            )
+            stmt = stmt.returning(self._model, sort_by_parameter_order=True).execution_options(
+                populate_existing=True
+            )
+            result = await self._session.scalars(stmt, [rows[position] for position in positions])
+            for position, entity in zip(positions, result.all(), strict=True):
+                entities[position] = entity
+
+        await self._session.commit()
+        return entities  # type: ignore[return-value]
+
     async def get_one_or_none(self, entity_id: UUID) -> ModelType | None:
         stmt = select(self._model).where(self._model.id == entity_id)
         result = await self._session.execute(stmt)
@@ -61,7 +146,7 @@ class SQLAlchemyRepository(AbstractRepository, Generic[ModelType, CreateSchemaTy
             raise ObjectNotFoundError(f"Запрашиваемый объект {self._model.__name__} с id={entity_id} не найден")
         return db_obj
 
-    async def get_many(self, filters: dict | None = None) -> Sequence[ModelType]:
+    def _get_many_stmt(self, filters: dict | None = None) -> Select:
         stmt = select(self._model)
         if filters is None:
             filters = {}
@@ -70,9 +155,20 @@ class SQLAlchemyRepository(AbstractRepository, Generic[ModelType, CreateSchemaTy
             column = getattr(self._model, column_name)
             stmt = stmt.where(column == filter_value)
 
-        result = await self._session.execute(stmt)
+        return stmt
+
+    async def get_many(self, filters: dict | None = None) -> Sequence[ModelType]:
+        result = await self._session.execute(self._get_many_stmt(filters))
+        return result.scalars().all()
+
+    async def get_many_by_ids(self, entity_ids: Iterable[UUID]) -> Sequence[ModelType]:
+        result = await self._session.execute(select(self._model).where(self._model.id.in_(list(entity_ids))))
         return result.scalars().all()
 
+    async def get_page(self, params: CursorParams, filters: dict | None = None) -> CursorPage:
+        """Возвращает страницу записей с keyset-пагинацией по (created_at, id)."""
+        return await keyset_paginate(self._session, self._get_many_stmt(filters), self._model, params)
+
     async def update(self, entity_id: UUID, obj_in: UpdateSchemaType) -> ModelType:
         db_obj = await self.get(entity_id=entity_id)
         update_dict = obj_in.model_dump(exclude_none=True, exclude_unset=True)
@@ -82,6 +178,46 @@ class SQLAlchemyRepository(AbstractRepository, Generic[ModelType, CreateSchemaTy
         await self._session.commit()
         return db_obj
 
+    async def update_returning_or_none(
+        self, entity_id: UUID, obj_in: UpdateSchemaType | dict[str, Any], *where: ColumnElement[bool]
+    ) -> ModelType | None:
+        """Обновляет запись одним запросом UPDATE ... WHERE id = :id RETURNING *, без предварительного SELECT.
+
+        Дополнительные условия where позволяют совместить проверку состояния записи с её обновлением,
+        в obj_in-словаре можно передавать SQL-выражения. Если подходящей записи нет, возвращается None,
+        а транзакция остаётся открытой: фиксировать или откатывать накопленные изменения решает вызывающий код.
+        """
+        values = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_none=True, exclude_unset=True)
+        stmt = (
+            update(self._model)
+            .where(self._model.id == entity_id, *where)
+            .values(**values)
+            .returning(self._model)
+            .execution_options(populate_existing=True)
+        )
+        result = await self._session.scalars(stmt)
+        db_obj = result.one_or_none()
+        if db_obj is None:
+            return None
+        await self._session.commit()
+        return db_obj
+
+    async def update_returning(
+        self, entity_id: UUID, obj_in: UpdateSchemaType | dict[str, Any], *where: ColumnElement[bool]
+    ) -> ModelType:
+        db_obj = await self.update_returning_or_none(entity_id, obj_in, *where)
+        if db_obj is None:
+            raise ObjectNotFoundError(f"Запрашиваемый объект {self._model.__name__} с id={entity_id} не найден")
+        return db_obj
+
+    async def commit(self) -> None:
+        """Фиксирует изменения, накопленные в сессии репозитория."""
+        await self._session.commit()
+
+    async def rollback(self) -> None:
+        """Откатывает изменения, накопленные в сессии репозитория."""
+        await self._session.rollback()
+
     async def delete(self, entity_id: UUID) -> None:
         db_obj = await self.get(entity_id=entity_id)
         await self._session.delete(db_obj)
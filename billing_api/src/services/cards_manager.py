@@ -10,7 +10,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from db.postgres import get_postgres_session
 from models.enums import StatusCardsEnum
 from models.models import UserCardsStripe
+from schemas.pagination import CursorPage, CursorParams
 from services.exceptions import BadRequestError, CardNotFoundException, ObjectNotFoundError, UserNotOwnerOfCardException
+from services.pagination import keyset_paginate
 from services.payment_process import PaymentProcessorStripe
 
 logger = logging.getLogger("billing")
@@ -130,11 +132,6 @@ class CardsManager:
 
             if user_card:
                 logger.info(f"Updating payment method for customer {customer}")
-                user_card.token_card = payment_method
-                user_card.status = StatusCardsEnum.SUCCESS
-                user_card.is_default = True  # ставим новую карту по умолчанию дефолтной
-
-                session.add(user_card)
 
                 default_card = await self._get_card_user(
                     user_id=user_card.user_id,
@@ -142,11 +139,19 @@ class CardsManager:
                     is_default=True,
                 )
 
-                # если у юзера была другая активная карта, снимаем с нее флаг дефолтной
+                # если у юзера была другая активная карта, снимаем с нее флаг дефолтной.
+                # flush до проставления флага новой карте, иначе сработает уникальный индекс дефолтной карты
                 if default_card:
                     logger.info(f"Removing default status from card {default_card.last_numbers_card}")
                     default_card.is_default = False
                     session.add(default_card)
+                    await session.flush()
+
+                user_card.token_card = payment_method
+                user_card.status = StatusCardsEnum.SUCCESS
+                user_card.is_default = True  # ставим новую карту по умолчанию дефолтной
+
+                session.add(user_card)
 
                 logger.info(f"Payment method updated successfully for customer {customer}")
                 await session.commit()
@@ -187,10 +192,11 @@ class CardsManager:
             # Получаем текущую дефолтную карту, если есть
             default_card = await self._get_card_user(user_id=user_id, status=StatusCardsEnum.SUCCESS, is_default=True)
 
-            # Снимаем флаг с текущей дефолтной карты
+            # Снимаем флаг с текущей дефолтной карты, flush нужен до проставления флага новой карте
             if default_card and default_card.id != card_id:
                 default_card.is_default = False
                 session.add(default_card)
+                await session.flush()
 
             # Делаем новую карту дефолтной
             user_card.is_default = True
@@ -205,13 +211,15 @@ class CardsManager:
             raise ObjectNotFoundError("User card not found")
         return card
 
-    async def get_all_cards(self, query_params: dict[str, str]) -> list[UserCardsStripe] | None:
+    async def get_cards_page(self, query_params: dict[str, str], params: CursorParams) -> CursorPage:
+        """Возвращает страницу карт с keyset-пагинацией по (created_at, id)."""
         async with self.postgres_session() as session:
             try:
-                result = await session.scalars(select(UserCardsStripe).filter_by(**query_params))
+                return await keyset_paginate(
+                    session, select(UserCardsStripe).filter_by(**query_params), UserCardsStripe, params
+                )
             except DBAPIError as exc:
                 raise BadRequestError(f"Bad request {exc}") from None
-            return result.all()
 
     async def get_all_user_cards(self, user_id: str) -> list | None:
         """Получает все активные карты юзера."""
@@ -52,3 +52,19 @@ class AccessDeniedError(HTTPException):
 
 class SubscriptionCancelError(BadRequestError):
     pass
+
+
+class WebhookSignatureError(BadRequestError):
+    pass
+
+
+class InvalidWebhookPayloadError(BadRequestError):
+    pass
+
+
+class TokenExpiredError(Exception):
+    pass
+
+
+class InvalidTokenError(Exception):
+    pass
@@ -1,7 +1,9 @@
 import enum
+from collections.abc import Iterable
 from uuid import UUID
 
 from aio_pika.abc import AbstractExchange
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from services.external.base import BaseQueueService
 
@@ -14,18 +16,26 @@ class UserRole(str, enum.Enum):
 class AuthService(BaseQueueService):
     """Сервис для управления ролями пользователей через очередь сообщений."""
 
-    def __init__(self, queue_name: str, exchange: AbstractExchange) -> None:
-        super().__init__(queue_name, exchange)
+    def __init__(self, queue_name: str, exchange: AbstractExchange, outbox_session: AsyncSession | None = None) -> None:
+        super().__init__(queue_name, exchange, outbox_session)
 
     async def change_user_role(self, user_id: UUID, role: UserRole) -> bool:
         """Изменяет роль пользователя."""
         payload = {"user_id": str(user_id), "role": role.value}
         return await self.send_message_to_queue(payload)
 
+    async def change_users_role(self, user_ids: Iterable[UUID], role: UserRole) -> list[bool]:
+        """Изменяет роль пачке пользователей."""
+        return await self.publish_many({"user_id": str(user_id), "role": role.value} for user_id in user_ids)
+
     async def downgrade_user_to_basic(self, user_id: UUID) -> bool:
         """Понижает роль пользователя до базового уровня."""
         return await self.change_user_role(user_id, UserRole.BASIC_USER)
 
+    async def downgrade_users_to_basic(self, user_ids: Iterable[UUID]) -> list[bool]:
+        """Понижает роль пачки пользователей до базового уровня."""
+        return await self.change_users_role(user_ids, UserRole.BASIC_USER)
+
     async def upgrade_user_to_subscriber(self, user_id: UUID) -> bool:
         """Повышает роль пользователя до уровня 'подписчик.'"""
         return await self.change_user_role(user_id, UserRole.SUBSCRIBER)
@@ -1,31 +1,91 @@
+import asyncio
 import json
 import logging
+from collections.abc import Iterable
+from typing import Self
 
 from aio_pika import DeliveryMode, Message
 from aio_pika.abc import AbstractExchange
-from aio_pika.exceptions import AMQPError
+from aio_pika.exceptions import AMQPError, ChannelInvalidStateError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.metrics import rabbitmq_publish_duration
+from models.models import OutboxEvent
 
 logger = logging.getLogger(__name__)
 
 
 class BaseQueueService:
-    """Базовый класс для сервисов, работающих с очередью RabbitMQ."""
+    """Базовый класс для сервисов, работающих с очередью RabbitMQ.
+
+    Канал обменника открыт в режиме publisher confirms, поэтому публикация считается
+    успешной только после подтверждения от брокера.
+
+    Если передана outbox_session, сообщения не публикуются сразу, а записываются в таблицу outbox
+    в транзакции этой сессии и попадают в очередь через OutboxRelay после её коммита.
+    """
 
-    def __init__(self, queue_name: str, exchange: AbstractExchange) -> None:
+    def __init__(self, queue_name: str, exchange: AbstractExchange, outbox_session: AsyncSession | None = None) -> None:
         self._queue_name = queue_name
         self._exchange = exchange
+        self._outbox_session = outbox_session
+
+    def with_outbox(self, session: AsyncSession) -> Self:
+        """Возвращает копию сервиса, записывающую сообщения в outbox в транзакции session."""
+        return type(self)(self._queue_name, self._exchange, outbox_session=session)
 
     async def send_message_to_queue(self, payload: dict) -> bool:
         """Публикует сообщение в очередь RabbitMQ."""
-        try:
-            message = Message(body=json.dumps(payload).encode(), delivery_mode=DeliveryMode.PERSISTENT)
-            await self._exchange.publish(message=message, routing_key=self._queue_name)  # type: ignore[union-attr]
-        except (json.JSONDecodeError, TypeError):
-            logger.exception(f"Ошибка сериализации данных в JSON при публикации в очередь {self._queue_name}")
-            return False
-        except AMQPError:
-            logger.exception(f"Ошибка RabbitMQ при публикации сообщения в очередь {self._queue_name}")
-            return False
-        else:
-            logger.info(f"Сообщение {payload} успешно опубликовано в очередь {self._queue_name}")
-            return True
+        result = await self.publish_many([payload])
+        return result[0]
+
+    async def publish_many(self, payloads: Iterable[dict]) -> list[bool]:
+        """Публикует пачку сообщений в очередь RabbitMQ.
+
+        Все сообщения отправляются в канал сразу, а подтверждения брокера ожидаются одновременно.
+        Возвращает результат публикации для каждого сообщения в порядке payloads.
+        При записи в outbox сообщения считаются отправленными, сохранятся они вместе с коммитом сессии.
+        """
+        payloads = list(payloads)
+        if self._outbox_session is not None:
+            self._outbox_session.add_all(
+                OutboxEvent(queue_name=self._queue_name, payload=payload) for payload in payloads
+            )
+            return [True] * len(payloads)
+
+        results = [False] * len(payloads)
+
+        publishing: dict[int, asyncio.Future] = {}
+        with rabbitmq_publish_duration.time(self._queue_name):
+            for index, payload in enumerate(payloads):
+                try:
+                    message = Message(body=json.dumps(payload).encode(), delivery_mode=DeliveryMode.PERSISTENT)
+                except (TypeError, ValueError):
+                    logger.exception(f"Ошибка сериализации данных в JSON при публикации в очередь {self._queue_name}")
+                    continue
+                publishing[index] = asyncio.ensure_future(
+                    self._exchange.publish(
+                        message=message,
+                        routing_key=self._queue_name,
+                        timeout=settings.rabbitmq.publish_timeout,
+                    )
+                )
+
+            confirmations = await asyncio.gather(*publishing.values(), return_exceptions=True)
+        for index, confirmation in zip(publishing, confirmations, strict=True):
+            # ChannelInvalidStateError (закрытый канал) - RuntimeError, а не AMQPError
+            if isinstance(confirmation, AMQPError | ChannelInvalidStateError | asyncio.TimeoutError):
+                logger.error(
+                    f"Ошибка RabbitMQ при публикации сообщения {payloads[index]} в очередь {self._queue_name}: "
+                    f"{confirmation!r}"
+                )
+            elif isinstance(confirmation, BaseException):
+                raise confirmation
+            else:
+                results[index] = True
+                logger.debug(f"Сообщение {payloads[index]} успешно опубликовано в очередь {self._queue_name}")
+
+        published = sum(results)
+        logger.info(f"Опубликовано {published} из {len(payloads)} сообщений в очередь {self._queue_name}")
+        return results
@@ -1,7 +1,9 @@
 import enum
+from collections.abc import Iterable
 from uuid import UUID
 
 from aio_pika.abc import AbstractExchange
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.enums import StatusCardsEnum, SubscriptionStatus, TransactionStatus
 from services.external.base import BaseQueueService
@@ -18,8 +20,8 @@ class NotificationTopic(str, enum.Enum):
 class NotificationService(BaseQueueService):
     """Сервис для отправки уведомлений пользователям через очередь сообщений."""
 
-    def __init__(self, queue_name: str, exchange: AbstractExchange) -> None:
-        super().__init__(queue_name, exchange)
+    def __init__(self, queue_name: str, exchange: AbstractExchange, outbox_session: AsyncSession | None = None) -> None:
+        super().__init__(queue_name, exchange, outbox_session)
 
     async def notify_user(self, user_id: UUID, notification_data: dict) -> bool:
         """Отправляет нотификацию пользователю."""
@@ -31,6 +33,13 @@ class NotificationService(BaseQueueService):
         data = {"topic": NotificationTopic.SUBSCRIPTION.value, "status": status.value}
         return await self.notify_user(user_id, data)
 
+    async def notify_users_subscription_status(
+        self, user_ids: Iterable[UUID], status: SubscriptionStatus
+    ) -> list[bool]:
+        """Оповещает пачку пользователей об изменении статуса подписки."""
+        data = {"topic": NotificationTopic.SUBSCRIPTION.value, "status": status.value}
+        return await self.publish_many({"user_id": str(user_id), "notification_data": data} for user_id in user_ids)
+
     async def notify_user_card_status(self, user_id: UUID, status: StatusCardsEnum) -> bool:
         """Оповещает пользователя об изменении статуса платежной карты."""
         data = {"topic": NotificationTopic.CARD.value, "status": status.value}
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from collections import defaultdict
+
+from aio_pika.abc import AbstractExchange
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models.models import OutboxEvent
+from services.external.base import BaseQueueService
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """Переносит сообщения из таблицы outbox в RabbitMQ.
+
+    Пачка событий блокируется через FOR UPDATE SKIP LOCKED, поэтому несколько экземпляров
+    relay (например, в разных процессах API) не публикуют одно событие дважды. Опубликованные
+    события удаляются, неопубликованные остаются в таблице до следующей попытки.
+    Доставка at-least-once: при падении между публикацией и коммитом событие будет отправлено повторно.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        exchange: AbstractExchange,
+        batch_size: int,
+        poll_interval: float,
+    ):
+        self._session_maker = session_maker
+        self._exchange = exchange
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+
+    async def relay_batch(self) -> int:
+        """Публикует одну пачку событий и возвращает количество опубликованных."""
+        async with self._session_maker() as session:
+            result = await session.scalars(
+                select(OutboxEvent)
+                .order_by(OutboxEvent.created_at)
+                .limit(self._batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            events = result.all()
+            if not events:
+                return 0
+
+            events_by_queue: dict[str, list[OutboxEvent]] = defaultdict(list)
+            for event in events:
+                events_by_queue[event.queue_name].append(event)
+
+            published_ids = []
+            for queue_name, queue_events in events_by_queue.items():
+                queue_service = BaseQueueService(queue_name, self._exchange)
+                results = await queue_service.publish_many(event.payload for event in queue_events)
+                published_ids.extend(
+                    event.id for event, published in zip(queue_events, results, strict=True) if published
+                )
+
+            await session.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(published_ids)))
+            await session.commit()
+            return len(published_ids)
+
+    async def run(self) -> None:
+        """Публикует события, пока задача не будет отменена."""
+        logger.info("Запущен relay outbox")
+        while True:
+            try:
+                published = await self.relay_batch()
+            except Exception:
+                logger.exception("Ошибка при публикации событий из outbox")
+                published = 0
+
+            # полная пачка означает, что в outbox могут оставаться события, забираем их без паузы
+            if published < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
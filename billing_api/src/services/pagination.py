@@ -0,0 +1,53 @@
+import base64
+from datetime import datetime
+from uuid import UUID
+
+import orjson
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Base
+from schemas.pagination import CursorPage, CursorParams
+from services.exceptions import BadRequestError
+
+
+def encode_cursor(entity: Base) -> str:
+    """Кодирует позицию записи (created_at, id) в непрозрачный токен."""
+    raw_cursor = orjson.dumps([entity.created_at.isoformat(), str(entity.id)])
+    return base64.urlsafe_b64encode(raw_cursor).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Восстанавливает позицию записи (created_at, id) из токена."""
+    try:
+        created_at, entity_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), UUID(entity_id)
+    except (ValueError, TypeError):
+        raise BadRequestError("Некорректный курсор пагинации") from None
+
+
+async def keyset_paginate(session: AsyncSession, stmt: Select, model: type[Base], params: CursorParams) -> CursorPage:
+    """Выполняет keyset-пагинацию запроса stmt по (created_at, id) на стороне БД.
+
+    Вместо OFFSET используется условие "строго после последней записи предыдущей страницы",
+    поэтому стоимость запроса не зависит от глубины пролистывания. Выбирается size + 1 строка,
+    чтобы без отдельного запроса понять, есть ли следующая страница.
+    """
+    total = None
+    if params.include_total:
+        total = await session.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+    page_stmt = stmt.order_by(model.created_at.desc(), model.id.desc()).limit(params.size + 1)
+    if params.cursor:
+        created_at, entity_id = decode_cursor(params.cursor)
+        page_stmt = page_stmt.where(tuple_(model.created_at, model.id) < (created_at, entity_id))
+
+    result = await session.scalars(page_stmt)
+    items = list(result.all())
+
+    next_cursor = None
+    if len(items) > params.size:
+        items = items[: params.size]
+        next_cursor = encode_cursor(items[-1])
+
+    return CursorPage(items=items, size=params.size, next_cursor=next_cursor, total=total)
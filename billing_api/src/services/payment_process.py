@@ -13,13 +13,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from stripe.api_resources.payment_intent import PaymentIntent
 
 from core.config import settings
+from core.metrics import stripe_request_duration
 from db.postgres import get_postgres_session
 from db.rabbitmq import QueueName, get_rabbitmq_exchange
 from models.enums import PaymentType, TransactionStatus
 from models.models import Transaction, UserCardsStripe
-from services.exceptions import CardNotFoundException, CreatePaymentIntentException
+from services.exceptions import CardNotFoundException, CreatePaymentIntentException, TransactionNotFoundError
 from services.external import NotificationService
 from services.transaction import TransactionService, get_admin_transaction_service
+from services.unit_of_work import UnitOfWork
 
 logger = logging.getLogger("billing")
 
@@ -57,6 +59,7 @@ class BasePaymentProcessor(ABC):
         payment_method: str | None = None,
         description: str | None = None,
         metadata: dict | None = None,
+        idempotency_key: str | None = None,
     ) -> Any:
         """Инициализирует оплату"""
         pass
@@ -68,24 +71,27 @@ class PaymentProcessorStripe(BasePaymentProcessor):
 
     async def create_card(self, customer_id: str, card_id: UUID) -> str:
         """Создание запроса на привязку карты."""
-        session = await stripe.checkout.Session.create_async(  # type: ignore[attr-defined]
-            mode="setup",
-            payment_method_types=["card"],
-            success_url="http://localhost:80/api/v1/billing/success-card/",  # TODO
-            cancel_url="http://localhost:80/api/v1/billing/get-card-form/",  # TODO
-            customer=customer_id,
-        )
+        with stripe_request_duration.time("checkout.Session.create"):
+            session = await stripe.checkout.Session.create_async(  # type: ignore[attr-defined]
+                mode="setup",
+                payment_method_types=["card"],
+                success_url="http://localhost:80/api/v1/billing/success-card/",  # TODO
+                cancel_url="http://localhost:80/api/v1/billing/get-card-form/",  # TODO
+                customer=customer_id,
+            )
         return session.url
 
     async def create_customer(self) -> dict:
         """Создание клиента на стороне Stripe."""
-        customer = await stripe.Customer.create_async()  # type: ignore[attr-defined]
+        with stripe_request_duration.time("Customer.create"):
+            customer = await stripe.Customer.create_async()  # type: ignore[attr-defined]
         return customer
 
     async def remove_card(self, token_card: str) -> bool:
         """Запрос на удаление карты у юзера."""
         try:
-            response = await stripe.PaymentMethod.detach_async(payment_method=token_card)  # type: ignore[attr-defined]
+            with stripe_request_duration.time("PaymentMethod.detach"):
+                response = await stripe.PaymentMethod.detach_async(payment_method=token_card)  # type: ignore[attr-defined]
             # если у response есть id карты, считаем, что запрос прошел успешно
             return bool(hasattr(response, "id"))
         except stripe.error.APIError as e:
@@ -103,6 +109,7 @@ class PaymentProcessorStripe(BasePaymentProcessor):
         payment_method: str | None = None,
         description: str | None = None,
         metadata: dict | None = None,
+        idempotency_key: str | None = None,
     ) -> PaymentIntent | None:
         """
         Создание платежа.
@@ -113,6 +120,7 @@ class PaymentProcessorStripe(BasePaymentProcessor):
         :param payment_method: ID метода оплаты Stripe.
         :param description: Описание платежа.
         :param metadata: Метаданные, содержащие детали платежа.
+        :param idempotency_key: Ключ идемпотентности: повторный запрос с тем же ключом не создаёт новый платёж.
         """
         try:
             stripe_args = PaymentIntentParams(
@@ -128,7 +136,10 @@ class PaymentProcessorStripe(BasePaymentProcessor):
                 stripe_args.off_session = True
                 stripe_args.confirm = True
 
-            return await stripe.PaymentIntent.create_async(**stripe_args.model_dump())  # type: ignore[attr-defined]
+            with stripe_request_duration.time("PaymentIntent.create"):
+                return await stripe.PaymentIntent.create_async(  # type: ignore[attr-defined]
+                    **stripe_args.model_dump(), idempotency_key=idempotency_key
+                )
 
         except ValueError as e:
             logger.warning(f"Value error: {e}\nCustomer_id: {e}\nPayment_method: {e}")
@@ -143,8 +154,10 @@ class PaymentProcessorStripe(BasePaymentProcessor):
         Реализация отмены PaymentIntent.
         """
         try:
-            payment_intent = await stripe.PaymentIntent.retrieve_async(payment_intent_id)  # type: ignore[attr-defined]
-            response = await stripe.PaymentIntent.cancel_async(payment_intent)  # type: ignore[attr-defined]
+            with stripe_request_duration.time("PaymentIntent.retrieve"):
+                payment_intent = await stripe.PaymentIntent.retrieve_async(payment_intent_id)  # type: ignore[attr-defined]
+            with stripe_request_duration.time("PaymentIntent.cancel"):
+                response = await stripe.PaymentIntent.cancel_async(payment_intent)  # type: ignore[attr-defined]
             return bool(hasattr(response, "id"))
         except stripe.error.StripeError as e:
             logger.warning(f"Stripe error: {e}")
@@ -164,15 +177,15 @@ class PaymentManager:
         self.transaction_service = transaction_service
         self.notification_service = notification_service
 
-    async def _get_stripe_card_data(self, card_id, user_id):
-        async with self.postgres_session() as session:
-            cards_data = await session.scalars(select(UserCardsStripe).filter_by(id=str(card_id), user_id=str(user_id)))
-            stripe_card = cards_data.first()
+    @staticmethod
+    async def _get_stripe_card_data(session: AsyncSession, card_id: UUID, user_id: UUID) -> UserCardsStripe:
+        cards_data = await session.scalars(select(UserCardsStripe).filter_by(id=str(card_id), user_id=str(user_id)))
+        stripe_card = cards_data.first()
 
-            if stripe_card is None:
-                raise CardNotFoundException("Cards not found")
+        if stripe_card is None:
+            raise CardNotFoundException("Cards not found")
 
-            return stripe_card
+        return stripe_card
 
     async def process_payment_with_card(
         self,
@@ -183,21 +196,39 @@ class PaymentManager:
         currency: str = "RUB",
         description: str | None = None,
     ) -> Transaction:
+        """Инициирует оплату картой пользователя.
+
+        Операция разбита на две короткие транзакции, запрос в Stripe выполняется между ними
+        и не держит соединение с БД открытым:
+
+        1. транзакция в статусе PENDING фиксируется до обращения к Stripe, поэтому у любого
+           списания есть запись в БД, а ошибки ограничений проявляются до списания;
+        2. после создания платежа к транзакции привязывается id PaymentIntent.
+
+        Платёж создаётся с ключом идемпотентности по id транзакции, а id транзакции передаётся
+        в метаданных платежа. Если платёж создать не удалось, транзакция остаётся в статусе PENDING.
+        Если не удалось зафиксировать вторую транзакцию, списание уже произошло, но запись остаётся
+        без id PaymentIntent: её можно сопоставить с платежом по transaction_id из метаданных.
+        Повторный запрос в Stripe с тем же ключом вернёт уже созданный платёж, а не спишет деньги повторно.
+        """
+        async with UnitOfWork(self.postgres_session) as uow:  # type: ignore[arg-type]
+            stripe_card = await self._get_stripe_card_data(uow.session, card_id, user_id)
+
+            transaction = self.transaction_service.add_transaction(
+                uow.session,
+                subscription_id=subscription_id,
+                user_id=user_id,
+                amount=amount,
+                payment_type=PaymentType.STRIPE,
+                user_card_id=card_id,
+            )
+            await uow.commit()
+
         payment_meta = {
             "subscription_id": subscription_id,
             "user_id": user_id,
+            "transaction_id": transaction.id,
         }
-
-        stripe_card = await self._get_stripe_card_data(card_id, user_id)
-
-        transaction = await self.transaction_service.create_transaction(
-            subscription_id=subscription_id,
-            user_id=user_id,
-            amount=amount,
-            payment_type=PaymentType.STRIPE,
-            user_card_id=card_id,
-        )
-
         payment_intent = await self.payment_processor.process_payment(
             amount=amount,
             currency=currency,
@@ -205,16 +236,16 @@ class PaymentManager:
             payment_method=stripe_card.token_card,
             description=description,
             metadata=payment_meta,
+            idempotency_key=f"transaction-{transaction.id}",
         )
 
         if not payment_intent:
             raise CreatePaymentIntentException("Failure to create a payment intent")
 
-        transaction_updated_data = {"stripe_payment_intent_id": payment_intent["id"]}
-
-        transaction = await self.transaction_service.update_transaction(
-            transaction_id=transaction.id, updated_data=transaction_updated_data
-        )
+        async with UnitOfWork(self.postgres_session) as uow:  # type: ignore[arg-type]
+            uow.session.add(transaction)
+            transaction.stripe_payment_intent_id = payment_intent["id"]
+            await uow.commit()
 
         return transaction
 
@@ -223,12 +254,20 @@ class PaymentManager:
     ) -> Transaction:
         logger.info(f"Payment event: {data}")
 
-        filter_data = {"stripe_payment_intent_id": stripe_payment_intent_id}
-        transaction_data = await self.transaction_service.get_transactions(filter_data)
-        transaction = transaction_data[0]  # TODO
-        result = await self.transaction_service.update_transaction(transaction.id, {"status": status})
-        await self.notification_service.notify_user_transaction_status(transaction.user_id, status)
-        return result
+        async with self.postgres_session() as session:
+            transaction = await session.scalar(
+                select(Transaction).filter_by(stripe_payment_intent_id=stripe_payment_intent_id)
+            )
+            if transaction is None:
+                raise TransactionNotFoundError("Transaction not found")
+
+            # уведомление пишется в outbox и фиксируется одним коммитом с новым статусом транзакции
+            transaction.status = status
+            await self.notification_service.with_outbox(session).notify_user_transaction_status(
+                transaction.user_id, status
+            )
+            await session.commit()
+            return transaction
 
     async def handle_payment_succeeded(self, data) -> Transaction:
         stripe_payment_intent_id = data["object"]["id"]
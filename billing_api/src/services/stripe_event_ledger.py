@@ -0,0 +1,62 @@
+from functools import lru_cache
+
+from aio_pika.abc import AbstractExchange
+from fastapi import Depends
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db.postgres import get_postgres_session
+from db.rabbitmq import QueueName, get_rabbitmq_exchange
+from models.models import StripeEvent
+from services.external.base import BaseQueueService
+
+
+class StripeEventLedger:
+    """Журнал событий Stripe, принятых в обработку.
+
+    Stripe доставляет вебхуки как минимум один раз и повторяет доставку при ошибках и таймаутах,
+    поэтому перед обработкой событие регистрируется в журнале по его id. Повторная доставка
+    упирается в уникальный индекс и отсекается одним INSERT ... ON CONFLICT DO NOTHING.
+
+    Новое событие в той же транзакции записывается в outbox очереди вебхуков и обрабатывается
+    WebhookWorker, поэтому эндпоинт вебхука отвечает Stripe, не дожидаясь обработки.
+
+    Журнал фиксирует приём события, а не результат его обработки: после ответа 200 Stripe доставку
+    не повторяет, а повторная доставка того же события отсекается журналом. Событие, которое WebhookWorker
+    не смог обработать, попадает в DLQ очереди вебхуков и возвращается в обработку скриптом
+    redrive_dead_letters.py. Возвращённые события идут в очередь напрямую, минуя журнал.
+    """
+
+    def __init__(self, postgres_session: async_sessionmaker[AsyncSession], exchange: AbstractExchange):
+        self.postgres_session = postgres_session
+        self._exchange = exchange
+
+    async def accept(self, event_id: str | None, event_type: str, event: dict) -> bool:
+        """Регистрирует событие и ставит его в очередь на обработку.
+
+        Возвращает False, если событие уже было принято. События без id не регистрируются в журнале
+        и ставятся в очередь всегда.
+        """
+        async with self.postgres_session() as session:
+            if event_id is not None:
+                stmt = (
+                    insert(StripeEvent)
+                    .values(event_id=event_id, event_type=event_type)
+                    .on_conflict_do_nothing(index_elements=["event_id"])
+                    .returning(StripeEvent.id)
+                )
+                if await session.scalar(stmt) is None:
+                    return False
+
+            webhook_queue = BaseQueueService(QueueName.STRIPE_WEBHOOK, self._exchange, outbox_session=session)
+            await webhook_queue.send_message_to_queue(event)
+            await session.commit()
+        return True
+
+
+@lru_cache
+def get_stripe_event_ledger(
+    postgres_session: async_sessionmaker[AsyncSession] = Depends(get_postgres_session),
+    exchange: AbstractExchange = Depends(get_rabbitmq_exchange),
+) -> StripeEventLedger:
+    return StripeEventLedger(postgres_session, exchange)
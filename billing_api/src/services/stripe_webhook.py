@@ -0,0 +1,123 @@
+import hashlib
+import hmac
+import logging
+import time
+from dataclasses import dataclass
+
+import orjson
+
+from core.config import settings
+from services.cards_manager import CardsManager
+from services.exceptions import InvalidWebhookPayloadError, WebhookSignatureError
+from services.subscription_manager import SubscriptionManager
+
+logger = logging.getLogger(__name__)
+
+# события привязки карты, обрабатываются в CardsManager
+CARD_EVENT_TYPES = frozenset({"payment_method.attached", "setup_intent.succeeded", "setup_intent.setup_failed"})
+# события оплаты подписки, обрабатываются в SubscriptionManager
+PAYMENT_EVENT_TYPES = frozenset({"payment_intent.succeeded", "payment_intent.payment_failed", "charge.refunded"})
+
+SUPPORTED_EVENT_TYPES = CARD_EVENT_TYPES | PAYMENT_EVENT_TYPES
+
+
+@dataclass(frozen=True, slots=True)
+class StripeWebhookEvent:
+    """Поля события Stripe, нужные для его маршрутизации и обработки."""
+
+    id: str | None
+    type: str | None
+    data_object: dict
+
+    def to_message(self) -> dict:
+        """Сообщение для очереди вебхуков в формате события Stripe, только с используемыми полями."""
+        return {"id": self.id, "type": self.type, "data": {"object": self.data_object}}
+
+
+def verify_stripe_signature(
+    raw_body: bytes,
+    signature_header: str | None,
+    secret: str,
+    tolerance: int,
+    now: float | None = None,
+) -> None:
+    """Проверяет заголовок Stripe-Signature вида t=<timestamp>,v1=<signature>[,v1=...].
+
+    Подпись - HMAC-SHA256 от "<timestamp>.<тело запроса>", считается по исходным байтам тела
+    без декодирования. Подписи старше tolerance секунд отклоняются для защиты от повторной отправки.
+    """
+    if not signature_header:
+        raise WebhookSignatureError("Отсутствует заголовок Stripe-Signature")
+
+    timestamp = None
+    signatures = []
+    for item in signature_header.split(","):
+        name, _, value = item.strip().partition("=")
+        if name == "t":
+            timestamp = value
+        elif name == "v1":
+            signatures.append(value)
+
+    if not timestamp or not (timestamp.isascii() and timestamp.isdigit()) or not signatures:
+        raise WebhookSignatureError("Неверный формат заголовка Stripe-Signature")
+    if abs((now or time.time()) - int(timestamp)) > tolerance:
+        raise WebhookSignatureError("Подпись вебхука Stripe устарела")
+
+    # сравниваются байты: compare_digest не принимает str с не-ASCII символами, а заголовок может их содержать
+    expected = hmac.new(secret.encode(), timestamp.encode() + b"." + raw_body, hashlib.sha256).hexdigest().encode()
+    if not any(hmac.compare_digest(expected, signature.encode()) for signature in signatures):
+        raise WebhookSignatureError("Неверная подпись вебхука Stripe")
+
+
+def parse_stripe_event(raw_body: bytes) -> StripeWebhookEvent:
+    """Разбирает тело вебхука через orjson и извлекает из него id, type и data.object."""
+    try:
+        event = orjson.loads(raw_body)
+    except orjson.JSONDecodeError:
+        raise InvalidWebhookPayloadError("Тело вебхука Stripe не является JSON") from None
+
+    data = event.get("data") if isinstance(event, dict) else None
+    data_object = data.get("object") if isinstance(data, dict) else None
+    if not isinstance(data_object, dict):
+        raise InvalidWebhookPayloadError("В событии Stripe отсутствует data.object")
+    return StripeWebhookEvent(id=event.get("id"), type=event.get("type"), data_object=data_object)
+
+
+def read_stripe_event(raw_body: bytes, signature_header: str | None) -> StripeWebhookEvent:
+    """Проверяет подпись вебхука и разбирает событие.
+
+    Без STRIPE_WEBHOOK_SECRET вебхуки отклоняются, если проверка подписи не отключена явно
+    через STRIPE_WEBHOOK_VERIFICATION_DISABLED (только для локальной разработки).
+    """
+    if settings.stripe_webhook_secret:
+        verify_stripe_signature(
+            raw_body, signature_header, settings.stripe_webhook_secret, settings.stripe_webhook_tolerance_sec
+        )
+    elif not settings.stripe_webhook_verification_disabled:
+        raise WebhookSignatureError("Проверка подписи вебхуков Stripe не настроена")
+    return parse_stripe_event(raw_body)
+
+
+def check_stripe_webhook_settings() -> None:
+    """Проверяет при запуске приложения, что подпись вебхуков Stripe проверяется."""
+    if settings.stripe_webhook_secret:
+        return
+    if not settings.stripe_webhook_verification_disabled:
+        logger.error("Не задан STRIPE_WEBHOOK_SECRET, вебхуки Stripe не могут быть проверены")
+        raise RuntimeError("STRIPE_WEBHOOK_SECRET is not set")
+    logger.warning("Проверка подписи вебхуков Stripe отключена, используйте это только для локальной разработки")
+
+
+async def dispatch_stripe_event(
+    event_type: str,
+    data: dict,
+    cards_manager: CardsManager,
+    subscription_manager: SubscriptionManager,
+) -> None:
+    """Передаёт событие Stripe менеджеру, отвечающему за его тип."""
+    if event_type in CARD_EVENT_TYPES:
+        await cards_manager.handle_webhook(event_type, data)
+    elif event_type in PAYMENT_EVENT_TYPES:
+        await subscription_manager.handle_payment_webhook(event_type, data)
+    else:
+        logger.warning(f"Не найден обработчик для вебхуа типа {event_type}")
@@ -1,9 +1,10 @@
+from collections.abc import Sequence
 from datetime import datetime, timedelta
 from functools import lru_cache
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.postgres import get_session
@@ -29,7 +30,7 @@ class SubscriptionService(SQLAlchemyRepository[Subscription, SubscriptionCreateF
         if await self._user_has_active_subscription(user_id):
             raise ActiveSubscriptionExsistsError(f"Пользователь с id={user_id} уже имеет подписку.")
 
-        subscription_plan = await self._subscription_plan_service.get(subscription_data.plan_id)
+        subscription_plan = await self._subscription_plan_service.get_cached(subscription_data.plan_id)
 
         start_date = datetime.now()
         end_date = start_date + timedelta(days=subscription_plan.duration_days)
@@ -45,27 +46,39 @@ class SubscriptionService(SQLAlchemyRepository[Subscription, SubscriptionCreateF
         return await self.create(full_subscription_data)
 
     async def cancel_subscription(self, user_id: UUID, subscription_id: UUID) -> Subscription:
-        """Отменяет подписку пользователя."""
-        subscription = await self._validate_subscription_access(user_id, subscription_id)
-
-        if subscription.status not in [SubscriptionStatus.ACTIVE, SubscriptionStatus.PENDING]:
-            raise SubscriptionCancelError("Ошибка при попытке отмены подписки. Проверьте статус подписки.")
+        """Отменяет подписку пользователя.
 
+        Проверка владельца и статуса подписки выполняется условиями самого UPDATE,
+        причина отказа выясняется отдельным запросом только если подписка не обновилась.
+        В этом случае транзакция сессии откатывается.
+        """
         update_data = SubscriptionUpdate(
             status=SubscriptionStatus.CANCELLED, auto_renewal=False, end_date=datetime.now()
         )
-        result = await self.update(subscription_id, update_data)
-        return result
+        subscription = await self.update_returning_or_none(
+            subscription_id,
+            update_data,
+            self._model.user_id == user_id,
+            self._model.status.in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.PENDING]),
+        )
+        if subscription is None:
+            # отмена не состоялась: отбрасываем события outbox, записанные вызывающим кодом под эту отмену
+            await self.rollback()
+            await self._validate_subscription_access(user_id, subscription_id)
+            raise SubscriptionCancelError("Ошибка при попытке отмены подписки. Проверьте статус подписки.")
+        return subscription
 
     async def toggle_auto_renewal(self, user_id: UUID, subscription_id: UUID) -> Subscription:
         """Переключает режим автоматического продления подписки.
 
         Если автоматическое продление включено - отключает его и наоборот.
         """
-        subscription = await self._validate_subscription_access(user_id, subscription_id)
-        new_auto_renewal = not subscription.auto_renewal
-        update_data = SubscriptionUpdate(auto_renewal=new_auto_renewal)
-        return await self.update(subscription.id, update_data)
+        subscription = await self.update_returning_or_none(
+            subscription_id, {"auto_renewal": ~self._model.auto_renewal}, self._model.user_id == user_id
+        )
+        if subscription is None:
+            return await self._validate_subscription_access(user_id, subscription_id)
+        return subscription
 
     async def renew_subscription(
         self, user_id: UUID, subscription_id: UUID, renew_data: SubscriptionRenew
@@ -75,7 +88,7 @@ class SubscriptionService(SQLAlchemyRepository[Subscription, SubscriptionCreateF
         Под продлением понимается создание новой подписки.
         """
         current_subscription = await self._validate_subscription_access(user_id, subscription_id)
-        subscription_plan = await self._subscription_plan_service.get(renew_data.plan_id)
+        subscription_plan = await self._subscription_plan_service.get_cached(renew_data.plan_id)
 
         renewed_start_date = current_subscription.end_date
         renewed_end_date = renewed_start_date + timedelta(days=subscription_plan.duration_days)
@@ -90,11 +103,77 @@ class SubscriptionService(SQLAlchemyRepository[Subscription, SubscriptionCreateF
         )
         return await self.create(renewed_subscription_data)
 
+    async def renew_expired_subscriptions(self, subscriptions: Sequence[Subscription]) -> list[Subscription]:
+        """Продляет пачку истекших подписок с автопродлением.
+
+        Истекшие подписки помечаются expired одним UPDATE ... RETURNING, а продлевающие подписки
+        создаются одним INSERT, всё фиксируется одним коммитом. Подписки, которые уже обработаны
+        параллельным прогоном, пропускаются. Возвращает новые подписки в статусе pending.
+        """
+        subscriptions_by_id = {subscription.id: subscription for subscription in subscriptions}
+        if not subscriptions_by_id:
+            return []
+
+        stmt = (
+            update(self._model)
+            .where(
+                self._model.id.in_(list(subscriptions_by_id)),
+                self._model.status == SubscriptionStatus.ACTIVE.value,
+            )
+            .values(status=SubscriptionStatus.EXPIRED)
+            .returning(self._model.id)
+            .execution_options(synchronize_session=False)
+        )
+        expired_ids = (await self._session.scalars(stmt)).all()
+
+        expired_subscriptions = [subscriptions_by_id[subscription_id] for subscription_id in expired_ids]
+        plans = await self._subscription_plan_service.get_many_by_ids(
+            {subscription.plan_id for subscription in expired_subscriptions}
+        )
+        duration_by_plan_id = {plan.id: plan.duration_days for plan in plans}
+
+        return await self.create_many(
+            SubscriptionCreateFull(
+                user_id=subscription.user_id,
+                plan_id=subscription.plan_id,
+                start_date=subscription.end_date,
+                end_date=subscription.end_date + timedelta(days=duration_by_plan_id[subscription.plan_id]),
+                status=SubscriptionStatus.PENDING,
+                auto_renewal=subscription.auto_renewal,
+            )
+            for subscription in expired_subscriptions
+        )
+
     async def change_status(self, subscription_id: UUID, new_status: SubscriptionStatus) -> Subscription:
         """Обновляет статус подписки."""
-        subscription = await self.get(subscription_id)
-        update_data = SubscriptionUpdate(status=new_status)
-        return await self.update(subscription.id, update_data)
+        return await self.update_returning(subscription_id, SubscriptionUpdate(status=new_status))
+
+    async def expire_due_subscriptions(self, batch_size: int) -> Sequence[UUID]:
+        """Одним запросом переводит в статус expired пачку истекших подписок без автопродления.
+
+        Возвращает id пользователей, чьи подписки были помечены истекшими. Строки, заблокированные
+        параллельной транзакцией, пропускаются и будут обработаны следующим прогоном.
+        Изменения не фиксируются, чтобы вызывающий код мог записать события в той же транзакции.
+        """
+        due_subscriptions = (
+            select(self._model.id)
+            .where(
+                self._model.status == SubscriptionStatus.ACTIVE.value,
+                self._model.end_date <= datetime.now(),
+                self._model.auto_renewal.is_(False),
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self._model)
+            .where(self._model.id.in_(due_subscriptions.scalar_subquery()))
+            .values(status=SubscriptionStatus.EXPIRED)
+            .returning(self._model.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(stmt)
+        return result.scalars().all()
 
     async def get_user_subscription(self, user_id: UUID, subscription_id: UUID) -> Subscription:
         return await self._validate_subscription_access(user_id, subscription_id)
@@ -102,7 +181,7 @@ class SubscriptionService(SQLAlchemyRepository[Subscription, SubscriptionCreateF
     async def get_payment_amount(self, subscription_id: UUID) -> int:
         """Получает размер платежа по подписке."""
         subscription = await self.get(subscription_id)
-        subscription_plan = await self._subscription_plan_service.get(subscription.plan_id)
+        subscription_plan = await self._subscription_plan_service.get_cached(subscription.plan_id)
         return subscription_plan.price
 
     async def _user_has_active_subscription(self, user_id: UUID) -> bool:
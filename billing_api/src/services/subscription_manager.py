@@ -7,15 +7,18 @@ from aio_pika.abc import AbstractExchange
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db import postgres, rabbitmq
 from db.postgres import get_session
 from db.rabbitmq import QueueName, get_rabbitmq_exchange
 from models.enums import SubscriptionStatus
 from models.models import Subscription, Transaction
+from schemas.pagination import CursorPage, CursorParams
 from schemas.subscription import SubscriptionCreate, SubscriptionRenew
 from services.external import AuthService, NotificationService
-from services.payment_process import PaymentManager, get_payment_manager_service
+from services.payment_process import PaymentManager, PaymentProcessorStripe, get_payment_manager_service
 from services.subscription import SubscriptionService
 from services.subscription_plan import SubscriptionPlanService
+from services.transaction import TransactionService
 
 logger = logging.getLogger(__name__)
 
@@ -35,9 +38,9 @@ class SubscriptionManager:
 
     async def create_subscription(self, user_id: UUID, subscription_data: SubscriptionCreate) -> Subscription:
         """Создаёт новую подписку для пользователя."""
-        subscription = await self._subscription_service.create_subscription(user_id, subscription_data)
+        # события пишутся в outbox до изменения данных и фиксируются одним коммитом с ними
         await self._notification_service.notify_user_subscription_status(user_id, SubscriptionStatus.PENDING)
-        return subscription
+        return await self._subscription_service.create_subscription(user_id, subscription_data)
 
     async def initate_subscription_payment(self, user_id: UUID, card_id: UUID, subscription_id: UUID) -> Transaction:
         """Инициирует оплату по подписке."""
@@ -49,19 +52,18 @@ class SubscriptionManager:
 
     async def activate_subscription(self, subscription_id: UUID) -> Subscription:
         """Активирует подписку, изменяет роль пользователя и отправляет уведомление пользователю."""
-        subscription = await self._subscription_service.change_status(subscription_id, SubscriptionStatus.ACTIVE)
+        subscription = await self._subscription_service.get(subscription_id)
         await self._auth_service.upgrade_user_to_subscriber(subscription.user_id)
         await self._notification_service.notify_user_subscription_status(
             subscription.user_id, SubscriptionStatus.ACTIVE
         )
-        return subscription
+        return await self._subscription_service.change_status(subscription_id, SubscriptionStatus.ACTIVE)
 
     async def cancel_subscription(self, user_id: UUID, subscription_id: UUID) -> Subscription:
         """Отменяет подписку пользователя, изменяет роль пользователя и отправляет уведомление пользователю."""
-        subscription = await self._subscription_service.cancel_subscription(user_id, subscription_id)
         await self._auth_service.downgrade_user_to_basic(user_id)
         await self._notification_service.notify_user_subscription_status(user_id, SubscriptionStatus.CANCELLED)
-        return subscription
+        return await self._subscription_service.cancel_subscription(user_id, subscription_id)
 
     async def renew_subscription(
         self, user_id: UUID, subscription_id: UUID, renew_data: SubscriptionRenew
@@ -74,10 +76,23 @@ class SubscriptionManager:
         new_subscription = await self._subscription_service.renew_subscription(
             user_id, current_subscription.id, renew_data
         )
-        default_user_card = await self._payment_manager.get_user_default_card_id(user_id)
-        await self.initate_subscription_payment(user_id, card_id=default_user_card, subscription_id=new_subscription.id)
+        await self.pay_with_default_card(user_id, new_subscription.id)
         return new_subscription
 
+    async def renew_expired_subscriptions(self, subscriptions: Sequence[Subscription]) -> list[Subscription]:
+        """Продляет пачку истекших подписок с автопродлением без оплаты.
+
+        Оплату новых подписок нужно инициировать отдельно через pay_with_default_card.
+        """
+        return await self._subscription_service.renew_expired_subscriptions(subscriptions)
+
+    async def pay_with_default_card(self, user_id: UUID, subscription_id: UUID) -> Transaction:
+        """Инициирует оплату подписки дефолтной картой пользователя."""
+        default_user_card = await self._payment_manager.get_user_default_card_id(user_id)
+        return await self.initate_subscription_payment(
+            user_id, card_id=default_user_card, subscription_id=subscription_id
+        )
+
     async def mark_subscription_expired(
         self, user_id: UUID, subscription_id: UUID, role_detachment: bool = True
     ) -> Subscription:
@@ -86,14 +101,30 @@ class SubscriptionManager:
         Если role_detachment = True - отрываем роли у юзера и отправляем ему уведомление.
         """
         subscription = await self.get_subscription_by_id(subscription_id)
-        await self._subscription_service.change_status(
-            subscription_id=subscription.id, new_status=SubscriptionStatus.EXPIRED
-        )
         if role_detachment:
             await self._auth_service.downgrade_user_to_basic(user_id)
             await self._notification_service.notify_user_subscription_status(user_id, SubscriptionStatus.EXPIRED)
+        await self._subscription_service.change_status(
+            subscription_id=subscription.id, new_status=SubscriptionStatus.EXPIRED
+        )
         return subscription
 
+    async def expire_due_subscriptions(self, batch_size: int) -> int:
+        """Помечает истекшими все просроченные подписки без автопродления пачками по batch_size.
+
+        На каждую пачку приходится один UPDATE ... RETURNING и пакетная публикация понижения ролей и уведомлений,
+        при работе через outbox события фиксируются в одной транзакции с изменением статусов.
+        Возвращает количество подписок, помеченных истекшими.
+        """
+        expired_count = 0
+        while user_ids := await self._subscription_service.expire_due_subscriptions(batch_size):
+            await self._auth_service.downgrade_users_to_basic(user_ids)
+            await self._notification_service.notify_users_subscription_status(user_ids, SubscriptionStatus.EXPIRED)
+            await self._subscription_service.commit()
+            expired_count += len(user_ids)
+            logger.info(f"Помечено истекшими {len(user_ids)} подписок без автопродления")
+        return expired_count
+
     async def get_subscription_by_id(self, subscription_id: UUID) -> Subscription:
         """Получает подписку по id."""
         return await self._subscription_service.get(subscription_id)
@@ -102,9 +133,9 @@ class SubscriptionManager:
         """Получает подписку пользователя по id."""
         return await self._subscription_service.get_user_subscription(user_id, subscription_id)
 
-    async def get_subscriptions(self, filters: dict | None) -> Sequence[Subscription]:
-        """Выгружает список подписок."""
-        return await self._subscription_service.get_many(filters)
+    async def get_subscriptions_page(self, params: CursorParams, filters: dict | None) -> CursorPage:
+        """Выгружает страницу списка подписок с keyset-пагинацией."""
+        return await self._subscription_service.get_page(params, filters)
 
     async def toggle_subscription_auto_renewal(self, user_id: UUID, subscription_id: UUID) -> Subscription:
         """Включает/отключает автоматическое продление подписки."""
@@ -149,11 +180,26 @@ def get_subscription_manager(
     payment_manager: PaymentManager = Depends(get_payment_manager_service),
 ):
     subscription_service = SubscriptionService(session, subscription_plan_service=SubscriptionPlanService(session))
-    auth_service = AuthService(QueueName.AUTH, exchange)
-    notification_service = NotificationService(QueueName.NOTIFICATION, exchange)
+    auth_service = AuthService(QueueName.AUTH, exchange, outbox_session=session)
+    notification_service = NotificationService(QueueName.NOTIFICATION, exchange, outbox_session=session)
     return SubscriptionManager(
         subscription_service=subscription_service,
         payment_manager=payment_manager,
         auth_service=auth_service,
         notification_service=notification_service,
     )
+
+
+def build_subscription_manager(session: AsyncSession) -> SubscriptionManager:
+    """Собирает SubscriptionManager вне запроса FastAPI (задачи Celery, воркеры) на подключениях процесса.
+
+    События для Auth и Notification пишутся в outbox в транзакции session.
+    """
+    subscription_service = SubscriptionService(session, subscription_plan_service=SubscriptionPlanService(session))
+    transaction_service = TransactionService(postgres.async_session)
+    notification_service = NotificationService(QueueName.NOTIFICATION, rabbitmq.exchange, outbox_session=session)
+    auth_service = AuthService(QueueName.AUTH, rabbitmq.exchange, outbox_session=session)
+    payment_manager = PaymentManager(
+        postgres.async_session, PaymentProcessorStripe(), transaction_service, notification_service
+    )
+    return SubscriptionManager(subscription_service, payment_manager, auth_service, notification_service)
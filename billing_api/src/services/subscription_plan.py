@@ -2,14 +2,15 @@ from functools import lru_cache
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.postgres import get_session
 from models.models import SubscriptionPlan
-from schemas.subscription_plan import SubscriptionPlanCreate, SubscriptionPlanUpdate
+from schemas.subscription_plan import SubscriptionPlanCreate, SubscriptionPlanResponse, SubscriptionPlanUpdate
 from services.base import SQLAlchemyRepository
 from services.exceptions import ObjectAlreadyExistsError
+from services.subscription_plan_cache import subscription_plan_cache
 
 
 class SubscriptionPlanService(SQLAlchemyRepository[SubscriptionPlan, SubscriptionPlanCreate, SubscriptionPlanUpdate]):
@@ -24,16 +25,66 @@ class SubscriptionPlanService(SQLAlchemyRepository[SubscriptionPlan, Subscriptio
     async def create_new_subscription_plan(self, subscription_plan_data: SubscriptionPlanCreate) -> SubscriptionPlan:
         if await self.check_subscription_plan_exists_by_title(subscription_plan_data.title):
             raise ObjectAlreadyExistsError("План подписки с выбранным заголовком уже существует.")
-        return await self.create(subscription_plan_data)
+        subscription_plan = await self.create(subscription_plan_data)
+        await subscription_plan_cache.invalidate()
+        return subscription_plan
 
     async def update_subscription_plan(
         self, subscription_plan_id: UUID, subscription_plan_data: SubscriptionPlanUpdate
     ) -> SubscriptionPlan:
-        if subscription_plan_data.title is None:
-            return await self.update(subscription_plan_id, subscription_plan_data)
-        if await self.check_subscription_plan_exists_by_title(subscription_plan_data.title):
+        if subscription_plan_data.title is not None and await self.check_subscription_plan_exists_by_title(
+            subscription_plan_data.title
+        ):
             raise ObjectAlreadyExistsError("План подписки с выбранным заголовком уже существует.")
-        return await self.update(subscription_plan_id, subscription_plan_data)
+        subscription_plan = await self.update(subscription_plan_id, subscription_plan_data)
+        await subscription_plan_cache.invalidate()
+        return subscription_plan
+
+    async def import_subscription_plans(self, plans_data: list[SubscriptionPlanCreate]) -> list[SubscriptionPlan]:
+        """Импортирует планы подписок пачкой: новые планы создаются, существующие с тем же заголовком обновляются."""
+        subscription_plans = await self.upsert_many(plans_data, index_elements=["title"])
+        await subscription_plan_cache.invalidate()
+        return subscription_plans
+
+    async def get_cached(self, subscription_plan_id: UUID) -> SubscriptionPlanResponse:
+        """Получает план подписки по id из кэша, при промахе читает его из БД."""
+        subscription_plan = subscription_plan_cache.get_plan(subscription_plan_id)
+        if subscription_plan is None:
+            generation = subscription_plan_cache.generation
+            subscription_plan = SubscriptionPlanResponse.model_validate(await self.get(subscription_plan_id))
+            subscription_plan_cache.set_plan(subscription_plan, generation)
+        return subscription_plan
+
+    async def get_catalogue(self) -> list[SubscriptionPlanResponse]:
+        """Получает каталог неархивных планов подписок из кэша, при промахе читает его из БД."""
+        catalogue = subscription_plan_cache.get_catalogue()
+        if catalogue is None:
+            generation = subscription_plan_cache.generation
+            stmt = (
+                select(self._model)
+                .where(self._model.is_archive.is_(False))
+                .order_by(self._model.created_at, self._model.id)
+            )
+            result = await self._session.scalars(stmt)
+            catalogue = [SubscriptionPlanResponse.model_validate(plan) for plan in result.all()]
+            subscription_plan_cache.set_catalogue(catalogue, generation)
+        return catalogue
+
+    async def get_catalogue_version(self) -> str:
+        """Возвращает версию каталога планов подписок.
+
+        Версия строится по количеству планов и max(updated_at) и меняется при создании, изменении
+        и архивации любого плана. Используется как ETag каталога.
+        """
+        version = subscription_plan_cache.get_catalogue_version()
+        if version is None:
+            generation = subscription_plan_cache.generation
+            stmt = select(func.count(self._model.id), func.max(self._model.updated_at))
+            plans_count, last_updated_at = (await self._session.execute(stmt)).one()
+            last_updated = last_updated_at.timestamp() if last_updated_at else 0
+            version = f"{plans_count}-{last_updated:.6f}"
+            subscription_plan_cache.set_catalogue_version(version, generation)
+        return version
 
 
 @lru_cache
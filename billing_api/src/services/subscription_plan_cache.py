@@ -0,0 +1,107 @@
+import logging
+from uuid import UUID
+
+import aio_pika
+from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractIncomingMessage, AbstractRobustConnection
+from aio_pika.exceptions import AMQPError, ChannelInvalidStateError
+
+from core.config import settings
+from schemas.subscription_plan import SubscriptionPlanResponse
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionPlanCache:
+    """Кэш планов подписок в памяти процесса: планы по id и каталог неархивных планов.
+
+    Планы меняются редко, поэтому записи живут ttl секунд и сбрасываются целиком при изменении
+    любого плана. Чтобы кэши всех процессов оставались согласованными, сброс рассылается через
+    fanout-обменник RabbitMQ, к которому каждый процесс привязывает собственную временную очередь.
+    Если сообщение о сбросе потеряно (например, при переподключении к брокеру), устаревшие данные
+    живут не дольше ttl.
+
+    Значение, прочитанное из БД до сброса, не должно попасть в кэш после него, поэтому set_* принимают
+    поколение кэша, полученное до чтения из БД, и ничего не сохраняют, если с тех пор был сброс.
+    """
+
+    _CATALOGUE_KEY = "catalogue"
+
+    def __init__(self, ttl: float):
+        self._plans: TTLCache[UUID, SubscriptionPlanResponse] = TTLCache(ttl)
+        self._catalogue: TTLCache[str, list[SubscriptionPlanResponse]] = TTLCache(ttl)
+        self._catalogue_version: TTLCache[str, str] = TTLCache(ttl)
+        self._channel: AbstractChannel | None = None
+        self._exchange: AbstractExchange | None = None
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get_plan(self, plan_id: UUID) -> SubscriptionPlanResponse | None:
+        return self._plans.get(plan_id)
+
+    def set_plan(self, plan: SubscriptionPlanResponse, generation: int) -> None:
+        if generation == self._generation:
+            self._plans.set(plan.id, plan)
+
+    def get_catalogue(self) -> list[SubscriptionPlanResponse] | None:
+        return self._catalogue.get(self._CATALOGUE_KEY)
+
+    def set_catalogue(self, plans: list[SubscriptionPlanResponse], generation: int) -> None:
+        if generation != self._generation:
+            return
+        self._catalogue.set(self._CATALOGUE_KEY, plans)
+        for plan in plans:
+            self._plans.set(plan.id, plan)
+
+    def get_catalogue_version(self) -> str | None:
+        return self._catalogue_version.get(self._CATALOGUE_KEY)
+
+    def set_catalogue_version(self, version: str, generation: int) -> None:
+        if generation == self._generation:
+            self._catalogue_version.set(self._CATALOGUE_KEY, version)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._plans.clear()
+        self._catalogue.clear()
+        self._catalogue_version.clear()
+
+    async def invalidate(self) -> None:
+        """Сбрасывает кэш текущего процесса и рассылает сброс остальным процессам."""
+        self.clear()
+        if self._exchange is None:
+            return
+
+        try:
+            await self._exchange.publish(
+                aio_pika.Message(body=b""), routing_key="", timeout=settings.rabbitmq.publish_timeout
+            )
+        # сброс выполняется после коммита изменений, поэтому ошибка RabbitMQ не должна превращаться в 500
+        except (TimeoutError, AMQPError, ChannelInvalidStateError):
+            logger.exception("Не удалось разослать сброс кэша планов подписок, кэш других процессов устареет по ttl")
+
+    async def bind(self, connection: AbstractRobustConnection) -> None:
+        """Подписывает процесс на сбросы кэша от других процессов."""
+        self._channel = await connection.channel()
+        self._exchange = await self._channel.declare_exchange(
+            settings.rabbitmq.plan_cache_exchange_name, aio_pika.ExchangeType.FANOUT, durable=True
+        )
+        queue = await self._channel.declare_queue(exclusive=True, auto_delete=True)
+        await queue.bind(self._exchange)
+        await queue.consume(self._on_invalidation, no_ack=True)
+
+    async def close(self) -> None:
+        self._exchange = None
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+
+    async def _on_invalidation(self, message: AbstractIncomingMessage) -> None:
+        self.clear()
+        logger.debug("Кэш планов подписок сброшен по сообщению из RabbitMQ")
+
+
+subscription_plan_cache = SubscriptionPlanCache(ttl=settings.plan_cache_ttl_sec)
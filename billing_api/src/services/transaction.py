@@ -9,7 +9,9 @@ from sqlalchemy.future import select
 from db.postgres import get_postgres_session
 from models.enums import PaymentType
 from models.models import Transaction
+from schemas.pagination import CursorPage, CursorParams
 from services.exceptions import ObjectNotUpdatedException, ORMBadRequestError, TransactionNotFoundError
+from services.pagination import keyset_paginate
 
 
 class TransactionService:
@@ -44,6 +46,38 @@ class TransactionService:
                 raise ORMBadRequestError(f"Bad request {e}") from None
             return result.all()
 
+    async def get_transactions_page(self, query_params: dict[str, str], params: CursorParams) -> CursorPage:
+        """Возвращает страницу транзакций с keyset-пагинацией по (created_at, id)."""
+        async with self.postgres_session() as session:
+            try:
+                return await keyset_paginate(
+                    session, select(Transaction).filter_by(**query_params), Transaction, params
+                )
+            except DBAPIError as e:
+                raise ORMBadRequestError(f"Bad request {e}") from None
+
+    @staticmethod
+    def add_transaction(
+        session: AsyncSession,
+        subscription_id: UUID,
+        user_id: UUID,
+        amount: int,
+        payment_type: PaymentType,
+        user_card_id: UUID,
+        stripe_payment_intent_id: str | None = None,
+    ) -> Transaction:
+        """Добавляет транзакцию в сессию вызывающего кода без коммита."""
+        transaction = Transaction(
+            subscription_id=subscription_id,
+            user_id=user_id,
+            amount=amount,
+            payment_type=payment_type,
+            user_card_id=user_card_id,
+            stripe_payment_intent_id=stripe_payment_intent_id,
+        )
+        session.add(transaction)
+        return transaction
+
     async def create_transaction(
         self,
         subscription_id: UUID,
@@ -54,15 +88,9 @@ class TransactionService:
         stripe_payment_intent_id: str | None = None,
     ):
         async with self.postgres_session() as session:
-            transaction = Transaction(
-                subscription_id=subscription_id,
-                user_id=user_id,
-                amount=amount,
-                payment_type=payment_type,
-                user_card_id=user_card_id,
-                stripe_payment_intent_id=stripe_payment_intent_id,
+            transaction = self.add_transaction(
+                session, subscription_id, user_id, amount, payment_type, user_card_id, stripe_payment_intent_id
             )
-            session.add(transaction)
             await session.commit()
             return transaction
 
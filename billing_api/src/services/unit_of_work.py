@@ -0,0 +1,49 @@
+from types import TracebackType
+from typing import Self
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class UnitOfWork:
+    """Единица работы: одна сессия и одна транзакция на всю бизнес-операцию.
+
+    Изменения фиксируются только явным вызовом commit, при выходе из контекста
+    по исключению транзакция откатывается.
+
+        async with UnitOfWork(session_maker) as uow:
+            uow.session.add(entity)
+            await uow.commit()
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self._session_maker = session_maker
+        self._session: AsyncSession | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            raise RuntimeError("UnitOfWork используется вне контекста async with")
+        return self._session
+
+    async def __aenter__(self) -> Self:
+        self._session = self._session_maker()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        try:
+            if exc_type is not None:
+                await self.session.rollback()
+        finally:
+            await self.session.close()
+            self._session = None
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
@@ -1,92 +1,132 @@
+import asyncio
 import logging
-from collections.abc import Sequence
+import time
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
 from datetime import datetime
 
-from asgiref.sync import async_to_sync
 from celery import shared_task  # type: ignore[import-untyped]
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
-from db import postgres, rabbitmq
-from db.rabbitmq import QueueName
+from db import postgres
 from models.enums import SubscriptionStatus
 from models.models import Subscription
-from schemas.subscription import SubscriptionRenew
-from services.external.auth import AuthService
-from services.external.notification import NotificationService
-from services.payment_process import PaymentManager, PaymentProcessorStripe
-from services.subscription import SubscriptionService
-from services.subscription_manager import SubscriptionManager
-from services.subscription_plan import SubscriptionPlanService
-from services.transaction import TransactionService
+from services.subscription_manager import build_subscription_manager
 from workers.celery import queue
+from workers.resources import worker_resources
 
 logger = logging.getLogger(__name__)
 
-async def get_expired_subscriptions(session: AsyncSession) -> Sequence[Subscription]:
+
+@dataclass
+class SweepStats:
+    """Статистика одного прогона проверки подписок."""
+
+    expired_in_bulk: int = 0
+    processed: int = 0
+    failed: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        return (self.expired_in_bulk + self.processed + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"истекло без автопродления {self.expired_in_bulk}, продлено {self.processed}, ошибок {self.failed} "
+            f"за {self.elapsed:.2f} с "
+            f"({self.throughput:.1f} подписок/с)"
+        )
+
+
+async def get_expired_subscriptions(session: AsyncSession, chunk_size: int) -> AsyncIterator[Sequence[Subscription]]:
+    """Построчно вычитывает истекшие подписки с автопродлением серверным курсором и отдаёт их пачками по chunk_size."""
     current_date = datetime.now()
 
-    result = await session.execute(
-        select(Subscription).filter(
+    result = await session.stream_scalars(
+        select(Subscription)
+        .filter(
             Subscription.end_date <= current_date,
             Subscription.status == SubscriptionStatus.ACTIVE.value,
+            Subscription.auto_renewal.is_(True),
         )
+        .execution_options(yield_per=chunk_size)
     )
-    return result.scalars().all()
+    async for chunk in result.partitions():
+        yield chunk
 
 
-async def check_subscription(subscription: Subscription, subscription_manager: SubscriptionManager):
-    if subscription.auto_renewal:
-        renew_data = SubscriptionRenew(plan_id=subscription.plan_id)
-        new_subscription = await subscription_manager.renew_subscription(
-            user_id=subscription.user_id, subscription_id=subscription.id, renew_data=renew_data
-        )
-        if hasattr(new_subscription, "id"):
-            logger.info(f"Subscription {subscription.id} is renewed")
-        await subscription_manager.mark_subscription_expired(
-            user_id=subscription.user_id, subscription_id=subscription.id, role_detachment=False
-        )
+async def pay_subscription(subscription: Subscription, semaphore: asyncio.Semaphore, stats: SweepStats) -> None:
+    """Инициирует оплату продлённой подписки в отдельной сессии, ошибка одной оплаты не прерывает весь прогон.
+
+    Место в окне (semaphore) занимает вызывающий код до создания задачи, здесь оно освобождается.
+    """
+    try:
+        async with postgres.async_session() as session:
+            await build_subscription_manager(session).pay_with_default_card(subscription.user_id, subscription.id)
+    except Exception:
+        stats.failed += 1
+        logger.exception(f"Ошибка при оплате продлённой подписки {subscription.id}")
     else:
-        await subscription_manager.mark_subscription_expired(
-            subscription.user_id, subscription.id, role_detachment=True
-        )
+        stats.processed += 1
+    finally:
+        semaphore.release()
+
+
+async def renew_chunk(
+    chunk: Sequence[Subscription], semaphore: asyncio.Semaphore, stats: SweepStats, payments: set[asyncio.Task]
+) -> None:
+    """Продляет пачку подписок одной транзакцией и ставит оплату новых подписок в общее скользящее окно.
+
+    Оплаты не дожидаются друг друга: как только в окне освобождается место, запускается следующая,
+    поэтому вычитка и продление следующей пачки идут параллельно с оплатами предыдущих.
+    Ожидание свободного места в окне ограничивает число оплат в работе и создаёт обратное давление на вычитку.
+    """
+    async with postgres.async_session() as session:
+        try:
+            renewed = await build_subscription_manager(session).renew_expired_subscriptions(chunk)
+        except Exception:
+            stats.failed += len(chunk)
+            logger.exception(f"Ошибка при продлении пачки из {len(chunk)} подписок")
+            return
+
+    for subscription in renewed:
+        await semaphore.acquire()
+        task = asyncio.create_task(pay_subscription(subscription, semaphore, stats))
+        payments.add(task)
+        task.add_done_callback(payments.discard)
 
 
 async def main():
+    stats = SweepStats()
+    semaphore = asyncio.Semaphore(settings.expiry_sweep_concurrency)
+    payments: set[asyncio.Task] = set()
     try:
-        postgres.engine = create_async_engine(settings.postgres_url, echo=settings.engine_echo, future=True)
-        postgres.async_session = async_sessionmaker(bind=postgres.engine, expire_on_commit=False, class_=AsyncSession)  # type: ignore[assignment]
-        rabbitmq.connection = await rabbitmq.create_rabbitmq_connection(settings.rabbitmq.url)
-        rabbitmq.exchange = await rabbitmq.init_rabbitmq(rabbitmq.connection)
-
         async with postgres.async_session() as session:
-            subscription_service = SubscriptionService(
-                session, subscription_plan_service=SubscriptionPlanService(postgres.async_session)
-            )
-            transaction_service = TransactionService(postgres.async_session)
-            notification_service = NotificationService(QueueName.NOTIFICATION, rabbitmq.exchange)
-            auth_service = AuthService(QueueName.AUTH, rabbitmq.exchange)
-            payment_proccessor = PaymentProcessorStripe()
-            payment_manager = PaymentManager(
-                postgres.async_session, payment_proccessor, transaction_service, notification_service
+            stats.expired_in_bulk = await build_subscription_manager(session).expire_due_subscriptions(
+                settings.expiry_sweep_chunk_size
             )
-            subscription_manager = SubscriptionManager(
-                subscription_service, payment_manager, auth_service, notification_service
-            )
-
-            expired_subscriptions = await get_expired_subscriptions(session)
 
-            for subscription in expired_subscriptions:
-                await check_subscription(subscription, subscription_manager)
+        async with postgres.async_session() as session:
+            async for chunk in get_expired_subscriptions(session, settings.expiry_sweep_chunk_size):
+                await renew_chunk(chunk, semaphore, stats, payments)
+                logger.info(f"Продлена пачка из {len(chunk)} подписок: {stats}")
 
     except Exception:
         logger.exception("An error occurred during subscription check process")
     finally:
-        await rabbitmq.close_rabbitmq_connection(rabbitmq.connection)
+        # дожидаемся оплат, оставшихся в окне, в том числе при ошибке вычитки
+        await asyncio.gather(*payments, return_exceptions=True)
+        logger.info(f"Проверка подписок завершена: {stats}")
 
 
 @shared_task(queue=queue.name)
 def check_subscriptions() -> None:
     logger.info("Executing scheduled task (check_subscripions)")
-    async_to_sync(main)()
+    worker_resources.run(main())
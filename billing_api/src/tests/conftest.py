@@ -9,6 +9,7 @@ from db.postgres import get_postgres_session, get_session
 from main import app
 from models.models import Base
 from services.subscription_manager import get_subscription_manager
+from services.subscription_plan_cache import subscription_plan_cache
 from tests.fixtures.subscription import override_get_subscription_manager
 
 pytest_plugins = [
@@ -48,6 +49,7 @@ async def prepare_database() -> AsyncGenerator[None, None]:
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+    subscription_plan_cache.clear()
     yield
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
@@ -3,6 +3,8 @@ from http import HTTPStatus
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.models import SubscriptionPlan
 
@@ -43,6 +45,86 @@ async def test_create_subscription_plan_duplicate_title(
     assert response.status_code == HTTPStatus.BAD_REQUEST
 
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_import_subscription_plans(
+    api_client: AsyncClient, random_subscription_plans: list[SubscriptionPlan], admin_auth_header: dict[str, str]
+):
+    """Тест импорта планов: план с существующим названием обновляется, новый создаётся"""
+    existing_plan = random_subscription_plans[0]
+    plans_data = [
+        {"title": existing_plan.title, "description": "Imported description", "price": 5000, "duration_days": 90},
+        {"title": "Imported Plan", "description": "Test description", "price": 1000, "duration_days": 30},
+    ]
+
+    response = await api_client.post(f"{SUBSCRIPTION_PLANS_ENDPOINT}import", json=plans_data, headers=admin_auth_header)
+    assert response.status_code == HTTPStatus.OK
+
+    data = response.json()
+    assert len(data) == len(plans_data)
+    assert data[0]["id"] == str(existing_plan.id)
+    assert data[0]["price"] == plans_data[0]["price"]
+    assert data[0]["duration_days"] == plans_data[0]["duration_days"]
+    assert data[1]["title"] == plans_data[1]["title"]
+    assert data[1]["id"] != str(existing_plan.id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_import_subscription_plans_with_different_fields(
+    api_client: AsyncClient,
+    random_subscription_plans: list[SubscriptionPlan],
+    admin_auth_header: dict[str, str],
+    test_session: AsyncSession,
+):
+    """Тест импорта планов с разным набором полей: непереданные поля существующего плана не меняются"""
+    archived_plan, active_plan = random_subscription_plans[:2]
+    archived_plan.is_archive = True
+    active_plan.is_archive = False
+    await test_session.commit()
+
+    plans_data = [
+        {"title": active_plan.title, "description": "Test", "price": 100, "duration_days": 30, "is_archive": True},
+        {"title": archived_plan.title, "description": "Test", "price": 200, "duration_days": 30},
+        {"title": "Archived Import", "description": "Test", "price": 300, "duration_days": 7, "is_archive": True},
+    ]
+
+    response = await api_client.post(f"{SUBSCRIPTION_PLANS_ENDPOINT}import", json=plans_data, headers=admin_auth_header)
+    assert response.status_code == HTTPStatus.OK
+
+    data = response.json()
+    assert [plan["title"] for plan in data] == [plan["title"] for plan in plans_data]
+    assert data[0]["id"] == str(active_plan.id)
+    assert data[0]["is_archive"] is True
+    assert data[1]["id"] == str(archived_plan.id)
+    assert data[1]["price"] == plans_data[1]["price"]
+    assert data[1]["is_archive"] is True
+    assert data[2]["is_archive"] is True
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize(
+    "duplicate_plan",
+    [
+        {"title": "Duplicate Import", "description": "Test", "price": 200, "duration_days": 30},
+        {"title": "Duplicate Import", "description": "Test", "price": 200, "duration_days": 30, "is_archive": True},
+    ],
+    ids=["same_columns", "different_columns"],
+)
+async def test_import_subscription_plans_duplicate_titles(
+    api_client: AsyncClient, duplicate_plan: dict, admin_auth_header: dict[str, str], test_session: AsyncSession
+):
+    """Тест импорта планов с повторяющимся заголовком: пачка отклоняется целиком"""
+    plans_data = [
+        {"title": "Duplicate Import", "description": "Test", "price": 100, "duration_days": 30},
+        duplicate_plan,
+    ]
+
+    response = await api_client.post(f"{SUBSCRIPTION_PLANS_ENDPOINT}import", json=plans_data, headers=admin_auth_header)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    imported = await test_session.scalar(select(SubscriptionPlan).where(SubscriptionPlan.title == "Duplicate Import"))
+    assert imported is None
+
+
 @pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.parametrize(
     "invalid_payload",
@@ -64,23 +64,26 @@ class TestSubscriptions:
     async def test_get_subscriptions_paginated(
         self, api_client: AsyncClient, admin_auth_header: dict[str, str], random_subscriptions
     ):
-        response = await api_client.get(f"{self.subscriptions_url}?page=1&size=1", headers=admin_auth_header)
+        response = await api_client.get(
+            self.subscriptions_url, params={"size": 1, "include_total": True}, headers=admin_auth_header
+        )
         data = response.json()
 
         assert response.status_code == HTTPStatus.OK
         assert data["total"] == len(random_subscriptions)
         assert len(data["items"]) == 1
-        assert data["page"] == 1
         assert data["size"] == 1
+        assert data["next_cursor"] is not None
 
-        response = await api_client.get(f"{self.subscriptions_url}?page=2&size=1", headers=admin_auth_header)
-        data = response.json()
+        response = await api_client.get(
+            self.subscriptions_url, params={"size": 1, "cursor": data["next_cursor"]}, headers=admin_auth_header
+        )
+        next_data = response.json()
 
         assert response.status_code == HTTPStatus.OK
-        assert data["total"] == len(random_subscriptions)
-        assert len(data["items"]) == 1
-        assert data["page"] == 2
-        assert data["size"] == 1
+        assert next_data["total"] is None
+        assert len(next_data["items"]) == 1
+        assert next_data["items"][0]["id"] != data["items"][0]["id"]
 
     @pytest.mark.asyncio(loop_scope="session")
     async def test_get_subscriptions_with_filter_params(
@@ -88,7 +91,7 @@ class TestSubscriptions:
     ):
         status = SubscriptionStatus.ACTIVE.value
         auto_renewal = False
-        filtered_url = f"{self.subscriptions_url}?status={status}&auto_renewal={auto_renewal}"
+        filtered_url = f"{self.subscriptions_url}?status={status}&auto_renewal={auto_renewal}&include_total=true"
         filtered_subscriptions = [
             sub for sub in random_subscriptions if (sub.status == status and sub.auto_renewal == auto_renewal)
         ]
@@ -62,23 +62,26 @@ class TestGetTransactions:
     async def test_get_transactions_paginated(
         self, api_client: AsyncClient, admin_auth_header: dict[str, str], random_transactions
     ):
-        response = await api_client.get(f"{self.transactions_url}?page=1&size=1", headers=admin_auth_header)
+        response = await api_client.get(
+            self.transactions_url, params={"size": 1, "include_total": True}, headers=admin_auth_header
+        )
         data = response.json()
 
         assert response.status_code == HTTPStatus.OK
         assert data["total"] == len(random_transactions)
         assert len(data["items"]) == 1
-        assert data["page"] == 1
         assert data["size"] == 1
+        assert data["next_cursor"] is not None
 
-        response = await api_client.get(f"{self.transactions_url}?page=2&size=1", headers=admin_auth_header)
-        data = response.json()
+        response = await api_client.get(
+            self.transactions_url, params={"size": 1, "cursor": data["next_cursor"]}, headers=admin_auth_header
+        )
+        next_data = response.json()
 
         assert response.status_code == HTTPStatus.OK
-        assert data["total"] == len(random_transactions)
-        assert len(data["items"]) == 1
-        assert data["page"] == 2
-        assert data["size"] == 1
+        assert next_data["total"] is None
+        assert len(next_data["items"]) == 1
+        assert next_data["items"][0]["id"] != data["items"][0]["id"]
 
     @pytest.mark.asyncio(loop_scope="session")
     async def test_get_transactions_with_filter_params(
@@ -86,7 +89,7 @@ class TestGetTransactions:
     ):
         payment_type = PaymentType.STRIPE.value
         status = TransactionStatus.SUCCESS.value
-        filtered_url = f"{self.transactions_url}?status={status}&payment_type={payment_type}"
+        filtered_url = f"{self.transactions_url}?status={status}&payment_type={payment_type}&include_total=true"
         filtered_transactions = [
             tr for tr in random_transactions if (tr.status == status and tr.payment_type == payment_type)
         ]
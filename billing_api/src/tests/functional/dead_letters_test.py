@@ -0,0 +1,84 @@
+import pytest
+from aio_pika.exceptions import DeliveryError
+
+from db.rabbitmq import QueueName
+from workers.dead_letters import redrive_dead_letters
+
+WEBHOOK_QUEUE = QueueName.STRIPE_WEBHOOK.value
+
+
+class FakeIncomingMessage:
+    def __init__(self, body: bytes, dlq: "FakeQueue"):
+        self.body = body
+        self.content_type = "application/json"
+        self.message_id = None
+        self._dlq = dlq
+
+    async def ack(self) -> None:
+        self._dlq.acked.append(self.body)
+
+    async def nack(self, requeue: bool = True) -> None:
+        if requeue:
+            self._dlq.bodies.insert(0, self.body)
+
+
+class FakeQueue:
+    def __init__(self, bodies: list[bytes]):
+        self.bodies = list(bodies)
+        self.acked: list[bytes] = []
+
+    async def get(self, no_ack: bool = False, fail: bool = True) -> FakeIncomingMessage | None:
+        if not self.bodies:
+            return None
+        return FakeIncomingMessage(self.bodies.pop(0), self)
+
+
+class FakeExchange:
+    def __init__(self, fail_on: bytes | None = None):
+        self.published: list[tuple[bytes, str]] = []
+        self._fail_on = fail_on
+
+    async def publish(self, message, routing_key: str, timeout: float | None = None) -> None:
+        if message.body == self._fail_on:
+            raise DeliveryError(None, None)
+        self.published.append((message.body, routing_key))
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_redrive_dead_letters_returns_events_in_order():
+    """Событие, не обработанное WebhookWorker, возвращается из DLQ в очередь вебхуков в исходном порядке"""
+    bodies = [b'{"id": "evt_1"}', b'{"id": "evt_2"}', b'{"id": "evt_3"}']
+    dlq = FakeQueue(bodies)
+    exchange = FakeExchange()
+
+    redriven = await redrive_dead_letters(dlq, exchange, WEBHOOK_QUEUE)  # type: ignore[arg-type]
+
+    assert redriven == len(bodies)
+    assert exchange.published == [(body, WEBHOOK_QUEUE) for body in bodies]
+    assert dlq.acked == bodies
+    assert dlq.bodies == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_redrive_dead_letters_limit():
+    dlq = FakeQueue([b'{"id": "evt_1"}', b'{"id": "evt_2"}'])
+    exchange = FakeExchange()
+
+    redriven = await redrive_dead_letters(dlq, exchange, WEBHOOK_QUEUE, limit=1)  # type: ignore[arg-type]
+
+    assert redriven == 1
+    assert exchange.published == [(b'{"id": "evt_1"}', WEBHOOK_QUEUE)]
+    assert dlq.bodies == [b'{"id": "evt_2"}']
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_redrive_dead_letters_keeps_message_on_publish_error():
+    """Сообщение удаляется из DLQ только после подтверждения публикации"""
+    dlq = FakeQueue([b'{"id": "evt_1"}', b'{"id": "evt_2"}'])
+    exchange = FakeExchange(fail_on=b'{"id": "evt_2"}')
+
+    with pytest.raises(DeliveryError):
+        await redrive_dead_letters(dlq, exchange, WEBHOOK_QUEUE)  # type: ignore[arg-type]
+
+    assert dlq.acked == [b'{"id": "evt_1"}']
+    assert dlq.bodies == [b'{"id": "evt_2"}']
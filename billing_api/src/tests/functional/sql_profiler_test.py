@@ -0,0 +1,51 @@
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import Session
+
+from db.sql_profiler import QueryBudgetExceededError, profile_sql, query_budget
+
+
+@pytest.fixture
+def sqlite_engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def test_query_budget_statements_exceeded(sqlite_engine: Engine):
+    with pytest.raises(QueryBudgetExceededError, match="SQL-запросов 2, допустимо 1"):
+        with query_budget(max_statements=1), Session(sqlite_engine) as session:
+            session.execute(text("SELECT 1"))
+            session.execute(text("SELECT 2"))
+
+
+def test_query_budget_repeated_statement(sqlite_engine: Engine):
+    """Один и тот же запрос в цикле (N+1) нарушает бюджет, даже если общее число запросов допустимо"""
+    with pytest.raises(QueryBudgetExceededError, match="запросы повторяются больше 1 раз"):
+        with query_budget(max_statements=10, max_repeats=1), Session(sqlite_engine) as session:
+            for _ in range(3):
+                session.execute(text("SELECT 1"))
+
+
+def test_query_budget_sessions_exceeded(sqlite_engine: Engine):
+    with pytest.raises(QueryBudgetExceededError, match="сессий 2, допустимо 1"):
+        with query_budget(max_statements=10, max_sessions=1):
+            for _ in range(2):
+                with Session(sqlite_engine) as session:
+                    session.execute(text("SELECT 1"))
+
+
+def test_query_budget_counts_session_once_in_nested_profiles(sqlite_engine: Engine):
+    """Сессия с несколькими транзакциями учитывается один раз в каждом из вложенных профилей"""
+    with query_budget(max_statements=3, max_sessions=1) as outer, Session(sqlite_engine) as session:
+        session.execute(text("SELECT 1"))
+        session.commit()
+        with profile_sql() as inner:
+            session.execute(text("SELECT 2"))
+            session.commit()
+            session.execute(text("SELECT 3"))
+
+    assert (outer.statements_count, outer.sessions_count) == (3, 1)
+    assert (inner.statements_count, inner.sessions_count) == (2, 1)
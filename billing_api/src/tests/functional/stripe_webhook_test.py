@@ -0,0 +1,106 @@
+import hashlib
+import hmac
+
+import orjson
+import pytest
+
+from services.exceptions import InvalidWebhookPayloadError, WebhookSignatureError
+from services.stripe_webhook import parse_stripe_event, verify_stripe_signature
+
+WEBHOOK_SECRET = "whsec_test_secret"  # noqa: S105
+ANOTHER_WEBHOOK_SECRET = "whsec_another_secret"  # noqa: S105
+TOLERANCE_SEC = 300
+NOW = 1_700_000_000
+
+EVENT_BODY = orjson.dumps(
+    {
+        "id": "evt_test",
+        "object": "event",
+        "type": "payment_intent.succeeded",
+        "data": {"object": {"id": "pi_test", "object": "payment_intent", "customer": "cus_test"}},
+    }
+)
+
+
+def sign(body: bytes, timestamp: int = NOW, secret: str = WEBHOOK_SECRET) -> str:
+    return hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+
+
+def test_verify_stripe_signature_valid():
+    verify_stripe_signature(EVENT_BODY, f"t={NOW},v1={sign(EVENT_BODY)}", WEBHOOK_SECRET, TOLERANCE_SEC, now=NOW)
+
+
+def test_verify_stripe_signature_multiple_v1_entries():
+    header = f"t={NOW},v1={sign(EVENT_BODY, secret=ANOTHER_WEBHOOK_SECRET)},v1={sign(EVENT_BODY)},v0=legacy"
+    verify_stripe_signature(EVENT_BODY, header, WEBHOOK_SECRET, TOLERANCE_SEC, now=NOW)
+
+
+def test_verify_stripe_signature_wrong_secret():
+    header = f"t={NOW},v1={sign(EVENT_BODY, secret=ANOTHER_WEBHOOK_SECRET)}"
+    with pytest.raises(WebhookSignatureError):
+        verify_stripe_signature(EVENT_BODY, header, WEBHOOK_SECRET, TOLERANCE_SEC, now=NOW)
+
+
+def test_verify_stripe_signature_modified_body():
+    header = f"t={NOW},v1={sign(EVENT_BODY)}"
+    with pytest.raises(WebhookSignatureError):
+        verify_stripe_signature(EVENT_BODY + b" ", header, WEBHOOK_SECRET, TOLERANCE_SEC, now=NOW)
+
+
+def test_verify_stripe_signature_expired_timestamp():
+    timestamp = NOW - TOLERANCE_SEC - 1
+    header = f"t={timestamp},v1={sign(EVENT_BODY, timestamp=timestamp)}"
+    with pytest.raises(WebhookSignatureError):
+        verify_stripe_signature(EVENT_BODY, header, WEBHOOK_SECRET, TOLERANCE_SEC, now=NOW)
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        None,
+        "",
+        "garbage",
+        f"t={NOW}",
+        f"v1={sign(EVENT_BODY)}",
+        f"t=abc,v1={sign(EVENT_BODY)}",
+        f"t=١٧٠٠٠٠٠٠٠٠,v1={sign(EVENT_BODY)}",
+        f"t={NOW},v1=ÿé{sign(EVENT_BODY)[2:]}",
+    ],
+)
+def test_verify_stripe_signature_missing_or_malformed_header(header: str | None):
+    with pytest.raises(WebhookSignatureError):
+        verify_stripe_signature(EVENT_BODY, header, WEBHOOK_SECRET, TOLERANCE_SEC, now=NOW)
+
+
+def test_parse_stripe_event():
+    event = parse_stripe_event(EVENT_BODY)
+
+    assert event.id == "evt_test"
+    assert event.type == "payment_intent.succeeded"
+    assert event.data_object["id"] == "pi_test"
+    assert event.to_message() == {
+        "id": "evt_test",
+        "type": "payment_intent.succeeded",
+        "data": {"object": event.data_object},
+    }
+
+
+@pytest.mark.parametrize("body", [b"", b"not json", b"{", b'\xff{"id": "evt_test"}'])
+def test_parse_stripe_event_not_json(body: bytes):
+    with pytest.raises(InvalidWebhookPayloadError):
+        parse_stripe_event(body)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"[]",
+        b'{"id": "evt_test", "type": "payment_intent.succeeded"}',
+        b'{"id": "evt_test", "data": {}}',
+        b'{"id": "evt_test", "data": {"object": null}}',
+        b'{"id": "evt_test", "data": []}',
+    ],
+)
+def test_parse_stripe_event_missing_data_object(body: bytes):
+    with pytest.raises(InvalidWebhookPayloadError):
+        parse_stripe_event(body)
@@ -65,6 +65,30 @@ async def test_get_subscription_plan_by_id_success(
     assert data["is_archive"] == existing_plan.is_archive
 
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_subscription_plan_after_update(
+    api_client: AsyncClient, random_subscription_plans: list[SubscriptionPlan], admin_auth_header: dict[str, str]
+):
+    """Тест сброса кэша планов: после изменения плана отдаются актуальные данные"""
+    existing_plan = random_subscription_plans[0]
+
+    response = await api_client.get(f"{SUBSCRIPTION_PLANS_ENDPOINT}{existing_plan.id}")
+    assert response.json()["price"] == existing_plan.price
+
+    response = await api_client.patch(
+        f"api/v1/admin/subscription_plans/{existing_plan.id}",
+        json={"price": existing_plan.price + 100, "is_archive": False},
+        headers=admin_auth_header,
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = await api_client.get(f"{SUBSCRIPTION_PLANS_ENDPOINT}{existing_plan.id}")
+    assert response.json()["price"] == existing_plan.price + 100
+
+    response = await api_client.get(SUBSCRIPTION_PLANS_ENDPOINT)
+    assert str(existing_plan.id) in [plan["id"] for plan in response.json()["items"]]
+
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test_get_subscription_plan_by_id_not_found(api_client: AsyncClient):
     non_existent_id = uuid.uuid4()
@@ -76,3 +100,30 @@ async def test_get_subscription_plan_by_id_not_found(api_client: AsyncClient):
 async def test_get_subscription_plan_by_id_invalid_uuid(api_client: AsyncClient):
     response = await api_client.get(f"{SUBSCRIPTION_PLANS_ENDPOINT}invalid-uuid")
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_subscription_plans_not_modified(
+    api_client: AsyncClient, random_subscription_plans: list[SubscriptionPlan], admin_auth_header: dict[str, str]
+):
+    """Тест условного запроса каталога: 304 до изменения планов и новый ETag после"""
+    response = await api_client.get(SUBSCRIPTION_PLANS_ENDPOINT)
+    assert response.status_code == HTTPStatus.OK
+    assert "max-age" in response.headers["cache-control"]
+    etag = response.headers["etag"]
+
+    response = await api_client.get(SUBSCRIPTION_PLANS_ENDPOINT, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert not response.content
+
+    response = await api_client.patch(
+        f"api/v1/admin/subscription_plans/{random_subscription_plans[0].id}",
+        json={"price": 100500},
+        headers=admin_auth_header,
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = await api_client.get(SUBSCRIPTION_PLANS_ENDPOINT, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["etag"] != etag
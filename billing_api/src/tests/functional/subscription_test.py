@@ -4,6 +4,7 @@ from http import HTTPStatus
 import pytest
 from httpx import AsyncClient
 
+from db.sql_profiler import QueryBudgetExceededError, query_budget
 from models.enums import SubscriptionStatus
 from models.models import Subscription, SubscriptionPlan
 
@@ -12,27 +13,30 @@ SUBSCRIPTIONS_ENDPOINT = "api/v1/subscriptions/"
 
 @pytest.mark.asyncio(loop_scope="session")
 async def test_get_subscriptions_empty(api_client: AsyncClient, access_token_user: dict[str, str]):
-    response = await api_client.get(SUBSCRIPTIONS_ENDPOINT, headers=access_token_user)
+    response = await api_client.get(
+        SUBSCRIPTIONS_ENDPOINT, params={"include_total": True}, headers=access_token_user
+    )
     assert response.status_code == HTTPStatus.OK
 
     data = response.json()
     assert "items" in data
     assert len(data["items"]) == 0
-    assert "total" in data
     assert data["total"] == 0
+    assert data["next_cursor"] is None
 
 
 @pytest.mark.asyncio(loop_scope="session")
 async def test_get_all_subscriptions_pagination(
     api_client: AsyncClient, active_user_subscription: Subscription, access_token_user: dict[str, str]
 ):
-    response = await api_client.get(f"{SUBSCRIPTIONS_ENDPOINT}?page=1&size=2", headers=access_token_user)
+    response = await api_client.get(f"{SUBSCRIPTIONS_ENDPOINT}?size=2", headers=access_token_user)
     assert response.status_code == HTTPStatus.OK
 
     data = response.json()
     assert len(data["items"]) == 1
-    assert data["page"] == 1
+    assert data["items"][0]["id"] == str(active_user_subscription.id)
     assert data["size"] == 2
+    assert data["next_cursor"] is None
 
 
 @pytest.mark.asyncio(loop_scope="session")
@@ -49,6 +53,26 @@ async def test_get_subscription_by_id_success(
     assert "status" in data
 
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_subscription_by_id_query_budget(
+    api_client: AsyncClient, active_user_subscription: Subscription, access_token_user: dict[str, str]
+):
+    with query_budget(max_statements=2, max_sessions=1, max_repeats=1):
+        response = await api_client.get(
+            f"{SUBSCRIPTIONS_ENDPOINT}{active_user_subscription.id}", headers=access_token_user
+        )
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_subscription_by_id_query_budget_exceeded(
+    api_client: AsyncClient, active_user_subscription: Subscription, access_token_user: dict[str, str]
+):
+    with pytest.raises(QueryBudgetExceededError, match="SQL-запросов"):
+        with query_budget(max_statements=0):
+            await api_client.get(f"{SUBSCRIPTIONS_ENDPOINT}{active_user_subscription.id}", headers=access_token_user)
+
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test_get_subscription_by_id_not_found(api_client: AsyncClient, access_token_user: dict[str, str]):
     non_existent_id = uuid.uuid4()
@@ -0,0 +1,138 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from core.config import settings
+from db import postgres
+from db.rabbitmq import QueueName
+from services.exceptions import TransactionNotFoundError
+from workers import webhook
+from workers.exceptions import PermanentWorkerError
+from workers.webhook import WebhookWorker
+
+PAYMENT_EVENT = {
+    "id": "evt_test",
+    "type": "payment_intent.succeeded",
+    "data": {"object": {"id": "pi_test", "object": "payment_intent", "customer": "cus_test"}},
+}
+
+
+class FakeDispatcher:
+    """Заменяет dispatch_stripe_event: выбрасывает ошибки из errors по очереди, затем обрабатывает событие."""
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self, *args, **kwargs) -> None:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+
+
+@asynccontextmanager
+async def fake_session():
+    yield None
+
+
+@pytest.fixture
+def webhook_worker(monkeypatch: pytest.MonkeyPatch) -> WebhookWorker:
+    monkeypatch.setattr(postgres, "async_session", fake_session)
+    monkeypatch.setattr(webhook, "build_subscription_manager", lambda session: None)
+    monkeypatch.setattr(settings, "webhook_worker_retry_attempts", 3)
+    monkeypatch.setattr(settings, "webhook_worker_retry_backoff_sec", 0)
+    monkeypatch.setattr(settings, "webhook_worker_retry_max_backoff_sec", 0)
+    return WebhookWorker(QueueName.STRIPE_WEBHOOK.value, None)  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_handle_event_retries_until_transaction_is_committed(
+    webhook_worker: WebhookWorker, monkeypatch: pytest.MonkeyPatch
+):
+    """Событие об оплате, пришедшее раньше фиксации транзакции, обрабатывается повторной попыткой"""
+    dispatcher = FakeDispatcher(TransactionNotFoundError("Transaction not found"))
+    monkeypatch.setattr(webhook, "dispatch_stripe_event", dispatcher)
+
+    await webhook_worker.handle_event(PAYMENT_EVENT)
+
+    assert dispatcher.calls == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_handle_event_transaction_not_found_after_all_attempts(
+    webhook_worker: WebhookWorker, monkeypatch: pytest.MonkeyPatch
+):
+    dispatcher = FakeDispatcher(*(TransactionNotFoundError("Transaction not found") for _ in range(3)))
+    monkeypatch.setattr(webhook, "dispatch_stripe_event", dispatcher)
+
+    with pytest.raises(PermanentWorkerError):
+        await webhook_worker.handle_event(PAYMENT_EVENT)
+    assert dispatcher.calls == 3
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_handle_event_waits_for_service_recovery(webhook_worker: WebhookWorker, monkeypatch: pytest.MonkeyPatch):
+    """При недоступности БД событие повторяется на полосе и после исчерпания попыток, а не возвращается в очередь"""
+    dispatcher = FakeDispatcher(*(OperationalError("SELECT 1", {}, OSError()) for _ in range(5)))
+    monkeypatch.setattr(webhook, "dispatch_stripe_event", dispatcher)
+
+    await webhook_worker.handle_event(PAYMENT_EVENT)
+
+    assert dispatcher.calls == 6
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_handle_event_permanent_error_is_not_retried(
+    webhook_worker: WebhookWorker, monkeypatch: pytest.MonkeyPatch
+):
+    dispatcher = FakeDispatcher(KeyError("object"))
+    monkeypatch.setattr(webhook, "dispatch_stripe_event", dispatcher)
+
+    with pytest.raises(PermanentWorkerError):
+        await webhook_worker.handle_event(PAYMENT_EVENT)
+    assert dispatcher.calls == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_handle_event_malformed_message(webhook_worker: WebhookWorker, monkeypatch: pytest.MonkeyPatch):
+    dispatcher = FakeDispatcher()
+    monkeypatch.setattr(webhook, "dispatch_stripe_event", dispatcher)
+
+    with pytest.raises(PermanentWorkerError):
+        await webhook_worker.handle_event({"id": "evt_test"})
+    assert dispatcher.calls == 0
+
+
+class FakeIncomingMessage:
+    def __init__(self, event: dict):
+        self.body = json.dumps(event).encode()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_dispatch_respects_worker_concurrency(webhook_worker: WebhookWorker, monkeypatch: pytest.MonkeyPatch):
+    """Сообщения на полосах учитываются в общем ограничении worker_concurrency"""
+    release = asyncio.Event()
+    in_progress: list[str] = []
+
+    async def process_message(message: FakeIncomingMessage) -> None:
+        in_progress.append(json.loads(message.body)["id"])
+        await release.wait()
+
+    webhook_worker._semaphore = asyncio.Semaphore(1)
+    monkeypatch.setattr(webhook_worker, "process_message", process_message)
+
+    first = asyncio.create_task(webhook_worker.dispatch(FakeIncomingMessage({**PAYMENT_EVENT, "id": "evt_1"})))
+    other_customer_event = {"id": "evt_2", "type": "payment_intent.succeeded", "data": {"object": {"customer": "c"}}}
+    # события разных клиентов на разных полосах, второе сдерживает только семафор
+    assert webhook_worker._lanes.lane_for("customer:cus_test") != webhook_worker._lanes.lane_for("customer:c")
+    second = asyncio.create_task(webhook_worker.dispatch(FakeIncomingMessage(other_customer_event)))
+    await asyncio.sleep(0.01)
+    assert in_progress == ["evt_1"]
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert in_progress == ["evt_1", "evt_2"]
+    await webhook_worker._lanes.close()
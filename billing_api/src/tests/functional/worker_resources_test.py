@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+import pytest
+
+from workers.resources import WorkerResources
+
+
+@pytest.fixture
+def worker_resources(monkeypatch: pytest.MonkeyPatch) -> WorkerResources:
+    async def connect() -> None:
+        pass
+
+    async def close() -> None:
+        pass
+
+    resources = WorkerResources()
+    monkeypatch.setattr(resources, "_connect", connect)
+    monkeypatch.setattr(resources, "_close", close)
+    return resources
+
+
+def test_loop_runs_between_task_runs(worker_resources: WorkerResources):
+    """Между запусками задач loop продолжает работать: обслуживает heartbeat и подписки RabbitMQ"""
+    ticked = threading.Event()
+
+    async def schedule_tick() -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, ticked.set)
+        return loop
+
+    first_loop = worker_resources.run(schedule_tick())
+    # колбэк выполняется, хотя ни одна задача в этот момент не запущена
+    assert ticked.wait(timeout=1)
+
+    second_loop = worker_resources.run(schedule_tick())
+    assert second_loop is first_loop
+    assert worker_resources.reused_runs == 1
+
+    worker_resources.stop()
+    assert not worker_resources.is_started
+    assert first_loop.is_closed()
+
+
+def test_run_propagates_task_error(worker_resources: WorkerResources):
+    async def fail() -> None:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        worker_resources.run(fail())
+    worker_resources.stop()
+
+
+def test_setup_time_saved_excludes_reconnects(worker_resources: WorkerResources):
+    worker_resources.setup_time = 2.0
+    worker_resources.reused_runs = 3
+    worker_resources._on_reconnect(None)  # type: ignore[arg-type]
+
+    assert worker_resources.reconnects == 1
+    assert worker_resources.setup_time_saved == 4.0
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+ItemType = TypeVar("ItemType")
+
+# Обработчик пачки возвращает результат для каждого элемента в том же порядке: None - успех, иначе ошибка
+FlushHandler = Callable[[list[ItemType]], Awaitable[list[BaseException | None]]]
+
+
+class Batcher(Generic[ItemType]):
+    """Накапливает элементы и передаёт их обработчику пачками.
+
+    Пачка отправляется, когда набирается max_size элементов или с момента поступления первого
+    элемента пачки проходит max_delay секунд. Каждый вызов submit дожидается результата
+    обработки своего элемента: завершается успешно или выбрасывает ошибку, которую вернул обработчик.
+    """
+
+    def __init__(self, flush_handler: FlushHandler, max_size: int, max_delay: float):
+        self._flush_handler = flush_handler
+        self._max_size = max_size
+        self._max_delay = max_delay
+        self._pending: list[tuple[ItemType, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: ItemType) -> None:
+        """Добавляет элемент в текущую пачку и ждёт результата его обработки."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self._flush)
+
+        await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._process_batch(batch))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def _process_batch(self, batch: list[tuple[ItemType, asyncio.Future]]) -> None:
+        try:
+            results = await self._flush_handler([item for item, _ in batch])
+        except Exception as err:
+            logger.exception("Ошибка при обработке пачки")
+            results = [err] * len(batch)
+
+        for (_, future), error in zip(batch, results, strict=True):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
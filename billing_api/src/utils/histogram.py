@@ -0,0 +1,35 @@
+import bisect
+from collections.abc import Sequence
+
+# Границы в секундах для длительностей от долей миллисекунды до десятков секунд
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин в формате Prometheus.
+
+    Значение попадает в первую корзину, граница которой не меньше значения,
+    значения больше последней границы учитываются только в count и sum (корзина +Inf).
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self._counts):
+            self._counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """Накопленные количества по границам корзин, как в бакетах le у Prometheus."""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self._counts, strict=True):
+            total += count
+            result.append((bound, total))
+        return result
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import zlib
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+ResultType = TypeVar("ResultType")
+
+Job = Callable[[], Awaitable[Any]]
+
+
+class KeyedExecutor:
+    """Выполняет задачи на нескольких упорядоченных полосах (lanes).
+
+    Задачи с одинаковым ключом всегда попадают на одну полосу и выполняются строго по одной
+    в порядке вызова submit, задачи с разными ключами выполняются параллельно на разных полосах.
+    Задачи без ключа распределяются по полосам по очереди.
+    """
+
+    def __init__(self, lanes: int):
+        self._queues: list[asyncio.Queue[tuple[Job, asyncio.Future]]] = [asyncio.Queue() for _ in range(lanes)]
+        self._lane_tasks: list[asyncio.Task] = []
+        self._next_lane = 0
+
+    def lane_for(self, key: str | None) -> int:
+        if key is None:
+            self._next_lane = (self._next_lane + 1) % len(self._queues)
+            return self._next_lane
+        return zlib.crc32(key.encode()) % len(self._queues)
+
+    async def submit(self, key: str | None, job: Callable[[], Awaitable[ResultType]]) -> ResultType:
+        """Ставит задачу на полосу ключа key и дожидается её результата."""
+        if not self._lane_tasks:
+            self._start()
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues[self.lane_for(key)].put_nowait((job, future))
+        return await future
+
+    async def close(self) -> None:
+        """Останавливает полосы, задачи в очередях полос не выполняются."""
+        for task in self._lane_tasks:
+            task.cancel()
+        await asyncio.gather(*self._lane_tasks, return_exceptions=True)
+        self._lane_tasks = []
+
+    def _start(self) -> None:
+        self._lane_tasks = [asyncio.create_task(self._run_lane(queue)) for queue in self._queues]
+
+    @staticmethod
+    async def _run_lane(queue: asyncio.Queue[tuple[Job, asyncio.Future]]) -> None:
+        while True:
+            job, future = await queue.get()
+            # вызвавший submit мог быть отменён, пока задача ждала в очереди
+            if future.done():
+                continue
+            try:
+                result = await job()
+            # ошибка задачи передаётся вызвавшему submit
+            except Exception as err:  # noqa: BLE001
+                if not future.done():
+                    future.set_exception(err)
+            else:
+                if not future.done():
+                    future.set_result(result)
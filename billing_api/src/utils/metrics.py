@@ -0,0 +1,141 @@
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+from utils.histogram import LATENCY_BUCKETS, Histogram
+
+LabelValues = tuple[str, ...]
+
+
+class Metric(ABC):
+    """Метрика с набором меток, значения хранятся в памяти процесса."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def _labels(self, values: LabelValues, le: str | None = None) -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values, strict=True)]
+        if le is not None:
+            pairs.append(f'le="{le}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set_total(self, *labels: str, value: float) -> None:
+        """Отдаёт под метками labels накопленное значение, которое ведёт другой компонент (например, кэш).
+
+        Значение сбрасывается только вместе с источником, Prometheus учитывает такой сброс как перезапуск счётчика.
+        """
+        self._values[labels] = value
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name}{self._labels(labels)} {value}" for labels, value in self._values.items()]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        self._values[labels] = value
+
+
+class LabeledHistogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._buckets = buckets
+        self._histograms: dict[LabelValues, Histogram] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        histogram = self._histograms.get(labels)
+        if histogram is None:
+            histogram = self._histograms[labels] = Histogram(self._buckets)
+        histogram.observe(value)
+
+    def attach(self, *labels: str, histogram: Histogram) -> None:
+        """Отдаёт под метками labels гистограмму, которую собирает другой компонент (например, пул соединений)."""
+        self._histograms[labels] = histogram
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Замеряет длительность блока в секундах, в том числе завершившегося исключением."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(*labels, value=time.perf_counter() - started_at)
+
+    def _samples(self) -> list[str]:
+        return [
+            line for labels, histogram in self._histograms.items() for line in self.render_histogram(labels, histogram)
+        ]
+
+    def render_histogram(self, labels: LabelValues, histogram: Histogram) -> list[str]:
+        buckets = [*histogram.cumulative_counts(), ("+Inf", histogram.count)]
+        lines = [f"{self.name}_bucket{self._labels(labels, le=str(bound))} {count}" for bound, count in buckets]
+        lines.append(f"{self.name}_sum{self._labels(labels)} {histogram.sum}")
+        lines.append(f"{self.name}_count{self._labels(labels)} {histogram.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Набор метрик процесса, который отдаётся в текстовом формате Prometheus."""
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+
+    def register(self, metric: Metric) -> None:
+        self._metrics.append(metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> LabeledHistogram:
+        metric = LabeledHistogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,38 @@
+import time
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class TTLCache(Generic[KeyType, ValueType]):
+    """Кэш в памяти процесса, записи которого устаревают через ttl секунд после сохранения.
+
+    При ttl <= 0 кэш отключён: значения не сохраняются.
+    """
+
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._entries: dict[KeyType, tuple[float, ValueType]] = {}
+
+    def get(self, key: KeyType) -> ValueType | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: KeyType, value: ValueType) -> None:
+        if self._ttl > 0:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
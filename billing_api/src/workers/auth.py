@@ -1,5 +1,7 @@
 import logging
 
+import httpx
+
 from core.config import settings
 from workers.base import BaseQueueWorker
 from workers.exceptions import PermanentWorkerError
@@ -10,8 +12,8 @@ logger = logging.getLogger(__name__)
 class AuthWorker(BaseQueueWorker):
     """Воркер для работы с сервисом Auth."""
 
-    def __init__(self, queue_name: str):
-        super().__init__(queue_name)
+    def __init__(self, queue_name: str, http_client: httpx.AsyncClient):
+        super().__init__(queue_name, http_client)
         self._auth_service_url = settings.auth_service_url.rstrip("/")
 
     async def handle_event(self, message_body: dict) -> None:
@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import signal
 from abc import ABC, abstractmethod
 
 import httpx
@@ -20,16 +21,53 @@ class BaseQueueWorker(ABC):
     к внешним сервсиам.
     """
 
-    def __init__(self, queue_name: str):
+    def __init__(self, queue_name: str, http_client: httpx.AsyncClient):
         self._queue_name = queue_name
+        self._http_client = http_client
         self._circuit_breaker = CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(settings.worker_concurrency)
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def consume(self, message: AbstractIncomingMessage) -> None:
+        """Обрабатывает сообщение, ограничивая число одновременно обрабатываемых сообщений.
+
+        aio-pika вызывает обработчик в отдельной задаче на каждое сообщение, задачи запоминаются
+        для ожидания их завершения при остановке воркера.
+        """
+        task = asyncio.current_task()
+        self._in_flight.add(task)  # type: ignore[arg-type]
+        try:
+            await self.dispatch(message)
+        finally:
+            self._in_flight.discard(task)  # type: ignore[arg-type]
+
+    async def dispatch(self, message: AbstractIncomingMessage) -> None:
+        """Запускает обработку сообщения, одновременно обрабатывается не больше worker_concurrency сообщений."""
+        async with self._semaphore:
+            await self.process_message(message)
+
+    async def drain(self, timeout: float) -> None:
+        """Дожидается обработки уже полученных сообщений, но не дольше timeout секунд.
+
+        Сообщения, не подтверждённые к закрытию соединения, RabbitMQ доставит повторно.
+        """
+        if not self._in_flight:
+            return
+        logger.info(f"Ожидание обработки {len(self._in_flight)} сообщений перед остановкой воркера")
+        _, pending = await asyncio.wait(self._in_flight, timeout=timeout)
+        if pending:
+            logger.warning(f"Не дождались обработки {len(pending)} сообщений, они будут доставлены повторно")
 
     async def process_message(self, message: AbstractIncomingMessage) -> None:
         """Обрабатывает сообщение из очереди."""
         message_info = f"delivery_tag={message.delivery_tag}, timestamp={message.timestamp}"
 
         if not self._circuit_breaker.can_execute():
-            logger.warning(f"Circuit Breaker открыт. Сообщение {message_info} не обработано.")
+            # неподтверждённое сообщение занимает место в prefetch, поэтому оно возвращается в очередь,
+            # иначе после worker_prefetch_count таких сообщений брокер перестанет доставлять новые
+            await asyncio.sleep(settings.worker_circuit_open_retry_delay_sec)
+            await message.nack(requeue=True)
+            logger.warning(f"Circuit Breaker открыт. Сообщение {message_info} возвращено в очередь.")
             return None
 
         try:
@@ -59,49 +97,69 @@ class BaseQueueWorker(ABC):
 
     async def make_post_request(self, url: str, payload: dict) -> None:
         """Делает http-запрос к внешнему сервису."""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    url, json=payload, headers={"X-Service-Secret-Token": settings.secret_token}
-                )
-                response.raise_for_status()
-                self._circuit_breaker.record_success()
-                logger.info(f"Запрос к {url} с телом {payload} выполнен успешно.")
-            except httpx.HTTPStatusError as err:
-                if err.response.is_client_error:
-                    raise PermanentWorkerError(
-                        f"Ошибка клиента при выполнении запроса к {url} с телом {payload}"
-                    ) from err
-                self._circuit_breaker.record_failure()
-                raise TemporaryWorkerError(f"Ошибка сервера при выполнении запроса к {url} с телом {payload}") from err
-            except httpx.RequestError as err:
-                self._circuit_breaker.record_failure()
-                raise TemporaryWorkerError(
-                    f"Ошибка соединения при выполнении запроса к {url} с телом {payload}"
-                ) from err
+        try:
+            response = await self._http_client.post(url, json=payload)
+            response.raise_for_status()
+            self._circuit_breaker.record_success()
+            logger.info(f"Запрос к {url} с телом {payload} выполнен успешно.")
+        except httpx.HTTPStatusError as err:
+            if err.response.is_client_error:
+                raise PermanentWorkerError(f"Ошибка клиента при выполнении запроса к {url} с телом {payload}") from err
+            self._circuit_breaker.record_failure()
+            raise TemporaryWorkerError(f"Ошибка сервера при выполнении запроса к {url} с телом {payload}") from err
+        except httpx.RequestError as err:
+            self._circuit_breaker.record_failure()
+            raise TemporaryWorkerError(f"Ошибка соединения при выполнении запроса к {url} с телом {payload}") from err
 
     @abstractmethod
     async def handle_event(self, message_body: dict) -> None:
         raise NotImplementedError
 
 
+def create_http_client() -> httpx.AsyncClient:
+    """Создаёт HTTP-клиент воркера с пулом keep-alive соединений, общий для всех обрабатываемых сообщений."""
+    http_settings = settings.worker_http
+    return httpx.AsyncClient(
+        headers={"X-Service-Secret-Token": settings.secret_token},
+        limits=httpx.Limits(
+            max_connections=http_settings.max_connections,
+            max_keepalive_connections=http_settings.max_keepalive_connections,
+            keepalive_expiry=http_settings.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(http_settings.timeout, connect=http_settings.connect_timeout),
+    )
+
+
 async def run_worker(worker_class: type[BaseQueueWorker], queue_name: str) -> None:
     """Инициализирует и запускает воркер типа worker_class."""
-    worker = worker_class(queue_name)
-
-    connection = await rabbitmq.create_rabbitmq_connection(settings.rabbitmq.url)
-    await rabbitmq.init_rabbitmq(connection)
-    channel = await connection.channel()
-    queue = await channel.get_queue(queue_name)
-
-    logger.info(f"Запущен воркер {worker_class.__name__}")
-
-    try:
-        await queue.consume(worker.process_message)
-        await asyncio.Future()
-    except AMQPError:
-        logger.exception(f"Ошибка RabbitMQ. {worker_class.__name__} будет остановлен.")
-    except Exception:
-        logger.exception(f"Неожиданная ошибка при обработке сообщений воркером {worker_class.__name__}")
-    finally:
-        await rabbitmq.close_rabbitmq_connection(connection)
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stop_event.set)
+
+    connection = None
+    async with create_http_client() as http_client:
+        try:
+            worker = worker_class(queue_name, http_client)
+
+            # подключение и обменник доступны сервисам, которые воркер использует при обработке сообщений
+            connection = rabbitmq.connection = await rabbitmq.create_rabbitmq_connection(settings.rabbitmq.url)
+            rabbitmq.exchange = await rabbitmq.init_rabbitmq(connection)
+            channel = await connection.channel()
+            await channel.set_qos(prefetch_count=settings.worker_prefetch_count)
+            queue = await channel.get_queue(queue_name)
+
+            logger.info(f"Запущен воркер {worker_class.__name__}")
+            consumer_tag = await queue.consume(worker.consume)
+            await stop_event.wait()
+
+            logger.info(f"Остановка воркера {worker_class.__name__}")
+            await queue.cancel(consumer_tag)
+            await worker.drain(settings.worker_shutdown_timeout_sec)
+        except AMQPError:
+            logger.exception(f"Ошибка RabbitMQ. {worker_class.__name__} будет остановлен.")
+        except Exception:
+            logger.exception(f"Неожиданная ошибка при обработке сообщений воркером {worker_class.__name__}")
+        finally:
+            if connection is not None:
+                await rabbitmq.close_rabbitmq_connection(connection)
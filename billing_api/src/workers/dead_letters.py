@@ -0,0 +1,45 @@
+import logging
+
+from aio_pika import DeliveryMode, Message
+from aio_pika.abc import AbstractExchange, AbstractQueue
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def redrive_dead_letters(
+    dlq: AbstractQueue, exchange: AbstractExchange, routing_key: str, limit: int | None = None
+) -> int:
+    """Возвращает сообщения из DLQ в основную очередь routing_key для повторной обработки.
+
+    Сообщения переносятся по одному в порядке DLQ: сообщение удаляется из DLQ только после
+    подтверждения публикации брокером, при ошибке публикации оно остаётся в DLQ.
+    Возвращает количество перенесённых сообщений, не больше limit, если он задан.
+    """
+    redriven = 0
+    while limit is None or redriven < limit:
+        message = await dlq.get(no_ack=False, fail=False)
+        if message is None:
+            break
+
+        try:
+            await exchange.publish(
+                Message(
+                    body=message.body,
+                    content_type=message.content_type,
+                    message_id=message.message_id,
+                    delivery_mode=DeliveryMode.PERSISTENT,
+                ),
+                routing_key=routing_key,
+                timeout=settings.rabbitmq.publish_timeout,
+            )
+        except Exception:
+            await message.nack(requeue=True)
+            raise
+
+        await message.ack()
+        redriven += 1
+
+    logger.info(f"Из DLQ в очередь {routing_key} возвращено {redriven} сообщений")
+    return redriven
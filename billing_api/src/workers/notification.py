@@ -1,18 +1,46 @@
+import asyncio
 import logging
+from http import HTTPStatus
+
+import httpx
 
 from core.config import settings
+from utils.batcher import Batcher
 from workers.base import BaseQueueWorker
-from workers.exceptions import PermanentWorkerError
+from workers.exceptions import PermanentWorkerError, TemporaryWorkerError
 
 logger = logging.getLogger(__name__)
 
+# Ответы, означающие, что bulk-эндпоинта нет: bulk-отправка отключается до перезапуска воркера
+BULK_UNSUPPORTED_STATUSES = {HTTPStatus.NOT_FOUND, HTTPStatus.METHOD_NOT_ALLOWED, HTTPStatus.GONE}
+# Ответы, которые может вызвать отдельная нотификация или размер пачки: пачка отправляется по одной
+BULK_ITEM_ERROR_STATUSES = {
+    HTTPStatus.BAD_REQUEST,
+    HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+    HTTPStatus.UNPROCESSABLE_ENTITY,
+}
+
 
 class NotificationWorker(BaseQueueWorker):
-    """Воркер для работы с сервисом Notification."""
+    """Воркер для работы с сервисом Notification.
+
+    Если задан NOTIFICATION_BULK_URL, нотификации накапливаются и отправляются пачками
+    в bulk-эндпоинт, при этом каждое сообщение из очереди подтверждается или отклоняется
+    по результату доставки своей нотификации.
+    """
 
-    def __init__(self, queue_name: str):
-        super().__init__(queue_name)
+    def __init__(self, queue_name: str, http_client: httpx.AsyncClient):
+        super().__init__(queue_name, http_client)
         self._notifcation_service_url = settings.notification_service_url.rstrip("/")
+        self._bulk_url = settings.notification_bulk_url
+        self._batcher: Batcher[dict] | None = None
+        self._bulk_disabled = False
+        if self._bulk_url:
+            self._batcher = Batcher(
+                self._deliver_batch,
+                max_size=settings.notification_batch_size,
+                max_delay=settings.notification_batch_max_delay_ms / 1000,
+            )
 
     async def handle_event(self, message_body: dict) -> None:
         """Обрабатывает сообщения для отпраки нотификации пользователю."""
@@ -22,5 +50,95 @@ class NotificationWorker(BaseQueueWorker):
         if not all([user_id, notification_data]):
             raise PermanentWorkerError("Неверная структура сообщения для обработки NotificationWorker")
 
-        url = f"{self._notifcation_service_url}/{user_id}/notify/"
-        await self.make_post_request(url, payload={"notification_data": notification_data})
+        notification = {"user_id": user_id, "notification_data": notification_data}
+        if self._batcher and not self._bulk_disabled:
+            await self._batcher.submit(notification)
+        else:
+            await self._send_notification(notification)
+
+    async def _send_notification(self, notification: dict) -> None:
+        url = f"{self._notifcation_service_url}/{notification['user_id']}/notify/"
+        await self.make_post_request(url, payload={"notification_data": notification["notification_data"]})
+
+    async def _deliver_batch(self, notifications: list[dict]) -> list[BaseException | None]:
+        """Отправляет пачку нотификаций в bulk-эндпоинт и возвращает результат по каждой нотификации.
+
+        Если bulk-эндпоинт отклонил пачку из-за её содержимого (400, 413, 422), нотификации отправляются
+        по одной. Если bulk-эндпоинта нет (404, 405, 410), bulk-отправка отключается для процесса.
+        Остальные ошибки клиента относятся ко всей пачке.
+        """
+        if self._bulk_disabled:
+            return await self._deliver_one_by_one(notifications)
+
+        try:
+            response = await self._http_client.post(self._bulk_url, json={"notifications": notifications})  # type: ignore[arg-type]
+        except httpx.RequestError as err:
+            self._circuit_breaker.record_failure()
+            logger.warning(f"Ошибка соединения при отправке пачки из {len(notifications)} нотификаций: {err}")
+            return [TemporaryWorkerError("Ошибка соединения при отправке пачки нотификаций")] * len(notifications)
+
+        if response.is_server_error:
+            self._circuit_breaker.record_failure()
+            return [
+                TemporaryWorkerError(f"Ошибка сервера {response.status_code} при отправке пачки нотификаций")
+            ] * len(notifications)
+
+        if response.status_code in BULK_UNSUPPORTED_STATUSES:
+            if not self._bulk_disabled:
+                self._bulk_disabled = True
+                logger.error(
+                    f"Bulk-эндпоинт нотификаций {self._bulk_url} ответил {response.status_code}, "
+                    "bulk-отправка отключена до перезапуска воркера"
+                )
+            return await self._deliver_one_by_one(notifications)
+
+        if response.status_code in BULK_ITEM_ERROR_STATUSES:
+            logger.warning(
+                f"Bulk-эндпоинт нотификаций ответил {response.status_code}, нотификации будут отправлены по одной"
+            )
+            return await self._deliver_one_by_one(notifications)
+
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            return [TemporaryWorkerError("Bulk-эндпоинт нотификаций ограничил частоту запросов")] * len(notifications)
+
+        if response.is_client_error:
+            return [
+                PermanentWorkerError(f"Ошибка клиента {response.status_code} при отправке пачки нотификаций")
+            ] * len(notifications)
+
+        self._circuit_breaker.record_success()
+        logger.info(f"Пачка из {len(notifications)} нотификаций отправлена")
+        return self._parse_bulk_results(response, len(notifications))
+
+    async def _deliver_one_by_one(self, notifications: list[dict]) -> list[BaseException | None]:
+        results = await asyncio.gather(
+            *(self._send_notification(notification) for notification in notifications), return_exceptions=True
+        )
+        return [result if isinstance(result, BaseException) else None for result in results]
+
+    @staticmethod
+    def _parse_bulk_results(response: httpx.Response, count: int) -> list[BaseException | None]:
+        """Разбирает ответ bulk-эндпоинта вида {"results": [{"status_code": 200}, ...]}.
+
+        Результаты идут в порядке отправки нотификаций. Если ответ не содержит результатов
+        по каждой нотификации, пачка считается доставленной целиком.
+        """
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        results = body.get("results") if isinstance(body, dict) else None
+
+        if not isinstance(results, list) or len(results) != count:
+            return [None] * count
+
+        errors: list[BaseException | None] = []
+        for result in results:
+            status_code = result.get("status_code", 200) if isinstance(result, dict) else 200
+            if status_code >= 500:
+                errors.append(TemporaryWorkerError(f"Ошибка сервера {status_code} при доставке нотификации"))
+            elif status_code >= 400:
+                errors.append(PermanentWorkerError(f"Ошибка клиента {status_code} при доставке нотификации"))
+            else:
+                errors.append(None)
+        return errors
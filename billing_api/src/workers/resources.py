@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown  # type: ignore[import-untyped]
+from aio_pika.abc import AbstractRobustConnection
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+from db import postgres, rabbitmq
+from services.subscription_plan_cache import subscription_plan_cache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerResources:
+    """Подключения к Postgres и RabbitMQ, которые живут всё время работы процесса воркера Celery.
+
+    Пул соединений asyncpg и канал RabbitMQ привязаны к event loop, в котором созданы, поэтому
+    процесс держит собственный loop в фоновом потоке и выполняет в нём все асинхронные задачи.
+    Loop работает и между запусками задач: отвечает на heartbeat RabbitMQ и получает сбросы
+    кэша планов подписок, поэтому брокер не закрывает соединение простаивающего воркера.
+    Рассчитано на prefork и solo пулы, где задачи процесса выполняются последовательно.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self.setup_time = 0.0
+        self.reused_runs = 0
+        self.reconnects = 0
+
+    @property
+    def is_started(self) -> bool:
+        return self._loop is not None
+
+    @property
+    def setup_time_saved(self) -> float:
+        """Время на установку подключений, сэкономленное за счёт их переиспользования.
+
+        Каждое переподключение к RabbitMQ снова тратит время на установку, поэтому не считается экономией.
+        """
+        return self.setup_time * max(self.reused_runs - self.reconnects, 0)
+
+    def start(self) -> None:
+        if self.is_started:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="worker-resources", daemon=True)
+        self._thread.start()
+        try:
+            self._submit(self._connect())
+        except Exception:
+            self.stop()
+            raise
+        logger.info(f"Подключения воркера установлены за {self.setup_time:.3f} с")
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        try:
+            self._submit(self._close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()  # type: ignore[union-attr]
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+        logger.info(
+            f"Подключения воркера закрыты, сэкономлено {self.setup_time_saved:.3f} с на установке подключений "
+            f"за {self.reused_runs} запусков, переподключений к RabbitMQ: {self.reconnects}"
+        )
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Выполняет корутину в event loop процесса, поднимая подключения при первом вызове."""
+        if self.is_started:
+            self.reused_runs += 1
+            logger.info(
+                f"Подключения воркера переиспользованы (всего {self.setup_time_saved:.3f} с за "
+                f"{self.reused_runs} запусков, переподключений к RabbitMQ: {self.reconnects})"
+            )
+        else:
+            self.start()
+        return self._submit(coro)
+
+    def _submit(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Выполняет корутину в потоке event loop и ждёт результат в вызывающем потоке."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()  # type: ignore[arg-type]
+
+    def _on_reconnect(self, connection: AbstractRobustConnection, *args: Any) -> None:
+        self.reconnects += 1
+        logger.warning(f"Соединение воркера с RabbitMQ восстановлено, переподключений: {self.reconnects}")
+
+    async def _connect(self) -> None:
+        started_at = time.perf_counter()
+        postgres.engine = postgres.create_postgres_engine()
+        postgres.async_session = async_sessionmaker(bind=postgres.engine, expire_on_commit=False, class_=AsyncSession)
+        rabbitmq.connection = await rabbitmq.create_rabbitmq_connection(settings.rabbitmq.url)
+        rabbitmq.connection.reconnect_callbacks.add(self._on_reconnect)
+        rabbitmq.exchange = await rabbitmq.init_rabbitmq(rabbitmq.connection)
+        await subscription_plan_cache.bind(rabbitmq.connection)
+        self.setup_time = time.perf_counter() - started_at
+
+    async def _close(self) -> None:
+        await subscription_plan_cache.close()
+        if rabbitmq.connection:
+            await rabbitmq.close_rabbitmq_connection(rabbitmq.connection)
+        if postgres.engine:
+            await postgres.engine.dispose()
+
+
+worker_resources = WorkerResources()
+
+
+@worker_process_init.connect
+def init_worker_resources(**kwargs) -> None:
+    worker_resources.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_worker_resources(**kwargs) -> None:
+    worker_resources.stop()
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+from functools import partial
+
+import httpx
+import stripe
+from aio_pika.abc import AbstractIncomingMessage
+from aio_pika.exceptions import AMQPError
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from core.config import settings
+from db import postgres
+from services.cards_manager import CardsManager
+from services.exceptions import TransactionNotFoundError
+from services.payment_process import PaymentProcessorStripe
+from services.stripe_webhook import dispatch_stripe_event
+from services.subscription_manager import build_subscription_manager
+from utils.keyed_executor import KeyedExecutor
+from workers.base import BaseQueueWorker
+from workers.exceptions import PermanentWorkerError
+
+logger = logging.getLogger(__name__)
+
+# ошибки недоступности БД, брокера и Stripe, которые имеет смысл повторить
+TEMPORARY_ERRORS = (
+    OperationalError,
+    InterfaceError,
+    OSError,
+    TimeoutError,
+    AMQPError,
+    stripe.error.APIConnectionError,
+    stripe.error.RateLimitError,
+)
+# событие об оплате может прийти раньше, чем PaymentManager зафиксирует id платежа в транзакции
+RETRYABLE_DOMAIN_ERRORS = (TransactionNotFoundError,)
+
+
+class WebhookWorker(BaseQueueWorker):
+    """Воркер для обработки событий Stripe, принятых эндпоинтом вебхука.
+
+    События одного клиента Stripe (или одного платежа) обрабатываются строго по порядку на одной
+    из WEBHOOK_WORKER_CONCURRENCY полос, события разных клиентов - параллельно.
+    Каждое событие обрабатывается в отдельной сессии БД. Повторы выполняются на полосе события, событие
+    не возвращается в очередь, иначе следующие события того же ключа обогнали бы его:
+    - при недоступности БД, RabbitMQ и Stripe полоса останавливается и повторяет событие с экспоненциальной
+      задержкой (не больше WEBHOOK_WORKER_RETRY_MAX_BACKOFF_SEC), пока сервис не восстановится;
+    - событие об оплате, для которой ещё не найдена транзакция, повторяется до WEBHOOK_WORKER_RETRY_ATTEMPTS
+      раз, затем направляется в DLQ.
+    Остальные ошибки (неверная структура события, нарушены ограничения и т.п.) повторной обработкой
+    не исправить, событие сразу направляется в DLQ. События из DLQ возвращаются в обработку
+    скриптом redrive_dead_letters.py.
+    """
+
+    def __init__(self, queue_name: str, http_client: httpx.AsyncClient):
+        super().__init__(queue_name, http_client)
+        # обработка события держит соединение из пула БД, поэтому число полос ограничено отдельно
+        self._lanes = KeyedExecutor(settings.webhook_worker_concurrency)
+        self._cards_manager = CardsManager(postgres.async_session, PaymentProcessorStripe())
+
+    async def dispatch(self, message: AbstractIncomingMessage) -> None:
+        """Обрабатывает события одного клиента или платежа по порядку, а разных - параллельно.
+
+        aio-pika запускает обработку сообщений в порядке их получения из очереди. Как и в базовом воркере,
+        одновременно в работе не больше worker_concurrency сообщений, включая ожидающие на полосах.
+        Семафор пропускает ожидающих в порядке очереди, а получив его, сообщение сразу ставится на полосу
+        своего ключа, поэтому порядок событий внутри полосы сохраняется.
+        """
+        async with self._semaphore:
+            await self._lanes.submit(self.ordering_key(message), partial(self.process_message, message))
+
+    @staticmethod
+    def ordering_key(message: AbstractIncomingMessage) -> str | None:
+        """Возвращает ключ упорядочивания события: id клиента Stripe, иначе id платежа."""
+        try:
+            event = json.loads(message.body)
+            stripe_object = event["data"]["object"]
+        except (ValueError, TypeError, KeyError):
+            return None
+        if not isinstance(stripe_object, dict):
+            return None
+
+        if customer := stripe_object.get("customer"):
+            return f"customer:{customer}"
+        if payment_intent := stripe_object.get("payment_intent"):
+            return f"payment_intent:{payment_intent}"
+        if stripe_object.get("object") == "payment_intent" and stripe_object.get("id"):
+            return f"payment_intent:{stripe_object['id']}"
+        return None
+
+    async def handle_event(self, message_body: dict) -> None:
+        """Обрабатывает событие Stripe, повторяя обработку при временных ошибках."""
+        event_id = message_body.get("id")
+        event_type = message_body.get("type")
+        data = message_body.get("data")
+
+        if not all([event_type, data]):
+            raise PermanentWorkerError("Неверная структура сообщения для обработки WebhookWorker")
+
+        attempts = settings.webhook_worker_retry_attempts
+        delay = settings.webhook_worker_retry_backoff_sec
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with postgres.async_session() as session:  # type: ignore[misc]
+                    await dispatch_stripe_event(
+                        event_type, data, self._cards_manager, build_subscription_manager(session)
+                    )
+                break
+            except TEMPORARY_ERRORS as err:
+                error = err
+            except RETRYABLE_DOMAIN_ERRORS as err:
+                if attempt >= attempts:
+                    raise PermanentWorkerError(
+                        f"Событие {event_id} типа {event_type} не обработано за {attempts} попыток"
+                    ) from err
+                error = err
+            except Exception as err:
+                raise PermanentWorkerError(f"Ошибка при обработке события {event_id} типа {event_type}") from err
+
+            logger.warning(
+                f"Попытка {attempt} обработать событие {event_id} типа {event_type} не удалась: {error!r}. "
+                f"Повтор через {delay:.1f} с"
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.webhook_worker_retry_max_backoff_sec)
+
+        logger.info(f"Событие {event_id} типа {event_type} обработано")